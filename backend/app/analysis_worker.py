@@ -0,0 +1,231 @@
+import threading
+from datetime import datetime
+from typing import Callable, Collection, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import update
+from sqlmodel import Session, func, select
+
+from . import services
+from .config import get_settings
+from .counters import apply_review_counts
+from .database import get_session
+from .entities import apply_review_entities
+from .models import Review
+from .rollups import apply_review_rollups
+
+settings = get_settings()
+
+
+def _pending_criteria() -> list:
+    # analyzed_at IS NULL matches the partial index ix_reviews_pending_analysis
+    return [Review.analyzed_at.is_(None), Review.sentiment.is_(None)]
+
+
+def _analyze_contents(reviews: List[Review], batch_size: int) -> Tuple[List[Review], list, list]:
+    """
+    Runs the models over the reviews. If the batch fails, each review is
+    retried alone so one bad row does not hold back the rest. Returns the
+    analyzed reviews, their analyses and (review, exception) failures.
+    """
+    try:
+        return reviews, services.analyze_texts([review.content for review in reviews], batch_size=batch_size), []
+    except Exception as exc:
+        if len(reviews) == 1:
+            return [], [], [(reviews[0], exc)]
+
+    analyzed, analyses, failed = [], [], []
+    for review in reviews:
+        try:
+            analyses.append(services.analyze_texts([review.content], batch_size=1)[0])
+            analyzed.append(review)
+        except Exception as exc:
+            failed.append((review, exc))
+    return analyzed, analyses, failed
+
+
+def _models_work() -> bool:
+    try:
+        services.check_models()
+    except Exception:
+        return False
+    return True
+
+
+def _claim(session: Session, reviews: List[Review]) -> List[Review]:
+    """
+    Marks the reviews analyzed with one conditional UPDATE each and returns
+    those that were still pending. Another process (a second web worker, or
+    one sharing the database) may have analyzed some since they were read;
+    those must not be counted twice.
+    """
+    analyzed_at = datetime.utcnow()
+    claimed = []
+    for review in reviews:
+        # The loaded review keeps its pending state for the counter deltas
+        statement = update(Review).where(Review.id == review.id, *_pending_criteria()).values(analyzed_at=analyzed_at)
+        result = session.execute(statement.execution_options(synchronize_session=False))
+        if result.rowcount == 1:
+            claimed.append(review)
+    return claimed
+
+
+def analyze_pending_batch(
+    session: Session,
+    batch_size: int,
+    skip_ids: Collection[int] = (),
+    on_failure: Optional[Callable[[int, Exception], None]] = None,
+) -> int:
+    """
+    Analyzes the oldest `batch_size` reviews waiting for deferred analysis
+    and moves them from the pending counters to their labels, trend rollups
+    and entity index. Returns how many were analyzed.
+
+    The models run before anything is written, so the transaction that
+    updates the counters only lasts for the writes themselves. Reviews that
+    fail are reported to `on_failure` and left pending. If none of them can
+    be analyzed the error is raised; the failures are only reported when
+    the models still work on other texts, so an outage does not count
+    against the reviews.
+    """
+    statement = select(Review).where(*_pending_criteria())
+    if skip_ids:
+        statement = statement.where(Review.id.not_in(list(skip_ids)))
+    statement = statement.order_by(Review.id).limit(batch_size)
+    if session.get_bind().dialect.name == "postgresql":
+        # Several web processes may run a worker; each takes different rows.
+        # Only these review rows stay locked during inference, not the counters.
+        statement = statement.with_for_update(skip_locked=True)
+    reviews = session.exec(statement).all()
+    if not reviews:
+        session.rollback()
+        return 0
+
+    analyzed, analyses, failed = _analyze_contents(reviews, batch_size)
+    if not analyzed:
+        session.rollback()
+        if on_failure is not None and _models_work():
+            for review, exc in failed:
+                on_failure(review.id, exc)
+        raise failed[0][1]
+    for review, exc in failed:
+        if on_failure is not None:
+            on_failure(review.id, exc)
+
+    results = dict(zip((review.id for review in analyzed), analyses))
+    analyzed = _claim(session, analyzed)
+    if not analyzed:
+        session.rollback()
+        return 0
+    apply_review_counts(session, analyzed, sign=-1)
+    services.apply_analyses(analyzed, [results[review.id] for review in analyzed])
+    session.add_all(analyzed)
+    apply_review_counts(session, analyzed)
+    apply_review_rollups(session, analyzed)
+    apply_review_entities(session, analyzed)
+    services.invalidate_dashboards(session, analyzed)
+    session.commit()
+    return len(analyzed)
+
+
+def analysis_queue_status(session: Session) -> dict:
+    """Reviews waiting for analysis and how long the oldest one has waited."""
+    depth, oldest = session.exec(select(func.count(), func.min(Review.created_at)).where(*_pending_criteria())).one()
+    return {
+        "depth": depth,
+        "oldest_pending_at": oldest,
+        "lag_seconds": round((datetime.utcnow() - oldest).total_seconds(), 3) if oldest else 0.0,
+    }
+
+
+class AnalysisWorker:
+    """
+    Background thread that drains reviews stored with deferred analysis.
+    It wakes up when notified of a new review, or every `poll_seconds` to
+    pick up rows written by other processes or left by a restart.
+    """
+
+    def __init__(self, batch_size: int = 32, poll_seconds: float = 1.0, max_attempts: int = 3) -> None:
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self._attempts: Dict[int, int] = {}
+        self._skipped: Set[int] = set()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.reviews = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_batch_at: Optional[datetime] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="analysis-worker", daemon=True)
+            self._thread.start()
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def drain(self) -> int:
+        """Analyzes batches until nothing is pending. Returns the number of reviews."""
+        drained = 0
+        while not self._stop.is_set():
+            with get_session() as session:
+                analyzed = analyze_pending_batch(
+                    session, self.batch_size, skip_ids=self._skipped, on_failure=self._record_failure
+                )
+            if not analyzed:
+                return drained
+            drained += analyzed
+            self.batches += 1
+            self.reviews += analyzed
+            self.last_batch_at = datetime.utcnow()
+        return drained
+
+    def _record_failure(self, review_id: int, exc: Exception) -> None:
+        self.failures += 1
+        self.last_error = str(exc)
+        self._attempts[review_id] = self._attempts.get(review_id, 0) + 1
+        if self._attempts[review_id] >= self.max_attempts:
+            del self._attempts[review_id]
+            self._skipped.add(review_id)
+
+    def stats(self) -> dict:
+        return {
+            "running": self._thread is not None,
+            "batches": self.batches,
+            "reviews": self.reviews,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_batch_at": self.last_batch_at,
+            "skipped_review_ids": sorted(self._skipped),
+        }
+
+    def shutdown(self) -> None:
+        # Reviews still pending stay in the table and are drained on restart
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            # Cleared before draining so a notify() during the drain is not lost
+            self._wake.clear()
+            try:
+                self.drain()
+            except Exception as exc:
+                # The batch was rolled back; retry on the next wake-up
+                self.failures += 1
+                self.last_error = str(exc)
+            self._wake.wait(self.poll_seconds)
+
+
+analysis_worker = AnalysisWorker(
+    settings.analysis_worker_batch_size,
+    settings.analysis_worker_poll_seconds,
+    settings.analysis_worker_max_attempts,
+)
@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_STOP = object()
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects single-item requests coming from concurrent callers and runs them
+    through `handler` as one batch.
+
+    A batch is dispatched as soon as `max_batch_size` items are waiting, or
+    `max_wait_ms` after the first item of the batch arrived, whichever comes
+    first. `handler` receives a list of items and must return one result per
+    item, in the same order. With `consumers` > 1, that many threads take
+    batches off the queue, so several batches can run at once (e.g. one per
+    inference worker process). `timeout` bounds how long `run` waits for a
+    result (None waits forever).
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[T]], List[R]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher",
+        consumers: int = 1,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.name = name
+        self.consumers = max(1, consumers)
+        self.timeout = timeout
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item: T) -> "Future[R]":
+        future: "Future[R]" = Future()
+        self._ensure_started()
+        self._queue.put((item, future))
+        return future
+
+    def run(self, item: T, timeout: Optional[float] = None) -> R:
+        """
+        Submit one item and block until its result is available. Raises
+        concurrent.futures.TimeoutError after `timeout` (default: the
+        batcher's) seconds.
+        """
+        return self.submit(item).result(timeout=timeout if timeout is not None else self.timeout)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            threads = self._threads
+            self._threads = []
+        # One stop marker per consumer; each thread exits on the first it takes
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+
+    def _ensure_started(self) -> None:
+        if self._threads:
+            return
+        with self._lock:
+            if not self._threads:
+                self._threads = [
+                    threading.Thread(target=self._loop, name=f"{self.name}-{index}", daemon=True)
+                    for index in range(self.consumers)
+                ]
+                for thread in self._threads:
+                    thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        entry = self._queue.get(timeout=remaining)
+                    else:
+                        # Deadline reached: only take what is already queued
+                        entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stop = True
+                    break
+                batch.append(entry)
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch: List[Tuple[T, "Future[R]"]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = list(self.handler(items))
+            if len(results) != len(items):
+                raise RuntimeError(f"{self.name}: handler returned {len(results)} results for {len(items)} items")
+        except BaseException as exc:
+            # Every caller must be woken up, whatever went wrong
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        with self._lock:
+            self.batches += 1
+            self.items += len(items)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
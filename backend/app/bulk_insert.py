@@ -0,0 +1,77 @@
+from datetime import datetime
+from io import StringIO
+from typing import Any, Dict, List
+
+from sqlalchemy import insert, text
+from sqlmodel import Session
+
+from .config import get_settings
+from .models import Review
+
+settings = get_settings()
+
+review_table = Review.__table__
+REVIEW_COLUMNS = [column.name for column in review_table.columns if column.name != "id"]
+
+
+def review_rows(reviews: List[Review]) -> List[Dict[str, Any]]:
+    return [{column: getattr(review, column) for column in REVIEW_COLUMNS} for review in reviews]
+
+
+def _copy_field(value: Any) -> str:
+    # CSV format: unquoted empty field is NULL, anything else is quoted
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_reviews(session: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    PostgreSQL COPY into reviews. COPY cannot return generated keys, so the
+    ids are reserved from the table's sequence first and written explicitly.
+    """
+    connection = session.connection()
+    ids = connection.execute(
+        text("SELECT nextval(pg_get_serial_sequence('reviews', 'id')) FROM generate_series(1, :count)"),
+        {"count": len(rows)},
+    ).scalars().all()
+
+    buffer = StringIO()
+    for review_id, row in zip(ids, rows):
+        buffer.write(",".join([str(review_id)] + [_copy_field(row[column]) for column in REVIEW_COLUMNS]))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    columns = ", ".join(["id"] + REVIEW_COLUMNS)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY reviews ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+    return ids
+
+
+def insert_reviews(session: Session, reviews: List[Review], batch_size: int = 0) -> List[Review]:
+    """
+    Writes new reviews with Core-level inserts instead of the ORM unit of work:
+    COPY on PostgreSQL (when `bulk_insert_use_copy` is on), otherwise one
+    executemany INSERT ... RETURNING per `batch_size` rows. The generated ids
+    are set on the review objects, which are not added to the session.
+    Runs in the session's transaction; the caller commits.
+    """
+    if not reviews:
+        return reviews
+    batch_size = batch_size or settings.bulk_insert_batch_size
+    for start in range(0, len(reviews), batch_size):
+        batch = reviews[start:start + batch_size]
+        rows = review_rows(batch)
+        if session.get_bind().dialect.name == "postgresql" and settings.bulk_insert_use_copy:
+            ids = _copy_reviews(session, rows)
+        else:
+            statement = insert(review_table).returning(review_table.c.id, sort_by_parameter_order=True)
+            ids = session.execute(statement, rows).scalars().all()
+        for review, review_id in zip(batch, ids):
+            review.id = review_id
+    return reviews
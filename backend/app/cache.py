@@ -0,0 +1,158 @@
+import hashlib
+import json
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from .database import insert_ignore
+from .models import AnalysisCacheEntry
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU mapping with optional per-entry TTL.
+    Keeps hit/miss counters for reporting.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[1] is not None and entry[1] < time.monotonic():
+                del self._data[key]
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores `value`; `ttl` overrides the cache's TTL for this entry."""
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC, trimmed, single spaces."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class AnalysisCache:
+    """
+    Two-tier cache for model outputs, keyed on the hash of the normalized text
+    and the identity of the model that produced the result.
+
+    The memory tier is a per-process LRU. The optional persistent tier is the
+    `analysis_cache` table, which survives restarts and is shared by every
+    worker using the same database.
+    """
+
+    # Rows per IN (...) lookup against the persistent tier
+    lookup_chunk_size = 500
+
+    def __init__(self, maxsize: int, engine: Optional[Engine] = None) -> None:
+        self.memory = LRUCache(maxsize)
+        self.engine = engine
+        self.persistent_hits = 0
+        self.persistent_misses = 0
+
+    @staticmethod
+    def make_key(kind: str, model: str, text: str) -> str:
+        payload = "\0".join((kind, model, normalize_text(text)))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        found: Dict[str, Any] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.memory.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        if missing and self.engine is not None:
+            with Session(self.engine) as session:
+                for start in range(0, len(missing), self.lookup_chunk_size):
+                    chunk = missing[start:start + self.lookup_chunk_size]
+                    statement = select(AnalysisCacheEntry).where(AnalysisCacheEntry.key.in_(chunk))
+                    for entry in session.exec(statement):
+                        value = json.loads(entry.value)
+                        found[entry.key] = value
+                        self.memory.set(entry.key, value)
+            hits = sum(1 for key in missing if key in found)
+            self.persistent_hits += hits
+            self.persistent_misses += len(missing) - hits
+        return found
+
+    def set_many(self, values: Dict[str, Any], kind: str, model: str) -> None:
+        for key, value in values.items():
+            self.memory.set(key, value)
+        if not values or self.engine is None:
+            return
+        created_at = datetime.utcnow()
+        rows = [
+            {"key": key, "kind": kind, "model": model, "value": json.dumps(value), "created_at": created_at}
+            for key, value in values.items()
+        ]
+        with self.engine.begin() as connection:
+            connection.execute(insert_ignore(self.engine, AnalysisCacheEntry.__table__), rows)
+
+    def clear(self) -> None:
+        self.memory.clear()
+
+    def stats(self) -> dict:
+        stats = {"memory": self.memory.stats(), "persistent": None}
+        if self.engine is not None:
+            lookups = self.persistent_hits + self.persistent_misses
+            stats["persistent"] = {
+                "hits": self.persistent_hits,
+                "misses": self.persistent_misses,
+                "hit_ratio": round(self.persistent_hits / lookups, 4) if lookups else 0.0,
+            }
+        return stats
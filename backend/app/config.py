@@ -1,4 +1,6 @@
 from functools import lru_cache
+from typing import Dict, List, Literal, Optional
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -9,6 +11,105 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_access_token_expires_minutes: int = 60
     database_url: str = "sqlite:///./sentimentpulse.db"
+    password_hash_workers: int = 4
+    password_hash_queue_size: int = 32
+    user_cache_size: int = 1024
+    user_cache_ttl_seconds: float = 30.0
+    # Admin rights may be revoked outside the API (scripts, direct SQL), which
+    # cannot reach the cache, so admin entries expire sooner
+    user_cache_admin_ttl_seconds: float = 5.0
+
+    # Database engine: SQLite profile
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268435456
+    # Database engine: PostgreSQL profile
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+
+    # GET /reviews/ paging
+    reviews_page_size: int = 50
+    reviews_page_size_max: int = 200
+    review_summary_length: int = 200
+    # PostgreSQL text search configuration of the review index; "simple"
+    # does not stem, which suits multilingual reviews
+    search_text_config: str = "simple"
+
+    # Cached JSON responses for GET /public/{uuid} and GET /dashboard/
+    response_cache_size: int = 2048
+    response_cache_ttl_seconds: float = 10.0
+
+    # GET /dashboard/trends
+    trends_default_days: int = 30
+    trends_max_buckets: int = 1000
+
+    # NLP models
+    sentiment_model_name: str = "nlptown/bert-base-multilingual-uncased-sentiment"
+    sentiment_backend: Literal["torch", "torch-int8", "onnx", "onnx-int8"] = "torch"
+    onnx_model_dir: str = "./onnx_models"
+    # spaCy pipeline per review language; texts in other languages use the default
+    spacy_models: Dict[str, str] = {"en": "en_core_web_sm", "fr": "fr_core_news_sm"}
+    # Deprecated single-pipeline setting, still honoured as the English model
+    spacy_model_name: Optional[str] = None
+    spacy_default_language: str = "en"
+    # Cap on the resident memory of loaded spaCy models (0 = unlimited); the
+    # least recently used language is evicted first, the default never is
+    spacy_memory_budget_mb: int = 0
+    # Only the NER component is used, so the rest of the pipeline is not loaded
+    spacy_excluded_components: List[str] = [
+        "tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "morphologizer",
+    ]
+    spacy_batch_size: int = 64
+    spacy_n_process: int = 1
+    warm_up_models: bool = True
+
+    # Analysis result cache
+    analysis_cache_size: int = 10000
+    analysis_cache_persistent: bool = False
+
+    # Inference batching
+    inference_batch_size: int = 32
+    inference_batching_enabled: bool = True
+    inference_batch_max_size: int = 16
+    inference_batch_max_wait_ms: float = 5.0
+    # Longest a request waits for its micro-batch result before failing
+    inference_batch_timeout_seconds: float = 60.0
+
+    # CSV import: rows parsed, analyzed and committed per batch
+    import_batch_size: int = 500
+    import_spool_dir: str = "./import_spool"
+    import_job_workers: int = 1
+    # A running job whose lease is not renewed (one renewal per committed
+    # batch) for this long is taken over by another process
+    import_job_lease_seconds: float = 300.0
+    bulk_insert_batch_size: int = 1000
+    bulk_insert_use_copy: bool = True
+
+    # Deferred analysis: public form submissions are stored at once and
+    # analyzed by a background worker in batches
+    public_reviews_deferred_analysis: bool = False
+    analysis_worker_batch_size: int = 32
+    analysis_worker_poll_seconds: float = 1.0
+    # A review that fails this many times while the rest of its batch succeeds
+    # is skipped by the worker (it stays pending until the process restarts)
+    analysis_worker_max_attempts: int = 3
+
+    # Inference worker processes (0 runs the models in the web process)
+    inference_workers: int = 0
+    inference_threads_per_worker: int = 1
+
+    @model_validator(mode="after")
+    def _apply_legacy_spacy_model_name(self) -> "Settings":
+        if self.spacy_model_name is None:
+            return self
+        if "spacy_models" in self.model_fields_set and self.spacy_models.get("en") != self.spacy_model_name:
+            raise ValueError("SPACY_MODEL_NAME conflicts with SPACY_MODELS; set the English model in SPACY_MODELS only")
+        self.spacy_models = {**self.spacy_models, "en": self.spacy_model_name}
+        return self
 
     class Config:
         env_file = ".env"
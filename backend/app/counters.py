@@ -0,0 +1,135 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, update
+from sqlmodel import Session, func, select
+
+from .database import insert_ignore
+from .models import Review, SentimentCounter
+
+SENTIMENT_LABELS = ("positive", "neutral", "negative")
+# Reviews accepted for deferred analysis are counted as pending until analyzed
+PENDING = "pending"
+COUNTED_LABELS = SENTIMENT_LABELS + (PENDING,)
+COUNT_FIELDS = COUNTED_LABELS + ("total",)
+
+CounterKey = Tuple[str, int]
+
+
+def normalize_sentiment(sentiment: Optional[str]) -> str:
+    # Missing labels count as neutral, labels compare case-insensitively
+    return sentiment.lower() if sentiment else "neutral"
+
+
+def is_pending(review: Review) -> bool:
+    return review.analyzed_at is None and review.sentiment is None
+
+
+def review_label(review: Review) -> str:
+    return PENDING if is_pending(review) else normalize_sentiment(review.sentiment)
+
+
+def review_label_expression():
+    """SQL counterpart of review_label."""
+    return case(
+        (and_(Review.analyzed_at.is_(None), Review.sentiment.is_(None)), PENDING),
+        else_=func.lower(func.coalesce(func.nullif(Review.sentiment, ""), "neutral")),
+    )
+
+
+def _empty_counts() -> Dict[str, int]:
+    return {field: 0 for field in COUNT_FIELDS}
+
+
+def _review_keys(review: Review) -> List[CounterKey]:
+    keys = []
+    if review.owner_id is not None:
+        keys.append(("owner", review.owner_id))
+    if review.form_id is not None:
+        keys.append(("form", review.form_id))
+    return keys
+
+
+def apply_review_counts(session: Session, reviews: Iterable[Review], sign: int = 1) -> None:
+    """
+    Adds (sign=1) or removes (sign=-1) reviews from the owner and form
+    counters. Runs in the caller's transaction, so the counters are committed
+    together with the review rows.
+    """
+    deltas: Dict[CounterKey, Dict[str, int]] = defaultdict(_empty_counts)
+    for review in reviews:
+        label = review_label(review)
+        for key in _review_keys(review):
+            deltas[key]["total"] += sign
+            if label in COUNTED_LABELS:
+                deltas[key][label] += sign
+    if not deltas:
+        return
+
+    table = SentimentCounter.__table__
+    session.execute(
+        insert_ignore(session.get_bind(), table),
+        [{"scope": scope, "scope_id": scope_id, **_empty_counts()} for scope, scope_id in deltas],
+    )
+    for (scope, scope_id), delta in deltas.items():
+        session.execute(
+            update(table)
+            .where(table.c.scope == scope, table.c.scope_id == scope_id)
+            .values({field: table.c[field] + delta[field] for field in COUNT_FIELDS if delta[field]})
+        )
+
+
+def delete_counters(session: Session, scope: str, scope_id: int) -> None:
+    session.execute(
+        delete(SentimentCounter).where(SentimentCounter.scope == scope, SentimentCounter.scope_id == scope_id)
+    )
+
+
+def read_counts(session: Session, scope: str, scope_id: int) -> Dict[str, int]:
+    counter = session.get(SentimentCounter, (scope, scope_id))
+    if counter is None:
+        return _empty_counts()
+    return {field: getattr(counter, field) for field in COUNT_FIELDS}
+
+
+def compute_counters(session: Session) -> Dict[CounterKey, Dict[str, int]]:
+    """Recomputes every counter from the raw reviews table."""
+    label = review_label_expression()
+    counters: Dict[CounterKey, Dict[str, int]] = defaultdict(_empty_counts)
+    for scope, column in (("owner", Review.owner_id), ("form", Review.form_id)):
+        statement = select(column, label, func.count()).where(column.is_not(None)).group_by(column, label)
+        for scope_id, sentiment, count in session.exec(statement):
+            counts = counters[(scope, scope_id)]
+            counts["total"] += count
+            if sentiment in COUNTED_LABELS:
+                counts[sentiment] += count
+    return dict(counters)
+
+
+def check_counters(session: Session) -> List[dict]:
+    """Lists counters whose stored values differ from the reviews table."""
+    expected = compute_counters(session)
+    stored = {
+        (counter.scope, counter.scope_id): {field: getattr(counter, field) for field in COUNT_FIELDS}
+        for counter in session.exec(select(SentimentCounter))
+    }
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key, _empty_counts())
+        have = stored.get(key, _empty_counts())
+        if want != have:
+            mismatches.append({"scope": key[0], "scope_id": key[1], "expected": want, "stored": have})
+    return mismatches
+
+
+def rebuild_counters(session: Session) -> int:
+    """Replaces every counter with values recomputed from the reviews table."""
+    counters = compute_counters(session)
+    session.execute(delete(SentimentCounter))
+    if counters:
+        session.execute(
+            SentimentCounter.__table__.insert(),
+            [{"scope": scope, "scope_id": scope_id, **counts} for (scope, scope_id), counts in counters.items()],
+        )
+    session.commit()
+    return len(counters)
@@ -1,15 +1,75 @@
 from contextlib import contextmanager
 
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy import Table, event, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.sql.dml import Insert
+from sqlmodel import Session, create_engine
 
-from .config import get_settings
+from .config import Settings, get_settings
 
 settings = get_settings()
-engine = create_engine(settings.database_url, echo=False)
+
+
+def _sqlite_engine(settings: Settings) -> Engine:
+    """
+    Profile for SQLite: WAL lets readers run alongside the single writer,
+    and the busy timeout makes concurrent writers wait instead of failing
+    with "database is locked".
+    """
+    engine = create_engine(
+        settings.database_url,
+        echo=False,
+        connect_args={"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000},
+    )
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.close()
+
+    return engine
+
+
+def _server_engine(settings: Settings) -> Engine:
+    """Profile for PostgreSQL and other server databases: sized, self-healing pool."""
+    return create_engine(
+        settings.database_url,
+        echo=False,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+
+
+def build_engine(settings: Settings) -> Engine:
+    if make_url(settings.database_url).get_backend_name() == "sqlite":
+        return _sqlite_engine(settings)
+    return _server_engine(settings)
+
+
+engine = build_engine(settings)
 
 
 def init_db() -> None:
-    SQLModel.metadata.create_all(engine)
+    from .migrations import run_migrations
+
+    run_migrations(engine)
+
+
+def insert_ignore(bind: Engine, table: Table) -> Insert:
+    """INSERT that silently skips rows conflicting with an existing key."""
+    if bind.dialect.name == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if bind.dialect.name == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    return insert(table).prefix_with("IGNORE")
 
 
 @contextmanager
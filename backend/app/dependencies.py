@@ -4,6 +4,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session, select
 
+from .cache import LRUCache
 from .config import get_settings
 from .database import get_session
 from .models import User
@@ -12,6 +13,17 @@ from .security import decode_access_token
 settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_prefix}/auth/login")
 
+# Token subject (email) -> column values of the user, so authenticated
+# requests skip the users lookup. Entries expire after a short TTL (shorter
+# for admins); code in this process that deletes a user or changes its role
+# calls invalidate_user. Changes made by other processes, such as
+# scripts/create_admin.py, apply once the entry expires.
+user_cache = LRUCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl_seconds)
+
+
+def invalidate_user(email: str) -> None:
+    user_cache.delete(email)
+
 
 def get_db() -> Session:
     with get_session() as session:
@@ -28,13 +40,19 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
 
-    statement = select(User).where(User.email == email)
-    user = session.exec(statement).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
-        )
-    return user
+    snapshot = user_cache.get(email)
+    if snapshot is None:
+        statement = select(User).where(User.email == email)
+        user = session.exec(statement).first()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
+            )
+        snapshot = user.model_dump()
+        admin_ttl = min(settings.user_cache_admin_ttl_seconds, settings.user_cache_ttl_seconds)
+        user_cache.set(email, snapshot, ttl=admin_ttl if user.role == "admin" else None)
+    # A fresh detached instance per request, so callers cannot alter the cached copy
+    return User(**snapshot)
 
 
 def require_admin(user: Annotated[User, Depends(get_current_user)]) -> User:
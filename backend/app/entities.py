@@ -0,0 +1,137 @@
+"""
+Normalized review <-> entity index. `Review.key_entities` keeps the
+comma-joined string for display; this table holds one row per review and
+entity so "most mentioned entities" is an indexed aggregate instead of a
+scan over every review.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import case, delete, update
+from sqlmodel import Session, func, select
+
+from .counters import SENTIMENT_LABELS, normalize_sentiment
+from .database import insert_ignore
+from .models import Review, ReviewEntity
+
+ENTITY_MAX_LENGTH = 200
+
+
+def parse_entities(key_entities: Optional[str]) -> List[str]:
+    """Splits a `key_entities` string back into distinct entity names."""
+    if not key_entities:
+        return []
+    entities = []
+    for entity in key_entities.split(","):
+        entity = " ".join(entity.split())[:ENTITY_MAX_LENGTH]
+        if entity and entity not in entities:
+            entities.append(entity)
+    return entities
+
+
+def entity_rows(reviews: Iterable[Review]) -> List[Dict]:
+    return [
+        {
+            "review_id": review.id,
+            "entity": entity,
+            "owner_id": review.owner_id,
+            "form_id": review.form_id,
+            "sentiment": normalize_sentiment(review.sentiment),
+            "created_at": review.created_at,
+        }
+        for review in reviews
+        for entity in parse_entities(review.key_entities)
+    ]
+
+
+def apply_review_entities(session: Session, reviews: Iterable[Review]) -> int:
+    """
+    Indexes the entities of reviews that already have ids, in the caller's
+    transaction. Rows that exist already are left alone, so it is safe to
+    run again over the same reviews.
+    """
+    rows = entity_rows(reviews)
+    if rows:
+        session.execute(insert_ignore(session.get_bind(), ReviewEntity.__table__), rows)
+    return len(rows)
+
+
+def delete_review_entities(session: Session, review_ids: List[int]) -> None:
+    if review_ids:
+        session.execute(delete(ReviewEntity).where(ReviewEntity.review_id.in_(review_ids)))
+
+
+def delete_owner_entities(session: Session, owner_id: int) -> None:
+    session.execute(delete(ReviewEntity).where(ReviewEntity.owner_id == owner_id))
+
+
+def detach_form_entities(session: Session, form_id: int) -> None:
+    # Mirrors the reviews, which stay with their owner when a form is deleted
+    session.execute(update(ReviewEntity).where(ReviewEntity.form_id == form_id).values(form_id=None))
+
+
+def top_entities(
+    session: Session,
+    owner_id: int,
+    limit: int = 10,
+    sentiment: Optional[str] = None,
+    form_id: Optional[int] = None,
+    created_after=None,
+    created_before=None,
+) -> List[dict]:
+    """
+    Most mentioned entities of an owner with their per-label breakdown.
+    With `sentiment`, entities are ranked by mentions with that label.
+    """
+    counts = {
+        label: func.sum(case((ReviewEntity.sentiment == label, 1), else_=0)).label(label)
+        for label in SENTIMENT_LABELS
+    }
+    total = func.count().label("total")
+    rank = counts[sentiment] if sentiment else total
+    statement = (
+        select(ReviewEntity.entity, total, *counts.values())
+        .where(ReviewEntity.owner_id == owner_id)
+        .group_by(ReviewEntity.entity)
+        .order_by(rank.desc(), ReviewEntity.entity)
+        .limit(limit)
+    )
+    if sentiment:
+        statement = statement.having(rank > 0)
+    if form_id is not None:
+        statement = statement.where(ReviewEntity.form_id == form_id)
+    if created_after is not None:
+        statement = statement.where(ReviewEntity.created_at >= created_after)
+    if created_before is not None:
+        statement = statement.where(ReviewEntity.created_at < created_before)
+    return [
+        {
+            "entity": row.entity,
+            "total": row.total,
+            **{label: getattr(row, label) for label in SENTIMENT_LABELS},
+        }
+        for row in session.exec(statement)
+    ]
+
+
+def backfill_review_entities(session: Session, batch_size: int = 1000, after_id: int = 0, on_batch=None) -> int:
+    """
+    Indexes the `key_entities` of existing reviews, walking the reviews
+    table by id in batches and committing each one. Returns the number of
+    entity rows processed (rows that already existed are skipped).
+    """
+    written = 0
+    while True:
+        reviews = session.exec(
+            select(Review)
+            .where(Review.id > after_id, Review.key_entities.is_not(None), Review.key_entities != "")
+            .order_by(Review.id)
+            .limit(batch_size)
+        ).all()
+        if not reviews:
+            return written
+        written += apply_review_entities(session, reviews)
+        after_id = reviews[-1].id
+        session.commit()
+        session.expunge_all()
+        if on_batch is not None:
+            on_batch(after_id, written)
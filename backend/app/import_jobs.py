@@ -0,0 +1,228 @@
+import csv
+import os
+import shutil
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import BinaryIO, Optional
+
+from sqlalchemy import and_, or_, update
+from sqlmodel import Session, select
+
+from .config import get_settings
+from .database import get_session
+from .models import ImportJob
+from .services import bulk_import_reviews
+
+settings = get_settings()
+
+# Identifies this process in import_jobs.lease_owner
+RUNNER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaseLost(Exception):
+    """Another runner took the job over after this runner's lease expired."""
+
+
+def count_csv_rows(path: str) -> int:
+    """Number of non-blank data rows, used for the progress ETA."""
+    with open(path, newline="", encoding="utf-8", errors="replace") as handle:
+        return max(0, sum(1 for row in csv.reader(handle) if row) - 1)
+
+
+def create_import_job(session: Session, upload: BinaryIO, filename: str, owner_id: int) -> ImportJob:
+    """Copies the upload to the spool directory and records a pending job."""
+    os.makedirs(settings.import_spool_dir, exist_ok=True)
+    job_id = str(uuid.uuid4())
+    file_path = os.path.join(settings.import_spool_dir, f"{job_id}.csv")
+    with open(file_path, "wb") as spooled:
+        shutil.copyfileobj(upload, spooled, length=1024 * 1024)
+
+    job = ImportJob(
+        id=job_id,
+        owner_id=owner_id,
+        filename=filename,
+        file_path=file_path,
+        rows_total=count_csv_rows(file_path),
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def _claimable(now: datetime):
+    # Jobs marked running before leases existed have no expiry and are claimable
+    return or_(
+        ImportJob.status == "pending",
+        and_(
+            ImportJob.status == "running",
+            or_(ImportJob.lease_expires_at.is_(None), ImportJob.lease_expires_at < now),
+        ),
+    )
+
+
+def _lease_expiry() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=settings.import_job_lease_seconds)
+
+
+def claim_import_job(session: Session, job_id: str, runner_id: str = RUNNER_ID) -> bool:
+    """
+    Takes the job if it is pending or its lease has expired, with a single
+    conditional UPDATE, so only one of several processes trying at once wins.
+    """
+    now = datetime.utcnow()
+    result = session.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, _claimable(now))
+        .values(status="running", lease_owner=runner_id, lease_expires_at=_lease_expiry())
+    )
+    session.commit()
+    return result.rowcount == 1
+
+
+def _renew_lease(session: Session, job_id: str, runner_id: str) -> None:
+    result = session.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.lease_owner == runner_id)
+        .values(lease_expires_at=_lease_expiry())
+    )
+    if result.rowcount != 1:
+        raise LeaseLost(job_id)
+
+
+def run_import_job(session: Session, job_id: str, runner_id: str = RUNNER_ID) -> Optional[ImportJob]:
+    """
+    Claims and runs (or resumes) an import job. Returns None if the job does
+    not exist or another runner holds it. Progress and the lease renewal are
+    written in the same transaction as each batch of reviews, so after a
+    crash the job restarts right after the last committed batch, once its
+    lease has expired.
+
+    A failed job keeps its spooled file so it can be retried
+    (retry_import_job); the file is deleted when the job completes.
+    """
+    if session.get(ImportJob, job_id) is None or not claim_import_job(session, job_id, runner_id):
+        return None
+    job = session.get(ImportJob, job_id)
+    now = datetime.utcnow()
+    job.started_at = job.started_at or now
+    job.run_started_at = now
+    job.run_start_rows = job.rows_processed
+    job.updated_at = now
+    session.add(job)
+    session.commit()
+
+    def record_progress(rows_processed: int, rows_failed: int) -> None:
+        # Raising here rolls the batch back: its rows belong to the new owner's run
+        _renew_lease(session, job.id, runner_id)
+        job.rows_processed += rows_processed
+        job.rows_failed += rows_failed
+        job.rows_imported += rows_processed - rows_failed
+        job.updated_at = datetime.utcnow()
+        session.add(job)
+
+    try:
+        with open(job.file_path, "rb") as upload:
+            bulk_import_reviews(
+                session,
+                upload,
+                job.owner_id,
+                skip_rows=job.rows_processed,
+                on_batch=record_progress,
+            )
+    except LeaseLost:
+        session.rollback()
+        return None
+    except Exception as exc:
+        session.rollback()
+        job.status = "failed"
+        job.error = str(exc)
+    else:
+        job.status = "completed"
+    try:
+        _renew_lease(session, job.id, runner_id)
+    except LeaseLost:
+        session.rollback()
+        return None
+    job.lease_owner = job.lease_expires_at = None
+    job.finished_at = job.updated_at = datetime.utcnow()
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+
+    if job.status == "completed" and os.path.exists(job.file_path):
+        os.remove(job.file_path)
+    return job
+
+
+def retry_import_job(session: Session, job_id: str) -> bool:
+    """Puts a failed job back in the queue; it resumes after its last committed batch."""
+    job = session.get(ImportJob, job_id)
+    if job is None or job.status != "failed" or not os.path.exists(job.file_path):
+        return False
+    job.status = "pending"
+    job.error = None
+    job.finished_at = None
+    session.add(job)
+    session.commit()
+    return True
+
+
+def job_progress(job: ImportJob) -> dict:
+    """Throughput of the current run and the estimated time to completion."""
+    throughput = None
+    eta_seconds = None
+    if job.run_started_at and job.updated_at:
+        elapsed = (job.updated_at - job.run_started_at).total_seconds()
+        rows = job.rows_processed - job.run_start_rows
+        if elapsed > 0 and rows > 0:
+            throughput = round(rows / elapsed, 2)
+    if job.status == "completed":
+        eta_seconds = 0.0
+    elif throughput and job.rows_total is not None:
+        eta_seconds = round(max(0, job.rows_total - job.rows_processed) / throughput, 1)
+    return {"throughput_rows_per_second": throughput, "eta_seconds": eta_seconds}
+
+
+class ImportJobRunner:
+    """Runs import jobs on a small background thread pool."""
+
+    def __init__(self, workers: int = 1) -> None:
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, job_id: str) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="import-job")
+        self._executor.submit(self._run, job_id)
+
+    def resume_pending(self) -> int:
+        """
+        Queues pending jobs and running jobs whose lease has expired (their
+        process died). Each one is claimed before it runs, so several
+        processes resuming at once do not import a job twice.
+        """
+        with get_session() as session:
+            statement = (
+                select(ImportJob.id).where(_claimable(datetime.utcnow())).order_by(ImportJob.created_at)
+            )
+            job_ids = session.exec(statement).all()
+        for job_id in job_ids:
+            self.submit(job_id)
+        return len(job_ids)
+
+    def shutdown(self) -> None:
+        # Jobs that have not started stay pending and are resumed on restart
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _run(job_id: str) -> None:
+        with get_session() as session:
+            run_import_job(session, job_id)
+
+
+import_job_runner = ImportJobRunner(settings.import_job_workers)
@@ -0,0 +1,94 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, List, Optional
+
+
+def _init_worker(threads: int) -> None:
+    # Pin intra-op parallelism before torch is imported so that N workers
+    # use N * threads cores instead of each one grabbing every core.
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+    import torch
+
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+    from .services import warm_up_models
+
+    warm_up_models()
+
+
+def _worker_status() -> dict:
+    from .services import model_registry
+
+    return {"pid": os.getpid(), "models": model_registry.status()}
+
+
+class InferencePool:
+    """
+    Pool of worker processes that each hold their own copy of the models.
+
+    The web process submits batches of texts and waits on the returned
+    futures; the workers run the model functions from `services`.
+    """
+
+    def __init__(self, workers: int, threads_per_worker: int = 1) -> None:
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.ready = False
+
+    def start(self) -> List[dict]:
+        """Spawns every worker and waits until each has loaded its models."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # fork is unsafe once torch has started its own threads
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.threads_per_worker,),
+            )
+        # Submitting one task per worker at once makes the executor spawn all of them
+        futures = [self._executor.submit(_worker_status) for _ in range(self.workers)]
+        statuses = [future.result() for future in futures]
+        self.ready = True
+        return statuses
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> "Future[Any]":
+        if self._executor is None:
+            self.start()
+        return self._executor.submit(func, *args)
+
+    def map_batches(self, func: Callable[[List[str], int], List[Any]], texts: List[str], batch_size: int) -> List[Any]:
+        """
+        Splits `texts` into chunks of at most `batch_size`, spreads them over
+        the workers and returns the concatenated results in input order.
+        A batch smaller than `batch_size` (e.g. a micro-batch of online
+        requests) is still split so every worker gets a share.
+        """
+        chunk_size = max(1, min(batch_size, math.ceil(len(texts) / self.workers)))
+        futures = [
+            self.submit(func, texts[start:start + chunk_size], batch_size)
+            for start in range(0, len(texts), chunk_size)
+        ]
+        results: List[Any] = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def status(self) -> dict:
+        return {
+            "workers": self.workers,
+            "threads_per_worker": self.threads_per_worker,
+            "ready": self.ready,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self.ready = False
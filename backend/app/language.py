@@ -0,0 +1,44 @@
+import re
+from typing import Dict, FrozenSet, Iterable
+
+# Short, high-frequency function words. Reviews are usually a sentence or
+# two, where these are far more reliable than character n-grams and cost a
+# single pass over the tokens.
+STOPWORDS: Dict[str, FrozenSet[str]] = {
+    "en": frozenset(
+        "the and is was are were it this that of to in for on with my our you your "
+        "not but very have has had they we i at be so from an or would will just "
+        "no all too there what when good great bad".split()
+    ),
+    "fr": frozenset(
+        "le la les un une des du de et est était sont il elle ce cette ces pour "
+        "dans sur avec mon ma mes notre nos vous votre pas mais très trop je nous "
+        "ils qui que au aux ne on y en été bien rien tout c j l d n qu".split()
+    ),
+}
+
+# Letters that almost only show up in French among the supported languages
+FRENCH_MARKERS = frozenset("éèêàùâîôûçœ")
+
+_TOKEN_PATTERN = re.compile(r"[^\W\d_]+")
+
+
+def detect_language(text: str, languages: Iterable[str], default: str) -> str:
+    """
+    Picks the language in `languages` whose stopwords occur most often in
+    `text`, falling back to `default` when there is no clear winner.
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    scores = {
+        language: sum(token in STOPWORDS[language] for token in tokens)
+        for language in languages
+        if language in STOPWORDS
+    }
+    if "fr" in scores and any(char in FRENCH_MARKERS for char in text.lower()):
+        scores["fr"] += 1
+    if not scores:
+        return default
+    best = max(scores, key=scores.get)
+    if scores[best] == 0 or sum(score == scores[best] for score in scores.values()) > 1:
+        return default
+    return best
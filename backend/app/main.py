@@ -1,9 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from .analysis_worker import analysis_worker
 from .config import get_settings
 from .database import init_db
-from .routers import auth, dashboard, reviews, users, forms
+from .import_jobs import import_job_runner
+from .routers import auth, dashboard, health, reviews, users, forms
+from .security import PasswordHasherBusy
+from .services import inference_pool, review_batcher, warm_up_models
 
 settings = get_settings()
 
@@ -14,14 +19,41 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many authentication requests, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.on_event("startup")
 def startup_event() -> None:
     init_db()
+    if inference_pool is not None:
+        inference_pool.start()
+    elif settings.warm_up_models:
+        warm_up_models()
+    import_job_runner.resume_pending()
+    if settings.public_reviews_deferred_analysis:
+        analysis_worker.start()
+
+
+@app.on_event("shutdown")
+def shutdown_event() -> None:
+    import_job_runner.shutdown()
+    analysis_worker.shutdown()
+    review_batcher.shutdown()
+    if inference_pool is not None:
+        inference_pool.shutdown()
 
 
+app.include_router(health.router)
 app.include_router(auth.router, prefix=settings.api_prefix)
 app.include_router(reviews.router, prefix=settings.api_prefix)
 app.include_router(dashboard.router, prefix=settings.api_prefix)
@@ -0,0 +1,128 @@
+"""
+Minimal schema migration runner.
+
+Each migration is a (version, function) pair applied once, in order, inside a
+transaction, and recorded in the `schema_migrations` table. The first
+migration creates any missing table from the current models, so later
+migrations must be idempotent: they are also run against databases whose
+tables were just created with the latest definitions.
+"""
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session, SQLModel
+
+from .counters import rebuild_counters
+from .models import Review, ReviewEntity, SentimentRollup
+from .rollups import rebuild_rollups
+from .search import create_search_index
+
+# Kept out of SQLModel.metadata so create_all never touches it
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", String(64), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Arbitrary key for pg_advisory_xact_lock, so concurrent workers migrate one at a time
+_POSTGRES_LOCK_KEY = 720_915_001
+
+
+def _create_missing_tables(connection: Connection) -> None:
+    SQLModel.metadata.create_all(connection)
+
+
+def _create_review_indexes(connection: Connection) -> None:
+    for index in Review.__table__.indexes:
+        if index.name in ("ix_reviews_owner_id_created_at", "ix_reviews_form_id_created_at"):
+            index.create(connection, checkfirst=True)
+
+
+def _backfill_sentiment_counters(connection: Connection) -> None:
+    with Session(bind=connection) as session:
+        rebuild_counters(session)
+
+
+def _backfill_sentiment_rollups(connection: Connection) -> None:
+    SentimentRollup.__table__.create(connection, checkfirst=True)
+    with Session(bind=connection) as session:
+        rebuild_rollups(session)
+
+
+def _create_review_entities(connection: Connection) -> None:
+    # Existing key_entities are indexed by scripts/backfill_review_entities.py,
+    # in batches, rather than inside this transaction
+    ReviewEntity.__table__.create(connection, checkfirst=True)
+    for index in ReviewEntity.__table__.indexes:
+        index.create(connection, checkfirst=True)
+
+
+def _add_pending_analysis(connection: Connection) -> None:
+    columns = {column["name"] for column in inspect(connection).get_columns("sentiment_counters")}
+    if "pending" not in columns:
+        connection.execute(text("ALTER TABLE sentiment_counters ADD COLUMN pending INTEGER NOT NULL DEFAULT 0"))
+    for index in Review.__table__.indexes:
+        if index.name == "ix_reviews_pending_analysis":
+            index.create(connection, checkfirst=True)
+    # Unlabelled, unanalyzed reviews used to be counted as neutral
+    with Session(bind=connection) as session:
+        rebuild_counters(session)
+    with Session(bind=connection) as session:
+        rebuild_rollups(session)
+
+
+def _add_review_model_version(connection: Connection) -> None:
+    # Reviews analyzed before this column existed keep NULL: the model that
+    # scored them is unknown, so scripts/reanalyze_reviews.py treats them as stale
+    columns = {column["name"] for column in inspect(connection).get_columns("reviews")}
+    if "model_version" not in columns:
+        connection.execute(text("ALTER TABLE reviews ADD COLUMN model_version VARCHAR(255)"))
+
+
+def _add_import_job_leases(connection: Connection) -> None:
+    columns = {column["name"] for column in inspect(connection).get_columns("import_jobs")}
+    if "lease_owner" not in columns:
+        connection.execute(text("ALTER TABLE import_jobs ADD COLUMN lease_owner VARCHAR(64)"))
+    if "lease_expires_at" not in columns:
+        column_type = DateTime().compile(dialect=connection.dialect)
+        connection.execute(text(f"ALTER TABLE import_jobs ADD COLUMN lease_expires_at {column_type}"))
+
+
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("0001_initial_schema", _create_missing_tables),
+    ("0002_review_owner_form_created_at_indexes", _create_review_indexes),
+    ("0003_backfill_sentiment_counters", _backfill_sentiment_counters),
+    ("0004_sentiment_rollups", _backfill_sentiment_rollups),
+    ("0005_review_entities", _create_review_entities),
+    ("0006_review_full_text_search", create_search_index),
+    ("0007_deferred_analysis", _add_pending_analysis),
+    ("0008_review_model_version", _add_review_model_version),
+    ("0009_import_job_leases", _add_import_job_leases),
+]
+
+
+def applied_migrations(connection: Connection) -> List[str]:
+    if not inspect(connection).has_table(schema_migrations.name):
+        return []
+    return list(connection.execute(schema_migrations.select().order_by(schema_migrations.c.version)).scalars())
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """Applies pending migrations and returns the versions that were applied."""
+    applied_now = []
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _POSTGRES_LOCK_KEY})
+        migration_metadata.create_all(connection)
+        done = set(applied_migrations(connection))
+        for version, migrate in MIGRATIONS:
+            if version in done:
+                continue
+            migrate(connection)
+            connection.execute(schema_migrations.insert().values(version=version, applied_at=datetime.utcnow()))
+            applied_now.append(version)
+    return applied_now
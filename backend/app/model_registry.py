@@ -0,0 +1,169 @@
+import gc
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Iterable
+
+
+class ModelRegistry:
+    """
+    Holds the NLP models used by the services layer and loads each one on
+    first use, so importing the application never pays for model loading.
+    """
+
+    def __init__(self) -> None:
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        self._loaders[name] = loader
+
+    def get(self, name: str) -> Any:
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if name not in self._models:
+                started = time.perf_counter()
+                self._models[name] = self._loaders[name]()
+                self._load_seconds[name] = round(time.perf_counter() - started, 3)
+            return self._models[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def unload(self, name: str) -> None:
+        with self._lock:
+            self._models.pop(name, None)
+            self._load_seconds.pop(name, None)
+
+    @property
+    def ready(self) -> bool:
+        return all(name in self._models for name in self._loaders)
+
+    def status(self) -> Dict[str, dict]:
+        return {
+            name: {"loaded": name in self._models, "load_seconds": self._load_seconds.get(name)}
+            for name in self._loaders
+        }
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+class ModelPool:
+    """
+    Lazily loaded models keyed by name (e.g. one spaCy pipeline per
+    language), kept under a memory budget.
+
+    The resident memory each model added when it loaded is recorded; when
+    the loaded models exceed `memory_budget_mb` the least recently used ones
+    are evicted. Pinned models are never evicted. A budget of 0 disables
+    eviction.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Any],
+        memory_budget_mb: float = 0,
+        pinned: Iterable[str] = (),
+    ) -> None:
+        self._loader = loader
+        self.memory_budget_mb = memory_budget_mb
+        self.pinned = set(pinned)
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes_mb: Dict[str, float] = {}
+        self._loads: Dict[str, int] = defaultdict(int)
+        self._evictions: Dict[str, int] = defaultdict(int)
+        self._docs: Dict[str, int] = defaultdict(int)
+        self._seconds: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def _loaded(self, name: str) -> Any:
+        with self._lock:
+            model = self._models.get(name)
+            if model is not None:
+                self._models.move_to_end(name)
+            return model
+
+    def get(self, name: str) -> Any:
+        model = self._loaded(name)
+        if model is not None:
+            return model
+        # Loads take seconds, so they happen outside `_lock`: calls for models
+        # already loaded go on meanwhile. Loads run one at a time so the RSS
+        # delta measures a single model.
+        with self._load_lock:
+            model = self._loaded(name)
+            if model is not None:
+                return model
+            with self._lock:
+                # A model loaded before has a known size, so make room up front
+                self._evict(needed_mb=self._sizes_mb.get(name, 0.0), keep=name)
+            before = _rss_mb()
+            model = self._loader(name)
+            size_mb = max(0.0, _rss_mb() - before)
+            with self._lock:
+                self._sizes_mb[name] = size_mb
+                self._models[name] = model
+                self._loads[name] += 1
+                self._evict(needed_mb=0.0, keep=name)
+            return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def record(self, name: str, docs: int, seconds: float) -> None:
+        """Adds one timed call covering `docs` documents to the latency stats."""
+        with self._lock:
+            self._docs[name] += docs
+            self._seconds[name] += seconds
+
+    def memory_used_mb(self) -> float:
+        return sum(self._sizes_mb[name] for name in self._models)
+
+    def _evict(self, needed_mb: float, keep: str) -> None:
+        if not self.memory_budget_mb:
+            return
+        evicted = False
+        # OrderedDict iterates from least to most recently used
+        for name in list(self._models):
+            if self.memory_used_mb() + needed_mb <= self.memory_budget_mb:
+                break
+            if name == keep or name in self.pinned:
+                continue
+            del self._models[name]
+            self._evictions[name] += 1
+            evicted = True
+        if evicted:
+            gc.collect()
+
+    def stats(self) -> dict:
+        return {
+            "memory_budget_mb": self.memory_budget_mb,
+            "memory_used_mb": round(self.memory_used_mb(), 1),
+            "loaded": list(self._models),
+            "models": {
+                name: {
+                    "loaded": name in self._models,
+                    "size_mb": round(self._sizes_mb.get(name, 0.0), 1),
+                    "loads": self._loads[name],
+                    "evictions": self._evictions[name],
+                    "docs": self._docs[name],
+                    "avg_latency_ms": round(self._seconds[name] / self._docs[name] * 1000, 3) if self._docs[name] else None,
+                }
+                for name in sorted(set(self._loads) | set(self._docs))
+            },
+        }
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -20,6 +21,19 @@ class FeedbackForm(SQLModel, table=True):
 
 class Review(SQLModel, table=True):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # Dashboard, form stats and review listing filter on owner/form and
+        # order by newest first
+        Index("ix_reviews_owner_id_created_at", "owner_id", "created_at"),
+        Index("ix_reviews_form_id_created_at", "form_id", "created_at"),
+        # Queue of reviews waiting for deferred analysis, drained in id order
+        Index(
+            "ix_reviews_pending_analysis",
+            "id",
+            postgresql_where=text("analyzed_at IS NULL"),
+            sqlite_where=text("analyzed_at IS NULL"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     source: str = Field(default="manual", max_length=50)
@@ -34,6 +48,9 @@ class Review(SQLModel, table=True):
     )
     created_at: datetime = Field(default_factory=datetime.utcnow)
     analyzed_at: Optional[datetime] = None
+    model_version: Optional[str] = Field(
+        default=None, max_length=255, description="sentiment model that produced `sentiment`"
+    )
     owner_id: Optional[int] = Field(default=None, foreign_key="users.id")
     form_id: Optional[int] = Field(default=None, foreign_key="feedback_forms.id")
     
@@ -55,3 +72,82 @@ class User(SQLModel, table=True):
     feedback_forms: List[FeedbackForm] = Relationship(back_populates="owner")
 
 
+class AnalysisCacheEntry(SQLModel, table=True):
+    __tablename__ = "analysis_cache"
+
+    key: str = Field(primary_key=True, max_length=64, description="sha256 of kind, model and normalized text")
+    kind: str = Field(max_length=16, description="sentiment|entities")
+    model: str = Field(max_length=200)
+    value: str = Field(description="JSON encoded result")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ImportJob(SQLModel, table=True):
+    __tablename__ = "import_jobs"
+
+    id: str = Field(primary_key=True, max_length=36)
+    owner_id: int = Field(foreign_key="users.id", index=True)
+    filename: str
+    file_path: str = Field(description="spooled copy of the uploaded CSV")
+    status: str = Field(default="pending", max_length=16, description="pending|running|completed|failed")
+    rows_total: Optional[int] = None
+    rows_processed: int = Field(default=0, description="data rows consumed, committed with their batch")
+    rows_imported: int = 0
+    rows_failed: int = 0
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    run_started_at: Optional[datetime] = Field(default=None, description="start of the current (possibly resumed) run")
+    run_start_rows: int = Field(default=0, description="rows_processed when the current run started")
+    lease_owner: Optional[str] = Field(default=None, max_length=64, description="runner currently importing the job")
+    lease_expires_at: Optional[datetime] = Field(default=None, description="renewed with each committed batch")
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class SentimentCounter(SQLModel, table=True):
+    """Running sentiment counts per owner and per form, kept in step with review writes."""
+
+    __tablename__ = "sentiment_counters"
+
+    scope: str = Field(primary_key=True, max_length=16, description="owner|form")
+    scope_id: int = Field(primary_key=True)
+    positive: int = 0
+    neutral: int = 0
+    negative: int = 0
+    pending: int = Field(default=0, description="accepted, waiting for deferred analysis")
+    total: int = 0
+
+
+class SentimentRollup(SQLModel, table=True):
+    """Sentiment counts and score sums per owner/form and hourly/daily bucket."""
+
+    __tablename__ = "sentiment_rollups"
+
+    scope: str = Field(primary_key=True, max_length=16, description="owner|form")
+    scope_id: int = Field(primary_key=True)
+    granularity: str = Field(primary_key=True, max_length=8, description="hour|day")
+    bucket_start: datetime = Field(primary_key=True)
+    positive: int = 0
+    neutral: int = 0
+    negative: int = 0
+    total: int = 0
+    score_sum: float = 0.0
+
+
+class ReviewEntity(SQLModel, table=True):
+    """One row per entity mentioned in a review, denormalized for aggregation."""
+
+    __tablename__ = "review_entities"
+    __table_args__ = (
+        # Top entities per owner (and label), optionally within a time range
+        Index("ix_review_entities_owner_entity_sentiment", "owner_id", "entity", "sentiment", "created_at"),
+        Index("ix_review_entities_form_id_entity", "form_id", "entity"),
+    )
+
+    review_id: int = Field(primary_key=True, foreign_key="reviews.id")
+    entity: str = Field(primary_key=True, max_length=200)
+    owner_id: Optional[int] = None
+    form_id: Optional[int] = None
+    sentiment: str = Field(max_length=16, description="normalized positive|neutral|negative label")
+    created_at: datetime
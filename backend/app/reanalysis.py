@@ -0,0 +1,169 @@
+"""
+Re-scores existing reviews after a sentiment model change.
+
+Every analyzed review records the `model_version` that produced its label.
+`reanalyze_reviews` walks the reviews scored by any other version in id
+order, re-analyzes them in batches and moves them between counter labels,
+trend rollups and the entity index in the same transaction. Progress is
+written to a checkpoint file after each commit, so an interrupted run
+resumes after the last committed review.
+"""
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import or_
+from sqlmodel import Session, func, select
+
+from . import services
+from .counters import apply_review_counts, review_label
+from .entities import apply_review_entities, delete_review_entities
+from .models import Review
+from .rollups import apply_review_rollups
+
+
+def stale_criteria(model_version: str) -> list:
+    """Analyzed reviews whose label was produced by another (or an unknown) model."""
+    return [
+        # Pending reviews are left to the deferred analysis worker
+        or_(Review.analyzed_at.is_not(None), Review.sentiment.is_not(None)),
+        or_(Review.model_version.is_(None), Review.model_version != model_version),
+    ]
+
+
+def count_stale_reviews(session: Session, model_version: str, after_id: int = 0) -> int:
+    return session.exec(
+        select(func.count()).select_from(Review).where(Review.id > after_id, *stale_criteria(model_version))
+    ).one()
+
+
+def model_version_counts(session: Session) -> Dict[Optional[str], int]:
+    """Number of analyzed reviews per model version (None = recorded before versioning)."""
+    rows = session.exec(
+        select(Review.model_version, func.count())
+        .where(or_(Review.analyzed_at.is_not(None), Review.sentiment.is_not(None)))
+        .group_by(Review.model_version)
+    ).all()
+    return dict(rows)
+
+
+def new_checkpoint(model_version: str) -> dict:
+    now = datetime.utcnow().isoformat()
+    return {
+        "model_version": model_version,
+        "last_id": 0,
+        "reviewed": 0,
+        "changed": 0,
+        "transitions": {},
+        "started_at": now,
+        "updated_at": now,
+    }
+
+
+def load_checkpoint(path: Optional[str], model_version: str) -> dict:
+    """
+    Reads the checkpoint of an interrupted run. A missing file, or one
+    written for another target model, starts a new run.
+    """
+    if not path or not os.path.exists(path):
+        return new_checkpoint(model_version)
+    with open(path, encoding="utf-8") as handle:
+        checkpoint = json.load(handle)
+    if checkpoint.get("model_version") != model_version:
+        return new_checkpoint(model_version)
+    return checkpoint
+
+
+def save_checkpoint(path: Optional[str], checkpoint: dict) -> None:
+    if not path:
+        return
+    # Written to a temporary file first, so a crash never leaves half a checkpoint
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as handle:
+        json.dump(checkpoint, handle, indent=2, sort_keys=True)
+    os.replace(temporary, path)
+
+
+def reanalyze_batch(session: Session, after_id: int, batch_size: int) -> List[tuple]:
+    """
+    Re-analyzes the next `batch_size` stale reviews after `after_id` and
+    commits. Returns one (review_id, previous_label, new_label) per review.
+    """
+    reviews = session.exec(
+        select(Review)
+        .where(Review.id > after_id, *stale_criteria(services.MODEL_VERSION))
+        .order_by(Review.id)
+        .limit(batch_size)
+    ).all()
+    if not reviews:
+        session.rollback()
+        return []
+
+    # The models run before anything is written, so the write lock is only
+    # held for the counter, rollup and entity updates below
+    analyses = services.analyze_texts([review.content for review in reviews], batch_size=batch_size)
+
+    previous = [review_label(review) for review in reviews]
+    apply_review_counts(session, reviews, sign=-1)
+    apply_review_rollups(session, reviews, sign=-1)
+    delete_review_entities(session, [review.id for review in reviews])
+    services.apply_analyses(reviews, analyses)
+    session.add_all(reviews)
+    apply_review_counts(session, reviews)
+    apply_review_rollups(session, reviews)
+    apply_review_entities(session, reviews)
+    services.invalidate_dashboards(session, reviews)
+    changes = [(review.id, before, review_label(review)) for review, before in zip(reviews, previous)]
+    session.commit()
+    session.expunge_all()
+    return changes
+
+
+def reanalyze_reviews(
+    session: Session,
+    batch_size: int = 64,
+    checkpoint_path: Optional[str] = None,
+    max_reviews_per_second: float = 0,
+    on_batch: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Re-analyzes every stale review with the current model, resuming from
+    `checkpoint_path` when it holds an unfinished run for the same model.
+    `max_reviews_per_second` (0 = unlimited) throttles the run so it can go
+    on beside live traffic. `on_batch(checkpoint)` is called after each
+    commit. Returns the final checkpoint, with label transition counts
+    keyed "previous->new".
+    """
+    checkpoint = load_checkpoint(checkpoint_path, services.MODEL_VERSION)
+    started = time.monotonic()
+    reviewed_now = 0
+    while True:
+        changes = reanalyze_batch(session, checkpoint["last_id"], batch_size)
+        if not changes:
+            # Finished: the next run starts over and only finds reviews
+            # written since by processes still on the old model
+            if checkpoint_path and os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+            return checkpoint
+
+        transitions = Counter(checkpoint["transitions"])
+        transitions.update(f"{before}->{after}" for _, before, after in changes)
+        checkpoint.update(
+            last_id=changes[-1][0],
+            reviewed=checkpoint["reviewed"] + len(changes),
+            changed=checkpoint["changed"] + sum(before != after for _, before, after in changes),
+            transitions=dict(transitions),
+            updated_at=datetime.utcnow().isoformat(),
+        )
+        save_checkpoint(checkpoint_path, checkpoint)
+        if on_batch is not None:
+            on_batch(checkpoint)
+
+        reviewed_now += len(changes)
+        if max_reviews_per_second > 0:
+            ahead = reviewed_now / max_reviews_per_second - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
@@ -0,0 +1,130 @@
+"""
+In-process cache of serialized JSON responses for hot read paths (public
+form links, polled dashboards), with ETag / If-None-Match revalidation.
+
+Writes mark the keys they affect on the SQLAlchemy session; the keys are
+dropped only once that transaction commits, so a concurrent read cannot
+re-cache the pre-commit state. Other processes see changes after at most
+`response_cache_ttl_seconds`.
+"""
+import hashlib
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, NamedTuple
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .cache import LRUCache
+from .config import get_settings
+
+settings = get_settings()
+
+_PENDING_KEY = "response_cache_invalidations"
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """LRU + TTL cache of JSON bodies and their ETags, with per-kind stats."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._invalidations = 0
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "not_modified": 0})
+
+    def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        build: Callable[[], BaseModel],
+        cache_control: str = "no-cache",
+    ) -> Response:
+        """
+        Serves `key` from the cache (building and storing it on a miss) and
+        answers 304 when the client's If-None-Match matches. `key` is a
+        tuple whose first item names the kind of response, for the stats.
+        """
+        kind = key[0]
+        cached = self._cache.get(key)
+        self._count(kind, "hits" if cached is not None else "misses")
+        if cached is None:
+            invalidations = self._invalidations
+            body = build().model_dump_json().encode("utf-8")
+            cached = CachedResponse(body, '"' + hashlib.sha1(body).hexdigest() + '"')
+            # A write that committed while we were reading may not be in `body`
+            if invalidations == self._invalidations:
+                self._cache.set(key, cached)
+
+        headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+        if cached.etag in _etags(request.headers.get("if-none-match")):
+            self._count(kind, "not_modified")
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._invalidations += 1
+        self._cache.delete(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        with self._lock:
+            self._counts.clear()
+
+    def _count(self, kind: str, outcome: str) -> None:
+        with self._lock:
+            self._counts[kind][outcome] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            kinds = {
+                kind: {
+                    **counts,
+                    "hit_ratio": round(counts["hits"] / (counts["hits"] + counts["misses"]), 4)
+                    if counts["hits"] + counts["misses"] else 0.0,
+                }
+                for kind, counts in self._counts.items()
+            }
+        return {"size": len(self._cache), "maxsize": self._cache.maxsize, "ttl": self._cache.ttl, "kinds": kinds}
+
+
+def _etags(header: str) -> set:
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+response_cache = ResponseCache(maxsize=settings.response_cache_size, ttl=settings.response_cache_ttl_seconds)
+
+
+def dashboard_key(owner_id: int) -> tuple:
+    return ("dashboard", owner_id)
+
+
+def public_form_key(form_uuid: str) -> tuple:
+    return ("public_form", form_uuid)
+
+
+def invalidate_on_commit(session: Session, key: Hashable) -> None:
+    """Drops `key` from the response cache once the session's transaction commits."""
+    session.info.setdefault(_PENDING_KEY, set()).add(key)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for key in session.info.pop(_PENDING_KEY, ()):
+        response_cache.invalidate(key)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction) -> None:
+    # Fires on every rollback(), even before any SQL ran; savepoints keep the keys
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,217 @@
+"""
+Hourly and daily sentiment rollups per owner and per form, used for trend
+charts. Maintained incrementally alongside the sentiment counters, so
+trend queries read a handful of bucket rows instead of scanning reviews.
+Reviews waiting for deferred analysis are added once they are analyzed.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, or_, update
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, func, select
+
+from .counters import SENTIMENT_LABELS, is_pending, normalize_sentiment
+from .database import insert_ignore
+from .models import Review, SentimentRollup
+
+GRANULARITIES = ("hour", "day")
+BUCKET_WIDTH = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+ROLLUP_FIELDS = SENTIMENT_LABELS + ("total", "score_sum")
+
+RollupKey = Tuple[str, int, str, datetime]
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def _empty_rollup() -> Dict[str, float]:
+    return {"positive": 0, "neutral": 0, "negative": 0, "total": 0, "score_sum": 0.0}
+
+
+def _review_keys(review: Review) -> List[RollupKey]:
+    created_at = review.created_at or datetime.utcnow()
+    keys = []
+    for scope, scope_id in (("owner", review.owner_id), ("form", review.form_id)):
+        if scope_id is None:
+            continue
+        for granularity in GRANULARITIES:
+            keys.append((scope, scope_id, granularity, bucket_start(created_at, granularity)))
+    return keys
+
+
+def apply_review_rollups(session: Session, reviews: Iterable[Review], sign: int = 1) -> None:
+    """
+    Adds (sign=1) or removes (sign=-1) reviews from their hourly and daily
+    buckets, in the caller's transaction.
+    """
+    deltas: Dict[RollupKey, Dict[str, float]] = defaultdict(_empty_rollup)
+    for review in reviews:
+        if is_pending(review):
+            continue
+        label = normalize_sentiment(review.sentiment)
+        for key in _review_keys(review):
+            delta = deltas[key]
+            delta["total"] += sign
+            delta["score_sum"] += sign * (review.sentiment_score or 0.0)
+            if label in SENTIMENT_LABELS:
+                delta[label] += sign
+    if not deltas:
+        return
+
+    table = SentimentRollup.__table__
+    session.execute(
+        insert_ignore(session.get_bind(), table),
+        [
+            {"scope": scope, "scope_id": scope_id, "granularity": granularity, "bucket_start": start, **_empty_rollup()}
+            for scope, scope_id, granularity, start in deltas
+        ],
+    )
+    for (scope, scope_id, granularity, start), delta in deltas.items():
+        session.execute(
+            update(table)
+            .where(
+                table.c.scope == scope,
+                table.c.scope_id == scope_id,
+                table.c.granularity == granularity,
+                table.c.bucket_start == start,
+            )
+            .values({field: table.c[field] + delta[field] for field in ROLLUP_FIELDS if delta[field]})
+        )
+
+
+def delete_rollups(session: Session, scope: str, scope_id: int) -> None:
+    session.execute(
+        delete(SentimentRollup).where(SentimentRollup.scope == scope, SentimentRollup.scope_id == scope_id)
+    )
+
+
+def read_trends(
+    session: Session,
+    scope: str,
+    scope_id: int,
+    granularity: str,
+    start: datetime,
+    end: datetime,
+) -> List[dict]:
+    """
+    Buckets in [start, end) in chronological order. Buckets without reviews
+    are included with zero counts so charts get an evenly spaced series.
+    """
+    first = bucket_start(start, granularity)
+    statement = (
+        select(SentimentRollup)
+        .where(
+            SentimentRollup.scope == scope,
+            SentimentRollup.scope_id == scope_id,
+            SentimentRollup.granularity == granularity,
+            SentimentRollup.bucket_start >= first,
+            SentimentRollup.bucket_start < end,
+        )
+        .order_by(SentimentRollup.bucket_start)
+    )
+    stored = {rollup.bucket_start: rollup for rollup in session.exec(statement)}
+
+    buckets = []
+    moment = first
+    while moment < end:
+        rollup = stored.get(moment)
+        counts = {field: getattr(rollup, field) for field in ROLLUP_FIELDS} if rollup else _empty_rollup()
+        total = counts["total"]
+        buckets.append({
+            "bucket_start": moment,
+            "total": total,
+            "positive": counts["positive"],
+            "neutral": counts["neutral"],
+            "negative": counts["negative"],
+            "average_score": round(counts["score_sum"] / total, 4) if total else None,
+        })
+        moment += BUCKET_WIDTH[granularity]
+    return buckets
+
+
+def _bucket_expression(bind: Engine, granularity: str):
+    if bind.dialect.name == "postgresql":
+        return func.date_trunc(granularity, Review.created_at)
+    pattern = "%Y-%m-%d %H:00:00" if granularity == "hour" else "%Y-%m-%d 00:00:00"
+    if bind.dialect.name == "sqlite":
+        return func.strftime(pattern, Review.created_at)
+    return func.date_format(Review.created_at, pattern)
+
+
+def compute_rollups(session: Session) -> Dict[RollupKey, Dict[str, float]]:
+    """Recomputes every rollup bucket from the raw reviews table."""
+    label = func.lower(func.coalesce(func.nullif(Review.sentiment, ""), "neutral"))
+    rollups: Dict[RollupKey, Dict[str, float]] = defaultdict(_empty_rollup)
+    for granularity in GRANULARITIES:
+        bucket = _bucket_expression(session.get_bind(), granularity)
+        for scope, column in (("owner", Review.owner_id), ("form", Review.form_id)):
+            statement = (
+                select(column, bucket, label, func.count(), func.coalesce(func.sum(Review.sentiment_score), 0.0))
+                .where(column.is_not(None), or_(Review.analyzed_at.is_not(None), Review.sentiment.is_not(None)))
+                .group_by(column, bucket, label)
+            )
+            for scope_id, start, sentiment, count, score_sum in session.exec(statement):
+                if isinstance(start, str):
+                    start = datetime.fromisoformat(start)
+                rollup = rollups[(scope, scope_id, granularity, start)]
+                rollup["total"] += count
+                rollup["score_sum"] += score_sum
+                if sentiment in SENTIMENT_LABELS:
+                    rollup[sentiment] += count
+    return dict(rollups)
+
+
+def _same(want: Dict[str, float], have: Dict[str, float]) -> bool:
+    # Score sums are floats accumulated in a different order
+    return all(
+        abs(want[field] - have[field]) < 1e-6 if field == "score_sum" else want[field] == have[field]
+        for field in ROLLUP_FIELDS
+    )
+
+
+def check_rollups(session: Session) -> List[dict]:
+    """Lists rollup buckets whose stored values differ from the reviews table."""
+    expected = compute_rollups(session)
+    stored = {
+        (rollup.scope, rollup.scope_id, rollup.granularity, rollup.bucket_start): {
+            field: getattr(rollup, field) for field in ROLLUP_FIELDS
+        }
+        for rollup in session.exec(select(SentimentRollup))
+    }
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key, _empty_rollup())
+        have = stored.get(key, _empty_rollup())
+        if not _same(want, have):
+            scope, scope_id, granularity, start = key
+            mismatches.append({
+                "scope": scope,
+                "scope_id": scope_id,
+                "granularity": granularity,
+                "bucket_start": start,
+                "expected": want,
+                "stored": have,
+            })
+    return mismatches
+
+
+def rebuild_rollups(session: Session) -> int:
+    """Replaces every rollup bucket with values recomputed from the reviews table."""
+    rollups = compute_rollups(session)
+    session.execute(delete(SentimentRollup))
+    if rollups:
+        session.execute(
+            SentimentRollup.__table__.insert(),
+            [
+                {"scope": scope, "scope_id": scope_id, "granularity": granularity, "bucket_start": start, **values}
+                for (scope, scope_id, granularity, start), values in rollups.items()
+            ],
+        )
+    session.commit()
+    return len(rollups)
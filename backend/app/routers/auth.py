@@ -1,48 +1,72 @@
-from typing import Annotated
+import logging
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session, select
 
 from ..dependencies import get_db, get_current_user
 from ..models import User
 from ..schemas import Token, UserCreate, UserRead
-from ..security import create_access_token, get_password_hash, verify_password
+from ..security import create_access_token, password_hash_slot
 
 router = APIRouter(prefix="/auth", tags=["auth"])
+logger = logging.getLogger(__name__)
+
+# These endpoints are async so that bcrypt can run on its dedicated executor
+# (see security.py); database calls are pushed to the threadpool. When the
+# hasher is saturated they answer 503 before touching the database, so a
+# login storm costs other requests as little as possible.
+
+
+def get_user_by_email(session: Session, email: str) -> Optional[User]:
+    """
+    Looks a user up, then hands the connection back to the pool: callers are
+    about to wait on bcrypt and must not hold a connection meanwhile.
+    """
+    statement = select(User).where(User.email == email)
+    user = session.exec(statement).first()
+    session.close()
+    return user
+
+
+def save_user(session: Session, user: User) -> User:
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
 
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register_user(
+async def register_user(
     user_in: UserCreate, session: Annotated[Session, Depends(get_db)]
 ) -> User:
-    statement = select(User).where(User.email == user_in.email)
-    existing = session.exec(statement).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    user = User(
-        email=user_in.email,
-        full_name=user_in.full_name,
-        hashed_password=get_password_hash(user_in.password),
-    )
+    with password_hash_slot() as hash_slot:
+        existing = await run_in_threadpool(get_user_by_email, session, user_in.email)
+        if existing:
+            raise HTTPException(status_code=400, detail="Email already registered")
+        user = User(
+            email=user_in.email,
+            full_name=user_in.full_name,
+            hashed_password=await hash_slot.hash(user_in.password),
+        )
     try:
-        session.add(user)
-        session.commit()
-        session.refresh(user)
-        return user
+        return await run_in_threadpool(save_user, session, user)
     except Exception as e:
-        print(f"Error creating user: {e}")
+        logger.exception("Error creating user %s", user_in.email)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     session: Annotated[Session, Depends(get_db)],
 ) -> Token:
-    statement = select(User).where(User.email == form_data.username)
-    user = session.exec(statement).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    with password_hash_slot() as hash_slot:
+        user = await run_in_threadpool(get_user_by_email, session, form_data.username)
+        verified = user is not None and await hash_slot.verify(form_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -54,5 +78,3 @@ def login(
 @router.get("/me", response_model=UserRead)
 def read_me(current_user: Annotated[User, Depends(get_current_user)]) -> User:
     return current_user
-
-
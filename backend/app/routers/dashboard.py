@@ -1,28 +1,108 @@
-from typing import Annotated
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, List, Literal, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session
 
+from ..config import get_settings
 from ..dependencies import get_current_user, get_db
-from ..models import User
-from ..schemas import DashboardSummary
+from ..entities import top_entities
+from ..models import FeedbackForm, User
+from ..response_cache import dashboard_key, response_cache
+from ..rollups import BUCKET_WIDTH, bucket_start, read_trends
+from ..schemas import DashboardSummary, EntityMentions, SentimentTrends
 from ..services import get_dashboard_summary
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+settings = get_settings()
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # Review timestamps are stored as naive UTC
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
 
 
 @router.get("/", response_model=DashboardSummary)
 def get_dashboard(
+    request: Request,
     session: Annotated[Session, Depends(get_db)],
     user: Annotated[User, Depends(get_current_user)],
-) -> DashboardSummary:
-    sentiment_counts, latest_reviews = get_dashboard_summary(session, user.id)
-    return DashboardSummary(
-        total_reviews=sentiment_counts["total"],
-        positive=sentiment_counts["positive"],
-        neutral=sentiment_counts["neutral"],
-        negative=sentiment_counts["negative"],
-        latest_reviews=latest_reviews,
-    )
+) -> Response:
+    # Polled by open tabs: served from the response cache, 304 when unchanged
+    def build() -> DashboardSummary:
+        sentiment_counts, latest_reviews = get_dashboard_summary(session, user.id)
+        return DashboardSummary(
+            total_reviews=sentiment_counts["total"],
+            positive=sentiment_counts["positive"],
+            neutral=sentiment_counts["neutral"],
+            negative=sentiment_counts["negative"],
+            pending=sentiment_counts["pending"],
+            latest_reviews=latest_reviews,
+        )
+
+    return response_cache.respond(request, dashboard_key(user.id), build, cache_control="private, no-cache")
 
 
+@router.get("/trends", response_model=SentimentTrends)
+def get_trends(
+    session: Annotated[Session, Depends(get_db)],
+    user: Annotated[User, Depends(get_current_user)],
+    granularity: Literal["hour", "day"] = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    form_id: Optional[int] = None,
+) -> SentimentTrends:
+    """
+    Sentiment per hour or day over [start, end), for all of the user's
+    reviews or for one form. Defaults to the last `trends_default_days` days
+    including the current bucket. Reads only the rollup table.
+    """
+    width = BUCKET_WIDTH[granularity]
+    end = _as_utc(end) if end else bucket_start(datetime.utcnow(), granularity) + width
+    start = _as_utc(start) if start else end - timedelta(days=settings.trends_default_days)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if (end - bucket_start(start, granularity)) / width > settings.trends_max_buckets:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large: at most {settings.trends_max_buckets} {granularity} buckets",
+        )
+
+    scope, scope_id = "owner", user.id
+    if form_id is not None:
+        form = session.get(FeedbackForm, form_id)
+        if not form:
+            raise HTTPException(status_code=404, detail="Form not found")
+        if form.owner_id != user.id:
+            raise HTTPException(status_code=403, detail="Not authorized")
+        scope, scope_id = "form", form_id
+
+    buckets = read_trends(session, scope, scope_id, granularity, start, end)
+    return SentimentTrends(granularity=granularity, start=start, end=end, form_id=form_id, buckets=buckets)
+
+
+@router.get("/entities", response_model=List[EntityMentions])
+def get_top_entities(
+    session: Annotated[Session, Depends(get_db)],
+    user: Annotated[User, Depends(get_current_user)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+    sentiment: Optional[Literal["positive", "neutral", "negative"]] = None,
+    form_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> List[dict]:
+    """
+    Most mentioned entities with their sentiment breakdown, ranked by total
+    mentions or, with `sentiment`, by mentions in reviews with that label.
+    """
+    return top_entities(
+        session,
+        user.id,
+        limit=limit,
+        sentiment=sentiment,
+        form_id=form_id,
+        created_after=_as_utc(created_after) if created_after else None,
+        created_before=_as_utc(created_before) if created_before else None,
+    )
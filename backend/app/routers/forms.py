@@ -1,15 +1,22 @@
 from typing import Annotated, List
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel import Session, select
 
+from ..analysis_worker import analysis_worker
+from ..config import get_settings
 from ..dependencies import get_current_user, get_db
 from ..models import FeedbackForm, Review, User
 from ..schemas import FeedbackFormCreate, FeedbackFormRead, ReviewCreate, ReviewRead, DashboardSummary
-from ..services import analyze_review, get_form_stats
+from ..counters import delete_counters
+from ..entities import detach_form_entities
+from ..response_cache import invalidate_on_commit, public_form_key, response_cache
+from ..rollups import delete_rollups
+from ..services import add_reviews, analyze_review, get_form_stats
 
 router = APIRouter(tags=["forms"])
+settings = get_settings()
 
 # === User Endpoints (Auth Required) ===
 
@@ -53,7 +60,13 @@ def delete_form(
     if form.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this form")
 
+    # The form's reviews stay with the owner (form_id is cleared), so only
+    # the form counters and rollups go away
     session.delete(form)
+    delete_counters(session, "form", form_id)
+    delete_rollups(session, "form", form_id)
+    detach_form_entities(session, form_id)
+    invalidate_on_commit(session, public_form_key(form.uuid))
     session.commit()
 
 
@@ -77,6 +90,7 @@ def get_form_statistics(
         positive=counts["positive"],
         neutral=counts["neutral"],
         negative=counts["negative"],
+        pending=counts["pending"],
         latest_reviews=latest
     )
 
@@ -86,13 +100,18 @@ def get_form_statistics(
 @router.get("/public/{form_uuid}", response_model=FeedbackFormRead)
 def get_public_form(
     form_uuid: str,
+    request: Request,
     session: Annotated[Session, Depends(get_db)],
-) -> FeedbackForm:
-    statement = select(FeedbackForm).where(FeedbackForm.uuid == form_uuid)
-    form = session.exec(statement).first()
-    if not form:
-        raise HTTPException(status_code=404, detail="Form not found")
-    return form
+) -> Response:
+    # Opened anonymously by every respondent: served from the response cache
+    def build() -> FeedbackFormRead:
+        statement = select(FeedbackForm).where(FeedbackForm.uuid == form_uuid)
+        form = session.exec(statement).first()
+        if not form:
+            raise HTTPException(status_code=404, detail="Form not found")
+        return FeedbackFormRead.model_validate(form, from_attributes=True)
+
+    return response_cache.respond(request, public_form_key(form_uuid), build)
 
 
 @router.post("/public/{form_uuid}", response_model=ReviewRead, status_code=status.HTTP_201_CREATED)
@@ -113,8 +132,14 @@ def submit_public_review(
         owner_id=form.owner_id, # Link query to form owner
         form_id=form.id
     )
-    analyze_review(review)
-    session.add(review)
-    session.commit()
+    if settings.public_reviews_deferred_analysis:
+        # Stored as pending; the analysis worker fills in sentiment and entities
+        add_reviews(session, [review])
+        session.commit()
+        analysis_worker.notify()
+    else:
+        analyze_review(review)
+        add_reviews(session, [review])
+        session.commit()
     session.refresh(review)
     return review
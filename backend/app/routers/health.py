@@ -0,0 +1,40 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+from sqlmodel import Session
+
+from ..analysis_worker import analysis_queue_status, analysis_worker
+from ..dependencies import get_db, user_cache
+from ..response_cache import response_cache
+from ..services import analysis_cache, inference_pool, model_registry, ner_models, review_batcher
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/ready")
+def get_readiness() -> JSONResponse:
+    if inference_pool is not None:
+        # Models live in the worker processes, not in this one
+        ready = inference_pool.ready
+        content = {"ready": ready, "inference_pool": inference_pool.status()}
+    else:
+        ready = model_registry.ready
+        content = {"ready": ready, "models": model_registry.status()}
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=content,
+    )
+
+
+@router.get("/stats")
+def get_stats(session: Annotated[Session, Depends(get_db)]) -> dict:
+    return {
+        "analysis_queue": {**analysis_queue_status(session), "worker": analysis_worker.stats()},
+        "analysis_cache": analysis_cache.stats(),
+        "review_batcher": review_batcher.stats(),
+        "user_cache": user_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "ner_models": ner_models.stats(),
+        "inference_pool": inference_pool.status() if inference_pool is not None else None,
+    }
@@ -1,13 +1,25 @@
-from typing import Annotated, List
+from datetime import datetime
+from typing import Annotated, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session
 
+from ..config import get_settings
 from ..dependencies import get_current_user, get_db
-from ..models import Review, User
-from ..schemas import ReviewCreate, ReviewRead
-from ..services import analyze_review, bulk_import_reviews
+from ..import_jobs import create_import_job, import_job_runner, job_progress, retry_import_job
+from ..models import ImportJob, Review, User
+from ..schemas import ImportJobRead, ReviewCreate, ReviewRead
+from ..services import (
+    InvalidCursor,
+    add_reviews,
+    analyze_review,
+    bulk_import_reviews,
+    list_reviews_page,
+    search_reviews_page,
+)
 
+settings = get_settings()
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
 
@@ -24,7 +36,7 @@ def create_review(
         owner_id=user.id,
     )
     analyze_review(review)
-    session.add(review)
+    add_reviews(session, [review])
     session.commit()
     session.refresh(review)
     return review
@@ -32,27 +44,118 @@ def create_review(
 
 @router.post("/import", status_code=status.HTTP_201_CREATED)
 async def import_reviews(
+    response: Response,
     session: Annotated[Session, Depends(get_db)],
     user: Annotated[User, Depends(get_current_user)],
     file: UploadFile = File(...),
+    background: bool = False,
 ) -> dict:
     if not file.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="Only CSV files are supported")
-    content = (await file.read()).decode("utf-8")
+    if background:
+        job = await run_in_threadpool(create_import_job, session, file.file, file.filename, user.id)
+        import_job_runner.submit(job.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {"job_id": job.id, "status": job.status}
     try:
-        imported = bulk_import_reviews(session, content, user.id)
+        # The upload is already spooled to disk; stream it instead of loading it whole
+        imported = await run_in_threadpool(bulk_import_reviews, session, file.file, user.id)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     return {"imported": imported}
 
 
+@router.get("/import/{job_id}", response_model=ImportJobRead)
+def get_import_job(
+    job_id: str,
+    session: Annotated[Session, Depends(get_db)],
+    user: Annotated[User, Depends(get_current_user)],
+) -> ImportJobRead:
+    job = session.get(ImportJob, job_id)
+    if not job or job.owner_id != user.id:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return ImportJobRead(**job.model_dump(), **job_progress(job))
+
+
+@router.post("/import/{job_id}/retry", status_code=status.HTTP_202_ACCEPTED)
+def retry_import(
+    job_id: str,
+    session: Annotated[Session, Depends(get_db)],
+    user: Annotated[User, Depends(get_current_user)],
+) -> dict:
+    job = session.get(ImportJob, job_id)
+    if not job or job.owner_id != user.id:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    if not retry_import_job(session, job_id):
+        raise HTTPException(status_code=400, detail="Only failed import jobs can be retried")
+    import_job_runner.submit(job_id)
+    return {"job_id": job_id, "status": "pending"}
+
+
 @router.get("/", response_model=List[ReviewRead])
 def list_reviews(
+    response: Response,
     session: Annotated[Session, Depends(get_db)],
     user: Annotated[User, Depends(get_current_user)],
+    limit: Annotated[int, Query(ge=1, le=settings.reviews_page_size_max)] = settings.reviews_page_size,
+    cursor: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    source: Optional[str] = None,
+    form_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Literal["full", "summary"] = "full",
 ) -> List[Review]:
-    statement = select(Review).where(Review.owner_id == user.id).order_by(
-        Review.created_at.desc()
-    )
-    return session.exec(statement).all()
+    try:
+        reviews, next_cursor = list_reviews_page(
+            session,
+            user.id,
+            limit,
+            cursor=cursor,
+            sentiment=sentiment,
+            source=source,
+            form_id=form_id,
+            created_after=created_after,
+            created_before=created_before,
+            summary=fields == "summary",
+        )
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    # The body stays a plain list; the next page is advertised in a header
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reviews
 
+
+@router.get("/search", response_model=List[ReviewRead])
+def search_reviews(
+    response: Response,
+    session: Annotated[Session, Depends(get_db)],
+    user: Annotated[User, Depends(get_current_user)],
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Annotated[int, Query(ge=1, le=settings.reviews_page_size_max)] = settings.reviews_page_size,
+    cursor: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    source: Optional[str] = None,
+    form_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> List[Review]:
+    try:
+        reviews, next_cursor = search_reviews_page(
+            session,
+            user.id,
+            q,
+            limit,
+            cursor=cursor,
+            sentiment=sentiment,
+            source=source,
+            form_id=form_id,
+            created_after=created_after,
+            created_before=created_before,
+        )
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reviews
@@ -1,12 +1,18 @@
 from typing import Annotated, List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session, select
 
-from ..dependencies import get_db, require_admin
+from ..counters import delete_counters
+from ..entities import delete_owner_entities
+from ..response_cache import dashboard_key, invalidate_on_commit
+from ..rollups import delete_rollups
+from ..dependencies import get_db, invalidate_user, require_admin
 from ..models import User
 from ..schemas import UserCreateAdmin, UserRead
-from ..security import get_password_hash
+from ..security import password_hash_slot
+from .auth import get_user_by_email, save_user
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -21,27 +27,24 @@ def read_users(
 
 
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user_in: UserCreateAdmin,
     session: Annotated[Session, Depends(get_db)],
     admin_user: Annotated[User, Depends(require_admin)],
 ) -> User:
-    statement = select(User).where(User.email == user_in.email)
-    existing = session.exec(statement).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    user = User(
-        email=user_in.email,
-        full_name=user_in.full_name,
-        hashed_password=get_password_hash(user_in.password),
-        role=user_in.role,
-    )
+    with password_hash_slot() as hash_slot:
+        existing = await run_in_threadpool(get_user_by_email, session, user_in.email)
+        if existing:
+            raise HTTPException(status_code=400, detail="Email already registered")
+
+        user = User(
+            email=user_in.email,
+            full_name=user_in.full_name,
+            hashed_password=await hash_slot.hash(user_in.password),
+            role=user_in.role,
+        )
     try:
-        session.add(user)
-        session.commit()
-        session.refresh(user)
-        return user
+        return await run_in_threadpool(save_user, session, user)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -60,5 +63,11 @@ def delete_user(
     if user.id == admin_user.id:
         raise HTTPException(status_code=400, detail="Cannot delete your own account")
 
+    email = user.email
     session.delete(user)
+    delete_counters(session, "owner", user_id)
+    delete_rollups(session, "owner", user_id)
+    delete_owner_entities(session, user_id)
+    invalidate_on_commit(session, dashboard_key(user_id))
     session.commit()
+    invalidate_user(email)
@@ -56,11 +56,28 @@ class ReviewRead(ReviewBase):
     key_entities: Optional[str] = None
     created_at: datetime
     analyzed_at: Optional[datetime] = None
+    model_version: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
+class ImportJobRead(BaseModel):
+    id: str
+    status: str
+    filename: str
+    rows_total: Optional[int] = None
+    rows_processed: int
+    rows_imported: int
+    rows_failed: int
+    throughput_rows_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 class FeedbackFormBase(BaseModel):
     name: str
     question: Optional[str] = "Votre avis ?"
@@ -80,6 +97,30 @@ class DashboardSummary(BaseModel):
     positive: int
     neutral: int
     negative: int
+    pending: int = 0  # accepted, waiting for deferred analysis
     latest_reviews: List[ReviewRead]
 
 
+class TrendBucket(BaseModel):
+    bucket_start: datetime
+    total: int
+    positive: int
+    neutral: int
+    negative: int
+    average_score: Optional[float] = None
+
+
+class SentimentTrends(BaseModel):
+    granularity: str
+    start: datetime
+    end: datetime
+    form_id: Optional[int] = None
+    buckets: List[TrendBucket]
+
+
+class EntityMentions(BaseModel):
+    entity: str
+    total: int
+    positive: int
+    neutral: int
+    negative: int
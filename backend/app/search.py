@@ -0,0 +1,83 @@
+"""
+Full-text search over review content.
+
+SQLite uses an external-content FTS5 table (`reviews_fts`) kept in sync by
+triggers on `reviews`; PostgreSQL uses a generated `content_tsv` tsvector
+column with a GIN index. Both are maintained by the database itself, so ORM
+inserts, bulk imports and COPY are all indexed without extra code. Other
+dialects fall back to LIKE matching.
+"""
+import re
+from typing import List
+
+from sqlalchemy import Float, cast, column, literal_column, table, text
+from sqlalchemy.engine import Connection
+from sqlmodel import func
+
+from .config import get_settings
+from .models import Review
+
+settings = get_settings()
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+SQLITE_SEARCH_SCHEMA = [
+    # remove_diacritics so "cafe" finds "café"
+    "CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5("
+    "content, content='reviews', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS reviews_fts_insert AFTER INSERT ON reviews BEGIN "
+    "INSERT INTO reviews_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS reviews_fts_delete AFTER DELETE ON reviews BEGIN "
+    "INSERT INTO reviews_fts(reviews_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS reviews_fts_update AFTER UPDATE OF content ON reviews BEGIN "
+    "INSERT INTO reviews_fts(reviews_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+    "INSERT INTO reviews_fts(rowid, content) VALUES (new.id, new.content); END",
+    # Index the rows that existed before the table was created
+    "INSERT INTO reviews_fts(reviews_fts) VALUES ('rebuild')",
+]
+
+
+def _postgres_search_schema(config: str) -> List[str]:
+    return [
+        "ALTER TABLE reviews ADD COLUMN IF NOT EXISTS content_tsv tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{config}'::regconfig, coalesce(content, ''))) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_reviews_content_tsv ON reviews USING gin (content_tsv)",
+    ]
+
+
+def create_search_index(connection: Connection) -> None:
+    """Creates the dialect's full-text index over reviews.content (idempotent)."""
+    if connection.dialect.name == "sqlite":
+        statements = SQLITE_SEARCH_SCHEMA
+    elif connection.dialect.name == "postgresql":
+        statements = _postgres_search_schema(settings.search_text_config)
+    else:
+        return
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def search_terms(query: str) -> List[str]:
+    return _TERM_PATTERN.findall(query)
+
+
+def match_reviews(dialect: str, terms: List[str]):
+    """
+    Expressions for reviews containing every term: (score, criteria, fts)
+    where a higher score is a better match and `fts`, when not None, is the
+    table to join on `fts.c.rowid == Review.id`.
+    """
+    if dialect == "sqlite":
+        fts = table("reviews_fts", column("rowid"), column("reviews_fts"))
+        # Quoting every term keeps FTS5 query syntax (AND, NEAR, *, ...) out of user input
+        match_query = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        # bm25() is lower for better matches
+        score = -func.bm25(literal_column("reviews_fts"))
+        return score, [fts.c.reviews_fts.op("MATCH")(match_query)], fts
+    if dialect == "postgresql":
+        document = literal_column("reviews.content_tsv")
+        tsquery = func.plainto_tsquery(literal_column(f"'{settings.search_text_config}'::regconfig"), " ".join(terms))
+        # ts_rank_cd is a float4; compare the cursor as float8 so it round-trips exactly
+        score = cast(func.ts_rank_cd(document, tsquery), Float)
+        return score, [document.op("@@")(tsquery)], None
+    return literal_column("0.0"), [Review.content.ilike(f"%{term}%") for term in terms], None
@@ -1,5 +1,10 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -18,6 +23,62 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when every password-hashing slot is taken."""
+
+
+# bcrypt runs on its own bounded executor so a burst of logins cannot starve
+# the threadpool that serves every other request. Work beyond the workers
+# plus the queue is rejected instead of piling up. The workers are capped
+# below the core count so one core is always left for other requests.
+_hash_workers = max(1, min(settings.password_hash_workers, (os.cpu_count() or 1) - 1))
+_hash_executor = ThreadPoolExecutor(max_workers=_hash_workers, thread_name_prefix="password-hash")
+_hash_slots = threading.BoundedSemaphore(_hash_workers + settings.password_hash_queue_size)
+
+
+class PasswordHashSlot:
+    """A reserved hashing slot, which runs one job on the hash executor."""
+
+    def __init__(self) -> None:
+        self.future: Optional[Future] = None
+
+    def _submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        if self.future is not None:
+            raise RuntimeError("A password hash slot runs a single job")
+        self.future = _hash_executor.submit(func, *args)
+        return self.future
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(verify_password, plain_password, hashed_password))
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(get_password_hash, password))
+
+
+@contextmanager
+def password_hash_slot() -> Iterator[PasswordHashSlot]:
+    """
+    Reserves one of the hashing slots for a request, raising
+    PasswordHasherBusy when none is free. Endpoints take the slot before any
+    other work, so requests that will be shed cost no database round trip.
+
+    The slot is given back when its job finishes, not when the request
+    does: a cancelled request (e.g. the client disconnected) leaves bcrypt
+    running, and that work must still count against the limit.
+    """
+    slots = _hash_slots
+    if not slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    slot = PasswordHashSlot()
+    try:
+        yield slot
+    finally:
+        if slot.future is None:
+            slots.release()
+        else:
+            slot.future.add_done_callback(lambda _: slots.release())
+
+
 def create_access_token(subject: str, expires_minutes: Optional[int] = None) -> str:
     expire_minutes = expires_minutes or settings.jwt_access_token_expires_minutes
     expire = datetime.utcnow() + timedelta(minutes=expire_minutes)
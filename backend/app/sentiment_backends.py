@@ -0,0 +1,101 @@
+"""
+Inference backends for the sentiment model. Every backend returns a
+transformers text-classification pipeline, so callers do not care which one
+is configured through `Settings.sentiment_backend`:
+
+- "torch": the stock PyTorch model.
+- "torch-int8": PyTorch with dynamic int8 quantization of the Linear layers.
+- "onnx": the model exported to ONNX and run with ONNX Runtime.
+- "onnx-int8": the ONNX export with dynamic int8 quantization.
+
+The ONNX backends need the optional `optimum[onnxruntime]` package. Exports
+are cached under `onnx_model_dir` so only the first start pays for them.
+"""
+import os
+import shutil
+import tempfile
+from typing import Callable
+
+from .config import get_settings
+
+settings = get_settings()
+
+SENTIMENT_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+
+def _onnx_export_dir(model_name: str, quantized: bool) -> str:
+    name = model_name.replace("/", "__") + ("-int8" if quantized else "")
+    return os.path.join(settings.onnx_model_dir, name)
+
+
+def _export_once(target_dir: str, export: Callable[[str], None]) -> None:
+    """
+    Runs `export(staging_dir)` unless `target_dir` exists, then renames the
+    staging directory into place, so `target_dir` only ever exists complete.
+    An interrupted export leaves nothing behind to be mistaken for a cached
+    one; when several workers export at once, the first rename wins.
+    """
+    if os.path.isdir(target_dir):
+        return
+    parent = os.path.dirname(target_dir)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=os.path.basename(target_dir) + ".partial-", dir=parent)
+    try:
+        export(staging)
+        os.replace(staging, target_dir)
+    except OSError:
+        # Another worker finished the same export first
+        if not os.path.isdir(target_dir):
+            raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _load_onnx_model(model_name: str, quantized: bool):
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    except ImportError as exc:
+        raise RuntimeError(
+            "The onnx sentiment backends need `pip install optimum[onnxruntime]`"
+        ) from exc
+
+    def export(staging_dir: str) -> None:
+        model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+        model.save_pretrained(staging_dir)
+
+    def quantize(staging_dir: str) -> None:
+        quantizer = ORTQuantizer.from_pretrained(export_dir)
+        quantizer.quantize(
+            save_dir=staging_dir,
+            quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False),
+        )
+
+    export_dir = _onnx_export_dir(model_name, quantized=False)
+    _export_once(export_dir, export)
+    if not quantized:
+        return ORTModelForSequenceClassification.from_pretrained(export_dir)
+
+    quantized_dir = _onnx_export_dir(model_name, quantized=True)
+    _export_once(quantized_dir, quantize)
+    return ORTModelForSequenceClassification.from_pretrained(quantized_dir, file_name="model_quantized.onnx")
+
+
+def load_sentiment_pipeline(model_name: str, backend: str):
+    if backend not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Unknown sentiment backend {backend!r}, expected one of {SENTIMENT_BACKENDS}")
+    from transformers import AutoTokenizer, pipeline
+
+    if backend == "torch":
+        return pipeline("sentiment-analysis", model=model_name)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if backend == "torch-int8":
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    else:
+        model = _load_onnx_model(model_name, quantized=backend == "onnx-int8")
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
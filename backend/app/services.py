@@ -1,44 +1,132 @@
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from datetime import datetime
-from io import StringIO
-from typing import List, Tuple
+from io import StringIO, TextIOWrapper
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 
-import pandas as pd
-import spacy
-from sqlmodel import Session, select
-from transformers import pipeline
+from sqlalchemy import and_, or_
+from sqlmodel import Session, func, select
 
+from .batching import MicroBatcher
+from .bulk_insert import insert_reviews
+from .cache import AnalysisCache
+from .config import get_settings
+from .counters import apply_review_counts, read_counts
+from .database import engine
+from .entities import apply_review_entities
+from .inference_pool import InferencePool
+from .language import detect_language
+from .model_registry import ModelPool, ModelRegistry
 from .models import Review
+from .response_cache import dashboard_key, invalidate_on_commit
+from .rollups import apply_review_rollups
+from .search import match_reviews, search_terms
+from .sentiment_backends import load_sentiment_pipeline
 
-# Load ML Models (Global caching)
-# Sentiment analysis using multilingual BERT
-# Supports English, French, Spanish, German, Chinese, etc.
-print("Loading Sentiment Model...")
-sentiment_pipeline = pipeline("sentiment-analysis", model="nlptown/bert-base-multilingual-uncased-sentiment")
+settings = get_settings()
 
-# Entity extraction using Spacy
-print("Loading Spacy Model...")
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Spacy model not found. Downloading...")
-    from spacy.cli import download
-    download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
 
+# ML models are loaded on first use (or by warm_up_models at startup), so
+# importing this module stays cheap for scripts and tests.
+def _load_sentiment_pipeline():
+    # Sentiment analysis using multilingual BERT
+    # Supports English, French, Spanish, German, Chinese, etc.
+    print(f"Loading Sentiment Model ({settings.sentiment_backend} backend)...")
+    return load_sentiment_pipeline(settings.sentiment_model_name, settings.sentiment_backend)
 
-def classify_sentiment(text: str) -> Tuple[str, float]:
+
+def _load_spacy_model(language: str):
+    # Entity extraction using Spacy
+    import spacy
+
+    name = settings.spacy_models[language]
+    print(f"Loading Spacy Model {name}...")
+    exclude = settings.spacy_excluded_components
+    try:
+        nlp = spacy.load(name, exclude=exclude)
+    except OSError:
+        print("Spacy model not found. Downloading...")
+        from spacy.cli import download
+        download(name)
+        nlp = spacy.load(name, exclude=exclude)
+    return _drop_unused_tok2vec(nlp)
+
+
+def _drop_unused_tok2vec(nlp):
+    # The shared tok2vec only feeds the components that listen to it. In the
+    # small English model ner has its own embedding layer, so once tagger and
+    # parser are excluded nothing listens and it would run for nothing.
+    if "tok2vec" in nlp.pipe_names and not nlp.get_pipe("tok2vec").listening_components:
+        nlp.remove_pipe("tok2vec")
+    return nlp
+
+
+# Bumped whenever preprocessing changes what the model sees (2: tokenizer
+# truncation to the model's real limit), so cached results and stored
+# model versions from earlier code are not reused
+SENTIMENT_PIPELINE_VERSION = 2
+
+# Quantized backends may score slightly differently, so cached results are
+# keyed on the backend as well as the model
+SENTIMENT_MODEL_ID = f"{settings.sentiment_model_name}@{settings.sentiment_backend}/v{SENTIMENT_PIPELINE_VERSION}"
+
+# Entity results depend on which pipeline each language is routed to
+NER_MODEL_ID = ",".join(f"{language}={name}" for language, name in sorted(settings.spacy_models.items()))
+
+# Stored on every analyzed review, so rows scored by an earlier model can be
+# found and re-analyzed (scripts/reanalyze_reviews.py)
+MODEL_VERSION = SENTIMENT_MODEL_ID
+
+ner_models = ModelPool(
+    _load_spacy_model,
+    memory_budget_mb=settings.spacy_memory_budget_mb,
+    pinned=[settings.spacy_default_language],
+)
+
+model_registry = ModelRegistry()
+model_registry.register("sentiment", _load_sentiment_pipeline)
+model_registry.register("ner", lambda: ner_models.get(settings.spacy_default_language))
+
+# Optional multi-process inference: the web process keeps the caches and
+# hands cache misses to worker processes that hold the models.
+inference_pool: Optional[InferencePool] = (
+    InferencePool(settings.inference_workers, settings.inference_threads_per_worker)
+    if settings.inference_workers > 0
+    else None
+)
+
+# Duplicate texts (copy-pasted feedback, repeated CSV rows) skip the models
+analysis_cache = AnalysisCache(
+    settings.analysis_cache_size,
+    engine=engine if settings.analysis_cache_persistent else None,
+)
+
+
+def _cached_batch(kind: str, model: str, texts: List[str], compute: Callable[[List[str]], List[Any]]) -> List[Any]:
     """
-    Uses HuggingFace Transformers (Multilingual BERT) to predict sentiment.
-    Returns (label, score).
+    Looks every text up in the analysis cache and only runs `compute` on the
+    distinct texts that were not found. Texts differing only in whitespace
+    share a key; `compute` gets the first of them as written, so the models
+    see the review content itself, line breaks included.
     """
-    # Truncate text to 512 tokens approx (BERT limit)
-    truncated_text = text[:512] 
-    result = sentiment_pipeline(truncated_text)[0]
-    
+    keys = [analysis_cache.make_key(kind, model, text) for text in texts]
+    found = analysis_cache.get_many(keys)
+    pending: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in pending:
+            pending[key] = text
+    if pending:
+        computed = dict(zip(pending, compute(list(pending.values()))))
+        analysis_cache.set_many(computed, kind=kind, model=model)
+        found.update(computed)
+    return [found[key] for key in keys]
+
+
+def _label_from_prediction(result: dict) -> Tuple[str, float]:
     # Model returns labels like "1 star", "2 stars", ... "5 stars"
     raw_label = result["label"]
     score = result["score"]
-    
+
     # Extract the number of stars
     try:
         stars = int(raw_label.split()[0])
@@ -56,79 +144,482 @@ def classify_sentiment(text: str) -> Tuple[str, float]:
     return final_label, round(score, 4)
 
 
-def extract_entities(text: str) -> str:
+def classify_sentiment(text: str) -> Tuple[str, float]:
     """
-    Uses Spacy to extract named entities (ORG, GPE, PERSON, PRODUCT).
+    Uses HuggingFace Transformers (Multilingual BERT) to predict sentiment.
+    Returns (label, score).
     """
-    doc = nlp(text)
-    # Filter for relevant entity types
-    relevant_labels = {"ORG", "GPE", "PERSON", "PRODUCT"}
-    entities = [ent.text for ent in doc.ents if ent.label_ in relevant_labels]
+    return classify_sentiments([text], batch_size=1)[0]
+
+
+def classify_sentiments(texts: List[str], batch_size: int = 32) -> List[Tuple[str, float]]:
+    """
+    Batched variant of classify_sentiment: the whole list goes through the
+    pipeline, which runs one forward pass per `batch_size` texts.
+    """
+    if not texts:
+        return []
+
+    def predict(batch: List[str]) -> List[Tuple[str, float]]:
+        if inference_pool is not None:
+            return inference_pool.map_batches(predict_sentiments, batch, batch_size)
+        return predict_sentiments(batch, batch_size=batch_size)
+
+    # Cached values come back from JSON as lists
+    return [tuple(value) for value in _cached_batch("sentiment", SENTIMENT_MODEL_ID, texts, predict)]
+
+
+def _max_tokens(sentiment_pipeline) -> int:
+    # Some tokenizers report a huge placeholder instead of the model's limit
+    limit = sentiment_pipeline.tokenizer.model_max_length
+    positions = getattr(sentiment_pipeline.model.config, "max_position_embeddings", None)
+    return min(limit, positions) if positions else limit
+
+
+def predict_sentiments(texts: List[str], batch_size: int = 32) -> List[Tuple[str, float]]:
+    """
+    Runs the sentiment model directly, without the cache.
+
+    Texts are truncated by the tokenizer to the model's real token limit and
+    fed to the model sorted by token length, so each batch only pads up to
+    its own longest text. Results are returned in input order.
+    """
+    if not texts:
+        return []
+    sentiment_pipeline = model_registry.get("sentiment")
+    max_length = _max_tokens(sentiment_pipeline)
+    encoded = sentiment_pipeline.tokenizer(texts, truncation=True, max_length=max_length)
+    lengths = [len(ids) for ids in encoded["input_ids"]]
+    order = sorted(range(len(texts)), key=lengths.__getitem__)
+
+    results = sentiment_pipeline(
+        [texts[i] for i in order], batch_size=batch_size, truncation=True, max_length=max_length
+    )
+    predictions: List[Tuple[str, float]] = [None] * len(texts)
+    for index, result in zip(order, results):
+        predictions[index] = _label_from_prediction(result)
+    return predictions
+
+
+# Filter for relevant entity types. The French models use the WikiNER
+# scheme, where PER and LOC stand in for PERSON and GPE.
+RELEVANT_ENTITY_LABELS = {"ORG", "GPE", "PERSON", "PRODUCT"}
+ENTITY_LABELS_BY_LANGUAGE = {"fr": {"ORG", "LOC", "PER"}}
+
+
+def _entities_from_doc(doc, labels=RELEVANT_ENTITY_LABELS) -> str:
+    entities = [ent.text for ent in doc.ents if ent.label_ in labels]
     # Deduplicate and join
     unique_entities = sorted(set(entities))
     return ", ".join(unique_entities[:10])
 
 
-def analyze_review(review: Review) -> Review:
-    label, score = classify_sentiment(review.content)
+def extract_entities(text: str) -> str:
+    """
+    Uses Spacy to extract named entities (ORG, GPE, PERSON, PRODUCT).
+    """
+    return extract_entities_batch([text], batch_size=1)[0]
+
+
+def extract_entities_batch(texts: List[str], batch_size: Optional[int] = None) -> List[str]:
+    """
+    Batched variant of extract_entities, streaming texts through `nlp.pipe`.
+    """
+    if not texts:
+        return []
+    batch_size = batch_size or settings.spacy_batch_size
+
+    def extract(batch: List[str]) -> List[str]:
+        if inference_pool is not None:
+            # Timings come back with the results so /health/stats covers the workers
+            entities: List[str] = []
+            for chunk_entities, timings in inference_pool.map_batches(_predict_entities_in_worker, batch, batch_size):
+                entities.extend(chunk_entities)
+                for timing in timings:
+                    ner_models.record(*timing)
+            return entities
+        return predict_entities(batch, batch_size=batch_size)
+
+    return _cached_batch("entities", NER_MODEL_ID, texts, extract)
+
+
+def predict_entities(texts: List[str], batch_size: Optional[int] = None) -> List[str]:
+    """
+    Runs the spaCy pipelines directly, without the cache. Each text goes to
+    the pipeline of its detected language.
+    """
+    entities, timings = _timed_entities(texts, batch_size)
+    for timing in timings:
+        ner_models.record(*timing)
+    return entities
+
+
+def _predict_entities_in_worker(texts: List[str], batch_size: int) -> List[tuple]:
+    # One (entities, timings) item per chunk, for InferencePool.map_batches
+    return [_timed_entities(texts, batch_size)]
+
+
+def _timed_entities(texts: List[str], batch_size: Optional[int]) -> Tuple[List[str], List[Tuple[str, int, float]]]:
+    """predict_entities, returning (language, docs, seconds) per pipeline call instead of recording it."""
+    timings: List[Tuple[str, int, float]] = []
+    by_language: Dict[str, List[int]] = {}
+    for index, text in enumerate(texts):
+        language = detect_language(text, settings.spacy_models, settings.spacy_default_language)
+        by_language.setdefault(language, []).append(index)
+
+    entities: List[str] = [None] * len(texts)
+    for language, indexes in by_language.items():
+        nlp = ner_models.get(language)
+        labels = ENTITY_LABELS_BY_LANGUAGE.get(language, RELEVANT_ENTITY_LABELS)
+        started = time.perf_counter()
+        docs = nlp.pipe(
+            [texts[index] for index in indexes],
+            batch_size=batch_size or settings.spacy_batch_size,
+            n_process=settings.spacy_n_process,
+        )
+        for index, doc in zip(indexes, docs):
+            entities[index] = _entities_from_doc(doc, labels)
+        timings.append((language, len(indexes), time.perf_counter() - started))
+    return entities, timings
+
+
+WARM_UP_TEXTS = [
+    "The service at Acme Corp in Paris was excellent.",
+    "Livraison en retard, produit abîmé.",
+]
+
+
+def warm_up_models() -> dict:
+    """
+    Loads every registered model and runs a dummy batch through it, so the
+    first real request does not pay for lazy initialisation.
+    """
+    predict_sentiments(WARM_UP_TEXTS, batch_size=len(WARM_UP_TEXTS))
+    predict_entities(WARM_UP_TEXTS, batch_size=len(WARM_UP_TEXTS))
+    return model_registry.status()
+
+
+def check_models() -> None:
+    """
+    Runs the warm-up texts through the models, bypassing the cache (and
+    through the worker processes when enabled). Raises if they cannot run.
+    """
+    if inference_pool is not None:
+        inference_pool.map_batches(predict_sentiments, WARM_UP_TEXTS, len(WARM_UP_TEXTS))
+        inference_pool.map_batches(predict_entities, WARM_UP_TEXTS, len(WARM_UP_TEXTS))
+    else:
+        predict_sentiments(WARM_UP_TEXTS, batch_size=len(WARM_UP_TEXTS))
+        predict_entities(WARM_UP_TEXTS, batch_size=len(WARM_UP_TEXTS))
+
+
+def analyze_texts(texts: List[str], batch_size: int = 32) -> List[Tuple[str, float, str]]:
+    """
+    Runs sentiment and entity extraction over a list of texts.
+    Returns one (label, score, key_entities) tuple per text.
+    """
+    sentiments = classify_sentiments(texts, batch_size=batch_size)
+    entities = extract_entities_batch(texts)
+    return [(label, score, key_entities) for (label, score), key_entities in zip(sentiments, entities)]
+
+
+# Single-review requests from concurrent API calls are grouped into one
+# forward pass instead of running many batch-size-1 inferences side by side.
+review_batcher: MicroBatcher[str, Tuple[str, float, str]] = MicroBatcher(
+    lambda texts: analyze_texts(texts, batch_size=len(texts)),
+    max_batch_size=settings.inference_batch_max_size,
+    max_wait_ms=settings.inference_batch_max_wait_ms,
+    name="review-batcher",
+    # With worker processes, keep one micro-batch in flight per worker
+    consumers=max(1, settings.inference_workers),
+    timeout=settings.inference_batch_timeout_seconds,
+)
+
+
+def _apply_analysis(review: Review, analysis: Tuple[str, float, str], analyzed_at: datetime) -> None:
+    label, score, key_entities = analysis
     review.sentiment = label
     review.sentiment_score = score
-    review.key_entities = extract_entities(review.content)
-    review.analyzed_at = datetime.utcnow()
+    review.key_entities = key_entities
+    review.analyzed_at = analyzed_at
+    review.model_version = MODEL_VERSION
+
+
+def analyze_review(review: Review) -> Review:
+    if settings.inference_batching_enabled:
+        analysis = review_batcher.run(review.content)
+    else:
+        analysis = analyze_texts([review.content], batch_size=1)[0]
+    _apply_analysis(review, analysis, datetime.utcnow())
     return review
 
 
-def bulk_import_reviews(session: Session, csv_content: str, owner_id: int) -> int:
-    buffer = StringIO(csv_content)
-    df = pd.read_csv(buffer)
+def apply_analyses(reviews: List[Review], analyses: List[Tuple[str, float, str]]) -> List[Review]:
+    """Stores analyze_texts results on the reviews, in order."""
+    analyzed_at = datetime.utcnow()
+    for review, analysis in zip(reviews, analyses):
+        _apply_analysis(review, analysis, analyzed_at)
+    return reviews
+
+
+def analyze_reviews(reviews: List[Review], batch_size: int = 32) -> List[Review]:
+    """
+    Analyze many reviews at once. Produces the same fields as calling
+    analyze_review on each review, but with batched model calls.
+    """
+    return apply_analyses(reviews, analyze_texts([review.content for review in reviews], batch_size=batch_size))
+
+
+def invalidate_dashboards(session: Session, reviews: List[Review]) -> None:
+    for owner_id in {review.owner_id for review in reviews if review.owner_id is not None}:
+        invalidate_on_commit(session, dashboard_key(owner_id))
+
+
+def add_reviews(session: Session, reviews: List[Review]) -> None:
+    """
+    Adds new reviews to the session and updates the derived sentiment
+    counters, trend rollups and entity index in the same transaction.
+    The caller commits.
+    """
+    session.add_all(reviews)
+    apply_review_counts(session, reviews)
+    apply_review_rollups(session, reviews)
+    # The entity index references the review ids
+    session.flush()
+    apply_review_entities(session, reviews)
+    invalidate_dashboards(session, reviews)
+
+
+def insert_reviews_bulk(session: Session, reviews: List[Review]) -> None:
+    """
+    Bulk variant of add_reviews for imports: rows are written with Core
+    inserts (COPY on PostgreSQL) and never enter the session.
+    """
+    insert_reviews(session, reviews)
+    apply_review_counts(session, reviews)
+    apply_review_rollups(session, reviews)
+    apply_review_entities(session, reviews)
+    invalidate_dashboards(session, reviews)
+
+
+def bulk_import_reviews(
+    session: Session,
+    csv_file: Union[str, BinaryIO],
+    owner_id: int,
+    batch_size: Optional[int] = None,
+    skip_rows: int = 0,
+    on_batch: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Imports reviews from CSV text or a binary file object (e.g. the spooled
+    upload). The file is parsed `import_batch_size` rows at a time, and each
+    chunk is analyzed and committed before the next one is read, so memory
+    stays flat regardless of file size.
+
+    Rows without content are counted as failed and skipped. The first
+    `skip_rows` data rows are ignored (used to resume an interrupted import).
+    `on_batch(rows_processed, rows_failed)` is called before each batch
+    commit, so progress written by the callback is committed atomically with
+    the batch. Returns the number of imported reviews.
+    """
+    import pandas as pd
+
+    if isinstance(csv_file, str):
+        stream = StringIO(csv_file)
+    else:
+        stream = TextIOWrapper(csv_file, encoding="utf-8", newline="")
+    reader = pd.read_csv(stream, chunksize=settings.import_batch_size)
     required_cols = {"content"}
-    if not required_cols.issubset(df.columns):
-        raise ValueError("CSV must contain at least a 'content' column")
-
-    new_reviews: List[Review] = []
-    for _, row in df.iterrows():
-        review = Review(
-            source=row.get("source", "csv"),
-            author=row.get("author"),
-            content=row["content"],
-            owner_id=owner_id,
+
+    imported = 0
+    rows_seen = 0
+    for chunk in reader:
+        if not required_cols.issubset(chunk.columns):
+            raise ValueError("CSV must contain at least a 'content' column")
+
+        first_row = max(0, skip_rows - rows_seen)
+        rows_seen += len(chunk)
+        records = chunk.to_dict("records")[first_row:]
+        if not records:
+            continue
+
+        new_reviews: List[Review] = []
+        failed = 0
+        for row in records:
+            content = row["content"]
+            if pd.isna(content) or not str(content).strip():
+                failed += 1
+                continue
+            source = row.get("source")
+            author = row.get("author")
+            review = Review(
+                source="csv" if pd.isna(source) else source,
+                author=None if pd.isna(author) else author,
+                content=str(content),
+                owner_id=owner_id,
+            )
+            new_reviews.append(review)
+
+        analyze_reviews(new_reviews, batch_size=batch_size or settings.inference_batch_size)
+        insert_reviews_bulk(session, new_reviews)
+        if on_batch is not None:
+            on_batch(len(records), failed)
+        session.commit()
+        imported += len(new_reviews)
+    return imported
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(review) -> str:
+    raw = f"{review.created_at.isoformat()}|{review.id}"
+    return urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, review_id = urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), int(review_id)
+    except (ValueError, UnicodeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def _review_criteria(
+    owner_id: int,
+    sentiment: Optional[str],
+    source: Optional[str],
+    form_id: Optional[int],
+    created_after: Optional[datetime],
+    created_before: Optional[datetime],
+) -> list:
+    criteria = [Review.owner_id == owner_id]
+    if sentiment is not None:
+        criteria.append(Review.sentiment == sentiment)
+    if source is not None:
+        criteria.append(Review.source == source)
+    if form_id is not None:
+        criteria.append(Review.form_id == form_id)
+    if created_after is not None:
+        criteria.append(Review.created_at >= created_after)
+    if created_before is not None:
+        criteria.append(Review.created_at < created_before)
+    return criteria
+
+
+def list_reviews_page(
+    session: Session,
+    owner_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    source: Optional[str] = None,
+    form_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    summary: bool = False,
+) -> Tuple[list, Optional[str]]:
+    """
+    One page of an owner's reviews, newest first, using keyset pagination on
+    (created_at, id) so every page costs the same regardless of depth.
+    With `summary`, only the listed columns are fetched and `content` is cut
+    to `review_summary_length` characters in SQL.
+    Returns the page and the cursor of the next page (None on the last one).
+    """
+    if summary:
+        columns = [
+            Review.id,
+            Review.source,
+            Review.author,
+            func.substr(Review.content, 1, settings.review_summary_length).label("content"),
+            Review.sentiment,
+            Review.sentiment_score,
+            Review.created_at,
+            Review.analyzed_at,
+        ]
+        statement = select(*columns)
+    else:
+        statement = select(Review)
+
+    criteria = _review_criteria(owner_id, sentiment, source, form_id, created_after, created_before)
+    if cursor is not None:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        criteria.append(
+            or_(
+                Review.created_at < cursor_created_at,
+                and_(Review.created_at == cursor_created_at, Review.id < cursor_id),
+            )
         )
-        analyze_review(review)
-        new_reviews.append(review)
 
-    session.add_all(new_reviews)
-    session.commit()
-    return len(new_reviews)
+    # Fetch one extra row to know whether there is a next page
+    statement = statement.where(*criteria).order_by(Review.created_at.desc(), Review.id.desc()).limit(limit + 1)
+    rows = session.exec(statement).all()
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1]) if len(rows) > limit else None
+    return page, next_cursor
+
+
+def encode_search_cursor(score: float, review_id: int) -> str:
+    raw = f"{score!r}|{review_id}"
+    return urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        score, review_id = urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return float(score), int(review_id)
+    except (ValueError, UnicodeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def search_reviews_page(
+    session: Session,
+    owner_id: int,
+    query: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    source: Optional[str] = None,
+    form_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> Tuple[List[Review], Optional[str]]:
+    """
+    One page of an owner's reviews containing every word of `query`, best
+    match first, from the full-text index. Pages are keyed on (score, id);
+    the filters are the same as list_reviews_page.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return [], None
+    score, match_criteria, fts = match_reviews(session.get_bind().dialect.name, terms)
+
+    statement = select(Review, score.label("score"))
+    if fts is not None:
+        statement = statement.join(fts, fts.c.rowid == Review.id)
+    criteria = _review_criteria(owner_id, sentiment, source, form_id, created_after, created_before)
+    criteria.extend(match_criteria)
+    if cursor is not None:
+        cursor_score, cursor_id = decode_search_cursor(cursor)
+        criteria.append(or_(score < cursor_score, and_(score == cursor_score, Review.id < cursor_id)))
+
+    statement = statement.where(*criteria).order_by(score.desc(), Review.id.desc()).limit(limit + 1)
+    rows = session.exec(statement).all()
+    page = rows[:limit]
+    next_cursor = encode_search_cursor(page[-1].score, page[-1][0].id) if len(rows) > limit else None
+    return [review for review, _ in page], next_cursor
+
+
+def _latest_reviews(session: Session, limit: int, *criteria) -> List[Review]:
+    statement = select(Review).where(*criteria).order_by(Review.created_at.desc()).limit(limit)
+    return session.exec(statement).all()
 
 
 def get_dashboard_summary(session: Session, owner_id: int, limit: int = 5) -> Tuple[dict, List[Review]]:
-    statement = select(Review).where(Review.owner_id == owner_id).order_by(Review.created_at.desc())
-    reviews: List[Review] = session.exec(statement).all()
-    total = len(reviews)
-    sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
-    for review in reviews:
-        # Normalize labels just in case
-        sentiment = review.sentiment.lower() if review.sentiment else "neutral"
-        if sentiment in sentiment_counts:
-            sentiment_counts[sentiment] += 1
-        else:
-            # Handle unknown labels by mapping them or ignoring
-            pass
-            
-    sentiment_counts["total"] = total
-    return sentiment_counts, reviews[:limit]
+    sentiment_counts = read_counts(session, "owner", owner_id)
+    return sentiment_counts, _latest_reviews(session, limit, Review.owner_id == owner_id)
 
 
 def get_form_stats(session: Session, form_id: int, limit: int = 50) -> Tuple[dict, List[Review]]:
-    statement = select(Review).where(Review.form_id == form_id).order_by(Review.created_at.desc())
-    reviews = session.exec(statement).all()
-    
-    total = len(reviews)
-    sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
-    for review in reviews:
-        sentiment = review.sentiment.lower() if review.sentiment else "neutral"
-        if sentiment in sentiment_counts:
-            sentiment_counts[sentiment] += 1
-            
-    sentiment_counts["total"] = total
-    return sentiment_counts, reviews[:limit]
+    sentiment_counts = read_counts(session, "form", form_id)
+    return sentiment_counts, _latest_reviews(session, limit, Review.form_id == form_id)
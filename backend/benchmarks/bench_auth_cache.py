@@ -0,0 +1,69 @@
+"""
+Latency and SQL statements per authenticated request, with and without the
+authenticated-user cache in dependencies.get_current_user.
+
+Drives GET /api/auth/me through the ASGI test client against an in-memory
+SQLite database and counts statements with a cursor-execute listener.
+
+Usage: python benchmarks/bench_auth_cache.py [--requests 2000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import Session, create_engine  # noqa: E402
+from sqlmodel.pool import StaticPool  # noqa: E402
+
+from app.dependencies import get_db, user_cache  # noqa: E402
+from app.main import app  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+from app.models import User  # noqa: E402
+from app.security import create_access_token, get_password_hash  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    run_migrations(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *params: statements.append(1))
+
+    with Session(engine) as session:
+        session.add(User(email="bench@example.com", hashed_password=get_password_hash("bench")))
+        session.commit()
+
+        app.dependency_overrides[get_db] = lambda: session
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token('bench@example.com')}"}
+
+        for label, maxsize in (("no cache", 0), ("user cache", 1024)):
+            user_cache.clear()
+            user_cache.hits = user_cache.misses = 0
+            user_cache.maxsize = maxsize
+            timings = []
+            statements.clear()
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                client.get("/api/auth/me", headers=headers)
+                timings.append(time.perf_counter() - started)
+            timings.sort()
+            print(
+                f"{label:<11} {len(statements) / args.requests:5.2f} statements/request  "
+                f"median {statistics.median(timings) * 1000:6.3f} ms  "
+                f"p99 {timings[int(len(timings) * 0.99)] * 1000:6.3f} ms"
+            )
+        print(f"cache stats: {user_cache.stats()}")
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
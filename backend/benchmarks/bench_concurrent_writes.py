@@ -0,0 +1,95 @@
+"""
+Write throughput with N concurrent submitters, as on the public form endpoint.
+
+Each submitter thread repeatedly inserts one review (plus its counter update)
+and commits, against a temporary SQLite file. Compares a plain
+create_engine() with the tuned SQLite profile from database.build_engine,
+and reports errors such as "database is locked". With --database-url the
+tuned profile is measured against that database instead (use a scratch one).
+
+Usage: python benchmarks/bench_concurrent_writes.py [--writers 1 4 16 32] [--writes 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+from app.config import Settings  # noqa: E402
+from app.database import build_engine  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+from app.models import Review  # noqa: E402
+from app.services import add_reviews  # noqa: E402
+
+BENCH_OWNER_ID = 999_999
+
+
+def submitter(engine, writes: int, errors: list) -> None:
+    for i in range(writes):
+        try:
+            with Session(engine) as session:
+                review = Review(
+                    source="public_form",
+                    content=f"Concurrent submission {i}",
+                    sentiment="positive",
+                    sentiment_score=0.9,
+                    owner_id=BENCH_OWNER_ID,
+                )
+                add_reviews(session, [review])
+                session.commit()
+        except Exception as exc:  # noqa: BLE001 - counted and reported
+            errors.append(type(exc).__name__ + ": " + str(exc).splitlines()[0])
+
+
+def measure(label: str, engine, writers: int, writes: int) -> None:
+    errors: list = []
+    threads = [threading.Thread(target=submitter, args=(engine, writes, errors)) for _ in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    ok = writers * writes - len(errors)
+    sample = f"  e.g. {errors[0]}" if errors else ""
+    print(f"{label:<8} writers={writers:<3} {ok / elapsed:8.0f} writes/s  errors={len(errors)}{sample}")
+    with Session(engine) as session:
+        session.execute(delete(Review).where(Review.owner_id == BENCH_OWNER_ID))
+        session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--writes", type=int, default=200, help="writes per submitter")
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = build_engine(Settings(database_url=args.database_url))
+        run_migrations(engine)
+        for writers in args.writers:
+            measure("tuned", engine, writers, args.writes)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for label in ("plain", "tuned"):
+            url = f"sqlite:///{os.path.join(workdir, label + '.db')}"
+            if label == "plain":
+                engine = create_engine(url, connect_args={"check_same_thread": False})
+            else:
+                engine = build_engine(Settings(database_url=url))
+            run_migrations(engine)
+            for writers in args.writers:
+                measure(label, engine, writers, args.writes)
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Peak memory of bulk_import_reviews for growing CSV sizes.
+
+Generates CSV files of increasing row counts, imports each one into a
+temporary SQLite database and reports the peak traced Python allocation.
+With --skip-models the NLP step is replaced by a constant result so only
+the parsing / batching / commit path is measured.
+
+Usage: python benchmarks/bench_csv_import.py [--rows 10000 50000 200000] [--skip-models]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas  # noqa: E402,F401  (imported up front so it does not count towards peak memory)
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
+
+from app import services  # noqa: E402
+
+
+def write_csv(path: str, rows: int) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["content", "author", "source"])
+        for i in range(rows):
+            writer.writerow([f"Review number {i}: the product was fine, delivery took {i % 9} days.", f"user{i}", "csv"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--skip-models", action="store_true")
+    args = parser.parse_args()
+
+    if args.skip_models:
+        services.analyze_texts = lambda texts, batch_size=32: [("neutral", 0.5, "") for _ in texts]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            csv_path = os.path.join(workdir, f"reviews_{rows}.csv")
+            write_csv(csv_path, rows)
+            engine = create_engine(f"sqlite:///{os.path.join(workdir, f'bench_{rows}.db')}")
+            SQLModel.metadata.create_all(engine)
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            with Session(engine) as session, open(csv_path, "rb") as upload:
+                imported = services.bulk_import_reviews(session, upload, owner_id=1)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            size_mb = os.path.getsize(csv_path) / 1024 / 1024
+            print(
+                f"{rows:>8} rows ({size_mb:6.1f} MB)  imported {imported:>8}  "
+                f"peak {peak / 1024 / 1024:7.1f} MB  {rows / elapsed:8.0f} rows/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Dashboard latency as the number of reviews per owner grows.
+
+Fills a temporary SQLite database with N reviews for one owner and times
+services.get_dashboard_summary against the previous implementation, which
+loaded every review into Python and counted in a loop.
+
+Usage: python benchmarks/bench_dashboard.py [--sizes 1000 10000 100000 1000000] [--runs 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session, SQLModel, create_engine, select  # noqa: E402
+
+from app.models import Review  # noqa: E402
+from app.services import get_dashboard_summary  # noqa: E402
+
+OWNER_ID = 1
+LABELS = ["positive", "neutral", "negative"]
+
+
+def python_side_summary(session: Session, owner_id: int, limit: int = 5):
+    statement = select(Review).where(Review.owner_id == owner_id).order_by(Review.created_at.desc())
+    reviews = session.exec(statement).all()
+    counts = {"positive": 0, "neutral": 0, "negative": 0}
+    for review in reviews:
+        sentiment = review.sentiment.lower() if review.sentiment else "neutral"
+        if sentiment in counts:
+            counts[sentiment] += 1
+    counts["total"] = len(reviews)
+    return counts, reviews[:limit]
+
+
+def populate(engine, count: int) -> None:
+    start = datetime(2024, 1, 1)
+    rows = [
+        {
+            "source": "csv",
+            "content": f"Review {i} about the delivery and the product quality.",
+            "sentiment": random.choice(LABELS),
+            "sentiment_score": 0.9,
+            "created_at": start + timedelta(seconds=i),
+            "owner_id": OWNER_ID,
+        }
+        for i in range(count)
+    ]
+    with engine.begin() as connection:
+        connection.execute(Review.__table__.insert(), rows)
+
+
+def timed(func, engine, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            func(session, OWNER_ID)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-baseline", action="store_true", help="do not time the python-side version")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            engine = create_engine(f"sqlite:///{os.path.join(workdir, f'dashboard_{size}.db')}")
+            SQLModel.metadata.create_all(engine)
+            populate(engine, size)
+            sql_ms = timed(get_dashboard_summary, engine, args.runs)
+            line = f"{size:>9} reviews  sql aggregate {sql_ms:9.2f} ms"
+            if not args.skip_baseline:
+                line += f"  python-side {timed(python_side_summary, engine, args.runs):9.2f} ms"
+            print(line)
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
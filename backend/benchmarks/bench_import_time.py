@@ -0,0 +1,50 @@
+"""
+Measures how long it takes to import the application in a fresh interpreter,
+and checks that no ML library is pulled in by code paths that never run
+inference (API startup without warm-up, admin scripts, tests).
+
+Usage: python benchmarks/bench_import_time.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+heavy = sorted(m for m in ("torch", "transformers", "spacy", "pandas") if m in sys.modules)
+print(elapsed, ",".join(heavy))
+"""
+
+
+def measure(module: str, runs: int) -> None:
+    timings = []
+    heavy = ""
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, "-c", PROBE.format(module=module)], cwd=BACKEND_DIR, text=True
+        )
+        elapsed, heavy = output.strip().split(" ", 1) if " " in output.strip() else (output.strip(), "")
+        timings.append(float(elapsed))
+    print(
+        f"{module:<20} median {statistics.median(timings) * 1000:8.1f} ms"
+        f"  min {min(timings) * 1000:8.1f} ms  heavy modules: {heavy or 'none'}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    for module in ("app.main", "app.services", "app.database"):
+        measure(module, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Throughput of the inference worker pool by worker count.
+
+Runs the sentiment model (bypassing the result cache) over a fixed set of
+distinct texts, first in-process and then through an InferencePool with
+1, 2, 4 ... workers up to the number of CPU cores.
+
+Usage: python benchmarks/bench_inference_pool.py [--texts 512] [--batch-size 16] [--threads 1]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.inference_pool import InferencePool  # noqa: E402
+from app.services import predict_sentiments  # noqa: E402
+
+SENTENCES = [
+    "The delivery was fast and the packaging was perfect.",
+    "Customer support never answered my emails, very disappointed.",
+    "Le produit est correct mais un peu cher pour la qualité.",
+    "Absolutely love it, I already ordered a second one for my sister.",
+    "Service moyen, rien d'exceptionnel.",
+    "The app crashes every time I try to pay, please fix it.",
+]
+
+
+def make_texts(count: int) -> list:
+    # Distinct texts so nothing could be served from a cache
+    return [f"{SENTENCES[i % len(SENTENCES)]} (order #{i})" for i in range(count)]
+
+
+def report(label: str, count: int, elapsed: float) -> None:
+    print(f"{label:<24} {count / elapsed:8.1f} texts/s  ({elapsed:.2f} s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=1, help="torch threads per worker")
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    cores = os.cpu_count() or 1
+
+    predict_sentiments(texts[: args.batch_size], batch_size=args.batch_size)
+    started = time.perf_counter()
+    predict_sentiments(texts, batch_size=args.batch_size)
+    report("in-process", len(texts), time.perf_counter() - started)
+
+    workers = 1
+    while workers * args.threads <= cores:
+        pool = InferencePool(workers, threads_per_worker=args.threads)
+        pool.start()
+        try:
+            started = time.perf_counter()
+            pool.map_batches(predict_sentiments, texts, args.batch_size)
+            report(f"pool workers={workers}", len(texts), time.perf_counter() - started)
+        finally:
+            pool.shutdown()
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
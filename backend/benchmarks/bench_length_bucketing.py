@@ -0,0 +1,78 @@
+"""
+Padding waste and throughput of length-sorted batching for the sentiment model.
+
+Builds a review sample with a realistic, long-tailed length distribution
+(most reviews are a sentence or two, a few are several paragraphs), then
+compares feeding the pipeline in arrival order with feeding it sorted by
+token length, as services.predict_sentiments does. Both runs use
+tokenizer-based truncation to the model limit.
+
+Usage: python benchmarks/bench_length_bucketing.py [--texts 512] [--batch-size 32]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import _max_tokens, model_registry, predict_sentiments  # noqa: E402
+
+WORDS = (
+    "the delivery was quick but the box arrived damaged and support took days to answer "
+    "great value for money would recommend to friends service très bien produit conforme "
+    "staff friendly store clean prices high quality average refund slow app crashes often"
+).split()
+
+
+def padding_ratio(lengths: list, batch_size: int) -> float:
+    """Share of padding tokens when `lengths` are batched in the given order."""
+    total = padded = 0
+    for start in range(0, len(lengths), batch_size):
+        batch = lengths[start:start + batch_size]
+        total += sum(batch)
+        padded += max(batch) * len(batch)
+    return round(1 - total / padded, 4) if padded else 0.0
+
+
+def make_texts(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        # Log-normal word counts: median ~12 words, long tail past the 512-token limit
+        words = max(1, min(900, int(rng.lognormvariate(2.5, 1.0))))
+        texts.append(" ".join(rng.choice(WORDS) for _ in range(words)))
+    return texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    pipe = model_registry.get("sentiment")
+    max_length = _max_tokens(pipe)
+    lengths = [len(ids) for ids in pipe.tokenizer(texts, truncation=True, max_length=max_length)["input_ids"]]
+    print(f"{len(texts)} texts, tokens median {sorted(lengths)[len(lengths) // 2]}, max {max(lengths)}")
+    print(f"padding ratio  arrival order {padding_ratio(lengths, args.batch_size):.1%}"
+          f"  length sorted {padding_ratio(sorted(lengths), args.batch_size):.1%}")
+
+    pipe(texts[: args.batch_size], batch_size=args.batch_size, truncation=True, max_length=max_length)
+
+    started = time.perf_counter()
+    pipe(texts, batch_size=args.batch_size, truncation=True, max_length=max_length)
+    unsorted_rate = len(texts) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    predict_sentiments(texts, batch_size=args.batch_size)
+    sorted_rate = len(texts) / (time.perf_counter() - started)
+
+    print(f"throughput     arrival order {unsorted_rate:.1f} texts/s  length sorted {sorted_rate:.1f} texts/s"
+          f"  ({sorted_rate / unsorted_rate:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Dashboard latency during a login storm.
+
+Serves the app in-process over httpx's ASGI transport with a temporary
+SQLite database, measures GET /api/dashboard/ latency while idle, then
+again while --logins concurrent bcrypt logins are in flight, and reports
+how many logins were shed with 503.
+
+Client and app share one event loop here, so the storm's requests are all
+parsed before the loop gets back to the dashboard client. Measuring starts
+--settle seconds after the storm begins, once those arrivals are admitted or
+shed; what remains is the steady cost of the hashing itself. The number of
+logins still in flight when measuring ends shows the storm was still running.
+
+Usage: python benchmarks/bench_login_storm.py [--logins 200] [--dashboard-requests 500] [--settle 0.5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+from app.config import Settings  # noqa: E402
+from app.database import build_engine  # noqa: E402
+from app.dependencies import get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+async def dashboard_latencies(client: httpx.AsyncClient, headers: dict, count: int) -> list:
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = await client.get("/api/dashboard/", headers=headers)
+        response.raise_for_status()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def run(args) -> None:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        credentials = {"email": "storm@example.com", "password": "password123"}
+        await client.post("/api/auth/register", json=credentials)
+        login_form = {"username": credentials["email"], "password": credentials["password"]}
+        token = (await client.post("/api/auth/login", data=login_form)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        idle = await dashboard_latencies(client, headers, args.dashboard_requests)
+
+        storm = [asyncio.create_task(client.post("/api/auth/login", data=login_form)) for _ in range(args.logins)]
+        await asyncio.sleep(args.settle)
+        busy = await dashboard_latencies(client, headers, args.dashboard_requests)
+        in_flight = sum(1 for task in storm if not task.done())
+        responses = await asyncio.gather(*storm)
+
+        statuses = {}
+        for response in responses:
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        print(f"dashboard idle         p50 {percentile(idle, 0.5):7.2f} ms  p99 {percentile(idle, 0.99):7.2f} ms")
+        print(f"dashboard during storm p50 {percentile(busy, 0.5):7.2f} ms  p99 {percentile(busy, 0.99):7.2f} ms")
+        print(f"login responses: {statuses} ({in_flight} still in flight when measuring ended)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--dashboard-requests", type=int, default=500)
+    parser.add_argument("--settle", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = build_engine(Settings(database_url=f"sqlite:///{os.path.join(workdir, 'storm.db')}"))
+        run_migrations(engine)
+
+        def get_db_override():
+            with Session(engine) as session:
+                yield session
+
+        app.dependency_overrides[get_db] = get_db_override
+        try:
+            asyncio.run(run(args))
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
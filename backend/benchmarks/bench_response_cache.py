@@ -0,0 +1,130 @@
+"""
+Polling load test for the response cache on GET /api/dashboard/ and
+GET /api/public/{uuid}.
+
+Simulates open browser tabs: each of --users owners has --tabs tabs polling
+their dashboard (sending the ETag of their last response as If-None-Match)
+and anonymous visitors open each owner's public form, while a writer adds
+a review for a random owner every --write-every polls. Runs once with the
+response cache disabled and once enabled, against an in-memory SQLite
+database, and reports SQL statements per request, latency, 304 share and
+the cache hit ratios.
+
+Usage: python benchmarks/bench_response_cache.py [--users 20] [--tabs 3] [--rounds 50] [--write-every 25]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import Session, create_engine  # noqa: E402
+from sqlmodel.pool import StaticPool  # noqa: E402
+
+from app.dependencies import get_db, user_cache  # noqa: E402
+from app.main import app  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+from app.models import FeedbackForm, Review, User  # noqa: E402
+from app.response_cache import response_cache  # noqa: E402
+from app.security import create_access_token  # noqa: E402
+from app.services import add_reviews  # noqa: E402
+
+
+def seed(session: Session, users: int) -> list:
+    owners = []
+    for index in range(users):
+        user = User(email=f"owner{index}@example.com", hashed_password="x")
+        session.add(user)
+        session.flush()
+        form = FeedbackForm(uuid=f"form-{index}", name=f"Form {index}", owner_id=user.id)
+        session.add(form)
+        add_reviews(session, [
+            Review(content=f"review {n}", sentiment=random.choice(["positive", "neutral", "negative"]),
+                   sentiment_score=0.8, owner_id=user.id)
+            for n in range(200)
+        ])
+        owners.append((user.id, {"Authorization": f"Bearer {create_access_token(user.email)}"}, form.uuid))
+    session.commit()
+    return owners
+
+
+def run(client: TestClient, session: Session, owners: list, args, statements: list) -> dict:
+    etags = {}
+    timings = []
+    not_modified = 0
+    requests = 0
+    statements.clear()
+    for round_number in range(args.rounds):
+        for owner_id, headers, form_uuid in owners:
+            for tab in range(args.tabs):
+                tab_headers = dict(headers)
+                if (owner_id, tab) in etags:
+                    tab_headers["If-None-Match"] = etags[(owner_id, tab)]
+                started = time.perf_counter()
+                response = client.get("/api/dashboard/", headers=tab_headers)
+                timings.append(time.perf_counter() - started)
+                etags[(owner_id, tab)] = response.headers.get("ETag", "")
+                not_modified += response.status_code == 304
+                requests += 1
+
+            started = time.perf_counter()
+            client.get(f"/api/public/{form_uuid}")
+            timings.append(time.perf_counter() - started)
+            requests += 1
+
+            if requests % args.write_every == 0:
+                writer_owner = random.choice(owners)[0]
+                add_reviews(session, [Review(content="new", sentiment="positive", owner_id=writer_owner)])
+                session.commit()
+    timings.sort()
+    return {
+        "requests": requests,
+        "statements": len(statements),
+        "median_ms": statistics.median(timings) * 1000,
+        "p99_ms": timings[int(len(timings) * 0.99)] * 1000,
+        "not_modified": not_modified,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--tabs", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--write-every", type=int, default=25, help="requests between two review writes")
+    args = parser.parse_args()
+
+    random.seed(3)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    run_migrations(engine)
+    statements = []
+
+    with Session(engine) as session:
+        owners = seed(session, args.users)
+        event.listen(engine, "before_cursor_execute", lambda *params: statements.append(1))
+        app.dependency_overrides[get_db] = lambda: session
+        client = TestClient(app)
+
+        maxsize = response_cache._cache.maxsize
+        for label, size in (("no cache", 0), ("response cache", maxsize)):
+            user_cache.clear()
+            response_cache.clear()
+            response_cache._cache.maxsize = size
+            report = run(client, session, owners, args, statements)
+            print(
+                f"{label:<15} {report['statements'] / report['requests']:5.2f} statements/request  "
+                f"median {report['median_ms']:6.3f} ms  p99 {report['p99_ms']:6.3f} ms  "
+                f"304s {report['not_modified'] / report['requests']:5.1%}"
+            )
+        for kind, counts in response_cache.stats()["kinds"].items():
+            print(f"  {kind:<12} hit ratio {counts['hit_ratio']:.1%}  ({counts['hits']} hits, {counts['misses']} misses)")
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
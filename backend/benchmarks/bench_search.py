@@ -0,0 +1,130 @@
+"""
+Review search latency: full-text index against a LIKE '%term%' scan.
+
+Fills a temporary SQLite database with N generated reviews for one owner,
+creates the FTS5 index the migrations create, and times the first page of
+services.search_reviews_page against the same filters with one
+`content LIKE '%term%'` per term, ordered newest first, for common,
+mid-frequency and rare terms. LIKE stops early when a frequent term fills
+the page quickly but scans the whole table for rare ones; the index cost
+grows with the number of matches it has to rank instead.
+
+Usage: python benchmarks/bench_search.py [--sizes 10000 100000 1000000] [--runs 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session, SQLModel, create_engine, func, select  # noqa: E402
+
+from app.models import Review  # noqa: E402
+from app.search import create_search_index  # noqa: E402
+from app.services import search_reviews_page  # noqa: E402
+
+OWNER_ID = 1
+PAGE_SIZE = 50
+VOCABULARY_SIZE = 20_000
+
+
+def make_vocabulary() -> list:
+    random.seed(7)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(random.choices(letters, k=random.randint(4, 9))))
+    return sorted(words)
+
+
+# Word frequencies follow Zipf's law, like real review text, so queries can
+# pick common, mid-frequency and rare terms by rank
+VOCABULARY = make_vocabulary()
+CUM_WEIGHTS = list(accumulate(1 / rank for rank in range(1, VOCABULARY_SIZE + 1)))
+QUERIES = {
+    "common": VOCABULARY[3],
+    "medium": VOCABULARY[300],
+    "rare": VOCABULARY[8000],
+    "two words": f"{VOCABULARY[8000]} {VOCABULARY[3]}",
+}
+
+
+def populate(engine, count: int) -> None:
+    start = datetime(2024, 1, 1)
+    batch = []
+    with engine.begin() as connection:
+        for i in range(count):
+            batch.append({
+                "source": "csv",
+                "content": " ".join(random.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=random.randint(8, 40))),
+                "sentiment": random.choice(["positive", "neutral", "negative"]),
+                "created_at": start + timedelta(seconds=i),
+                "owner_id": OWNER_ID,
+            })
+            if len(batch) == 10_000:
+                connection.execute(Review.__table__.insert(), batch)
+                batch = []
+        if batch:
+            connection.execute(Review.__table__.insert(), batch)
+
+
+def like_search(session: Session, query: str) -> list:
+    criteria = [Review.owner_id == OWNER_ID] + [Review.content.like(f"%{term}%") for term in query.split()]
+    statement = select(Review).where(*criteria).order_by(Review.created_at.desc(), Review.id.desc()).limit(PAGE_SIZE)
+    return session.exec(statement).all()
+
+
+def like_count(session: Session, query: str) -> int:
+    criteria = [Review.owner_id == OWNER_ID] + [Review.content.like(f"%{term}%") for term in query.split()]
+    return session.exec(select(func.count()).select_from(Review).where(*criteria)).one()
+
+
+def fts_search(session: Session, query: str) -> list:
+    return search_reviews_page(session, OWNER_ID, query, PAGE_SIZE)[0]
+
+
+def timed(func, engine, query: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            func(session, query)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            engine = create_engine(f"sqlite:///{os.path.join(workdir, f'search_{size}.db')}")
+            SQLModel.metadata.create_all(engine)
+            with engine.begin() as connection:
+                create_search_index(connection)
+            started = time.perf_counter()
+            populate(engine, size)
+            print(f"{size} reviews (inserted and indexed in {time.perf_counter() - started:.1f} s)")
+            for kind, query in QUERIES.items():
+                with Session(engine) as session:
+                    matched = like_count(session, query)
+                like_ms = timed(like_search, engine, query, args.runs)
+                fts_ms = timed(fts_search, engine, query, args.runs)
+                print(
+                    f"  {kind:<10} LIKE {like_ms:9.2f} ms ({matched:>7} rows)  "
+                    f"full-text {fts_ms:9.2f} ms  speed-up {like_ms / fts_ms:6.1f}x"
+                )
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Compares the full spaCy pipeline with the trimmed one the app loads
+(`spacy_excluded_components`, plus tok2vec when nothing listens to it).
+
+Each variant runs in its own interpreter so its memory is measured in
+isolation. Reports the active components, load time, resident memory after
+loading, per-document latency, `nlp.pipe` throughput, and whether the
+extracted key entities are identical to the full pipeline's.
+
+Usage: python benchmarks/bench_spacy_pipeline.py [--rounds 20] [--batch-size 64]
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+SAMPLE = [
+    "The service at Acme Corp in Paris was excellent.",
+    "I ordered from Amazon and the parcel arrived in Berlin two days late.",
+    "Great staff at the London store, especially Sarah.",
+    "Apple should fix the battery issue on the new iPhone.",
+    "We stayed at the Hilton in New York and the breakfast was cold.",
+    "Customer support at Microsoft never answered my emails.",
+    "Delivery was on time and the packaging was fine.",
+    "The Tesla showroom in Munich was closed on Saturday.",
+    "Booked through Expedia, flew with Lufthansa, lost luggage in Frankfurt.",
+    "It works, nothing special.",
+    "John from the Google Maps team called me back within an hour.",
+    "The Starbucks near Central Park makes the best latte in Manhattan.",
+    "Ordered a Samsung TV, received a broken box from DHL.",
+    "Terrible. Broken on arrival and the refund took six weeks.",
+    "The museum in Madrid was crowded but worth it.",
+    "IKEA assembly instructions are confusing.",
+]
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_variant(variant: str, rounds: int, batch_size: int) -> dict:
+    import spacy
+
+    from app.config import get_settings
+    from app.services import _drop_unused_tok2vec, _entities_from_doc
+
+    settings = get_settings()
+    model_name = settings.spacy_models[settings.spacy_default_language]
+    baseline = rss_mb()
+    started = time.perf_counter()
+    if variant == "full":
+        nlp = spacy.load(model_name)
+    else:
+        nlp = _drop_unused_tok2vec(spacy.load(model_name, exclude=settings.spacy_excluded_components))
+    load_seconds = time.perf_counter() - started
+    memory = rss_mb() - baseline
+
+    list(nlp.pipe(SAMPLE[:2]))  # warm-up
+    latencies = []
+    for _ in range(rounds):
+        for text in SAMPLE:
+            started = time.perf_counter()
+            nlp(text)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        docs = list(nlp.pipe(SAMPLE, batch_size=batch_size))
+    throughput = rounds * len(SAMPLE) / (time.perf_counter() - started)
+
+    return {
+        "variant": variant,
+        "components": nlp.pipe_names,
+        "load_seconds": load_seconds,
+        "rss_mb": memory,
+        "latency_ms": statistics.median(latencies) * 1000,
+        "throughput": throughput,
+        "entities": [_entities_from_doc(doc) for doc in docs],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_variant(args.worker, args.rounds, args.batch_size)))
+        return
+
+    reports = []
+    for variant in ("full", "trimmed"):
+        command = [sys.executable, os.path.abspath(__file__), "--worker", variant,
+                   "--rounds", str(args.rounds), "--batch-size", str(args.batch_size)]
+        completed = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{variant:<8} failed: {completed.stderr.strip().splitlines()[-1]}")
+            return
+        reports.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    full, trimmed = reports
+    print(f"{'pipeline':<8} {'load s':>7} {'RSS MB':>8} {'latency ms':>11} {'docs/s':>8}  components")
+    for report in reports:
+        print(
+            f"{report['variant']:<8} {report['load_seconds']:7.2f} {report['rss_mb']:8.0f} "
+            f"{report['latency_ms']:11.2f} {report['throughput']:8.0f}  {', '.join(report['components'])}"
+        )
+    print(f"speed-up: {full['latency_ms'] / trimmed['latency_ms']:.2f}x per doc, "
+          f"{trimmed['throughput'] / full['throughput']:.2f}x batched")
+    mismatches = [
+        (text, a, b) for text, a, b in zip(SAMPLE, full["entities"], trimmed["entities"]) if a != b
+    ]
+    if mismatches:
+        print(f"entities differ on {len(mismatches)}/{len(SAMPLE)} texts:")
+        for text, a, b in mismatches:
+            print(f"  {text!r}: full={a!r} trimmed={b!r}")
+    else:
+        print(f"entities identical on all {len(SAMPLE)} texts")
+
+
+if __name__ == "__main__":
+    main()
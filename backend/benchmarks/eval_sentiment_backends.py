@@ -0,0 +1,144 @@
+"""
+Compares the sentiment inference backends on a fixed local sample.
+
+Each backend runs in its own interpreter so its memory is measured in
+isolation. Reports load time, resident memory after loading, single-text
+latency, batched throughput and label agreement against the torch backend
+(both on the 3-way positive/neutral/negative label and on the raw stars).
+
+Usage: python benchmarks/eval_sentiment_backends.py [--backends torch torch-int8 onnx onnx-int8]
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+SAMPLE = [
+    "I love this product, it is amazing!",
+    "This is the worst experience I have ever had.",
+    "Delivery was on time and the packaging was fine.",
+    "The support team never answered my emails.",
+    "It works, nothing special.",
+    "Absolutely fantastic service, I will order again!",
+    "The app keeps crashing when I try to pay.",
+    "Decent quality for the price, but the colour faded after one wash.",
+    "Great staff at the Paris store, very helpful.",
+    "Terrible. Broken on arrival and the refund took six weeks.",
+    "Not bad, could be better.",
+    "Five stars, exactly as described.",
+    "J'adore ce produit, il est incroyable !",
+    "C'est la pire expérience que j'ai jamais eue.",
+    "C'est pas mal mais pourrait être mieux.",
+    "Livraison rapide, produit conforme.",
+    "Service client injoignable, très déçu.",
+    "Rien à redire, parfait.",
+    "Le produit est arrivé cassé.",
+    "Prix correct, qualité moyenne.",
+    "Me encanta, lo recomiendo totalmente.",
+    "El pedido llegó tarde y incompleto.",
+    "Está bien, pero esperaba más.",
+    "Das Essen war hervorragend und der Service freundlich.",
+    "Leider völlig enttäuscht, nie wieder.",
+    "Ganz okay für den Preis.",
+    "The hotel room was clean but the breakfast was cold.",
+    "Checkout was smooth and fast.",
+    "Worst customer service in the world, avoid at all costs.",
+    "Meh.",
+    "Good value, would buy again.",
+    "The manual is confusing and incomplete.",
+]
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak RSS (kilobytes on Linux) when /proc is not available
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(backend: str, batch_size: int, rounds: int) -> dict:
+    from app.config import get_settings
+    from app.sentiment_backends import load_sentiment_pipeline
+    from app.services import _label_from_prediction
+
+    settings = get_settings()
+    started = time.perf_counter()
+    pipe = load_sentiment_pipeline(settings.sentiment_model_name, backend)
+    load_seconds = time.perf_counter() - started
+    memory = rss_mb()
+
+    pipe(SAMPLE[:2])  # warm-up
+    latencies = []
+    for text in SAMPLE:
+        started = time.perf_counter()
+        pipe(text)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        results = pipe(SAMPLE, batch_size=batch_size)
+    throughput = rounds * len(SAMPLE) / (time.perf_counter() - started)
+
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "rss_mb": memory,
+        "latency_ms": statistics.median(latencies) * 1000,
+        "throughput": throughput,
+        "stars": [result["label"] for result in results],
+        "labels": [_label_from_prediction(result)[0] for result in results],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch-int8", "onnx", "onnx-int8"])
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, args.batch_size, args.rounds)))
+        return
+
+    backends = ["torch"] + [backend for backend in args.backends if backend != "torch"]
+    reports = []
+    for backend in backends:
+        command = [sys.executable, os.path.abspath(__file__), "--worker", backend,
+                   "--batch-size", str(args.batch_size), "--rounds", str(args.rounds)]
+        completed = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{backend:<11} failed: {completed.stderr.strip().splitlines()[-1]}")
+            continue
+        reports.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    if not reports or reports[0]["backend"] != "torch":
+        print("The torch reference backend did not run; no agreement to report.")
+        return
+    reference = reports[0]
+    print(f"{'backend':<11} {'load s':>7} {'RSS MB':>8} {'latency ms':>11} {'texts/s':>8} {'label agree':>12} {'stars agree':>12}")
+    for report in reports:
+        label_agreement = sum(a == b for a, b in zip(report["labels"], reference["labels"])) / len(SAMPLE)
+        star_agreement = sum(a == b for a, b in zip(report["stars"], reference["stars"])) / len(SAMPLE)
+        print(
+            f"{report['backend']:<11} {report['load_seconds']:7.1f} {report['rss_mb']:8.0f} "
+            f"{report['latency_ms']:11.1f} {report['throughput']:8.1f} "
+            f"{label_agreement:11.1%} {star_agreement:11.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
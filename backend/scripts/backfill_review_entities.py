@@ -0,0 +1,27 @@
+import argparse
+import sys
+import os
+
+# Add the project root to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import get_session
+from app.entities import backfill_review_entities
+
+
+def main(batch_size: int, after_id: int) -> int:
+    def report(last_id: int, written: int) -> None:
+        print(f"  up to review {last_id}: {written} entity row(s)")
+
+    with get_session() as session:
+        written = backfill_review_entities(session, batch_size=batch_size, after_id=after_id, on_batch=report)
+    print(f"Indexed {written} entity row(s).")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index the key_entities of existing reviews in review_entities.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="reviews per transaction")
+    parser.add_argument("--after-id", type=int, default=0, help="resume after this review id")
+    args = parser.parse_args()
+    sys.exit(main(args.batch_size, args.after_id))
@@ -30,6 +30,8 @@ def create_admin(email, password, full_name="Admin"):
             session.commit()
             session.refresh(existing_user)
             print(f"User {email} updated to admin.")
+            # This process cannot reach the API's user cache; see README (user cache)
+            print("Running API processes pick up the new role within USER_CACHE_TTL_SECONDS.")
         else:
             print(f"Creating new admin user {email}")
             user = User(
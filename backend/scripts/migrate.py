@@ -0,0 +1,19 @@
+import sys
+import os
+
+# Add the project root to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine
+from app.migrations import applied_migrations, run_migrations
+
+if __name__ == "__main__":
+    applied = run_migrations(engine)
+    if applied:
+        for version in applied:
+            print(f"Applied {version}")
+    else:
+        print("Database schema is up to date.")
+
+    with engine.connect() as connection:
+        print(f"Current version: {applied_migrations(connection)[-1]}")
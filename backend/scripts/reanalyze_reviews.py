@@ -0,0 +1,68 @@
+import argparse
+import sys
+import os
+import time
+
+# Add the project root to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import get_session
+from app.reanalysis import count_stale_reviews, load_checkpoint, model_version_counts, reanalyze_reviews
+from app.services import MODEL_VERSION
+
+
+def print_status() -> int:
+    with get_session() as session:
+        counts = model_version_counts(session)
+    print(f"Current model version: {MODEL_VERSION}")
+    for version, count in sorted(counts.items(), key=lambda item: -item[1]):
+        marker = "" if version == MODEL_VERSION else "  (stale)"
+        print(f"  {version or 'unknown'}: {count} review(s){marker}")
+    return 0
+
+
+def main(batch_size: int, checkpoint_path: str, max_rate: float) -> int:
+    checkpoint = load_checkpoint(checkpoint_path, MODEL_VERSION)
+    with get_session() as session:
+        remaining = count_stale_reviews(session, MODEL_VERSION, checkpoint["last_id"])
+    if checkpoint["reviewed"]:
+        print(f"Resuming after review {checkpoint['last_id']} ({checkpoint['reviewed']} already re-analyzed).")
+    print(f"{remaining} review(s) to re-analyze with {MODEL_VERSION}.")
+
+    started = time.monotonic()
+    resumed_from = checkpoint["reviewed"]
+
+    def report(progress: dict) -> None:
+        done = progress["reviewed"] - resumed_from
+        rate = done / max(time.monotonic() - started, 1e-9)
+        eta = (remaining - done) / rate if rate else 0
+        print(
+            f"  up to review {progress['last_id']}: {done}/{remaining} "
+            f"({rate:.1f} reviews/s, ETA {eta:.0f}s), {progress['changed']} label(s) changed"
+        )
+
+    with get_session() as session:
+        checkpoint = reanalyze_reviews(
+            session,
+            batch_size=batch_size,
+            checkpoint_path=checkpoint_path,
+            max_reviews_per_second=max_rate,
+            on_batch=report,
+        )
+
+    print(f"Re-analyzed {checkpoint['reviewed']} review(s), {checkpoint['changed']} changed label.")
+    for transition, count in sorted(checkpoint["transitions"].items(), key=lambda item: -item[1]):
+        print(f"  {transition}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score reviews analyzed by another sentiment model.")
+    parser.add_argument("--batch-size", type=int, default=64, help="reviews per transaction")
+    parser.add_argument("--checkpoint", default="reanalysis_checkpoint.json", help="progress file used to resume")
+    parser.add_argument("--max-rate", type=float, default=0, help="reviews per second, 0 = unlimited")
+    parser.add_argument("--status", action="store_true", help="only print review counts per model version")
+    args = parser.parse_args()
+    if args.status:
+        sys.exit(print_status())
+    sys.exit(main(args.batch_size, args.checkpoint, args.max_rate))
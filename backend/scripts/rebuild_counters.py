@@ -0,0 +1,37 @@
+import sys
+import os
+
+# Add the project root to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.counters import check_counters, rebuild_counters
+from app.database import get_session
+
+
+def main(check_only: bool) -> int:
+    with get_session() as session:
+        mismatches = check_counters(session)
+        if not mismatches:
+            print("Sentiment counters are consistent with the reviews table.")
+            return 0
+
+        print(f"{len(mismatches)} counter(s) differ from the reviews table:")
+        for mismatch in mismatches:
+            print(
+                f"  {mismatch['scope']} {mismatch['scope_id']}: "
+                f"stored {mismatch['stored']} expected {mismatch['expected']}"
+            )
+        if check_only:
+            return 1
+
+        rebuilt = rebuild_counters(session)
+        print(f"Rebuilt {rebuilt} counter(s).")
+        return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] not in ("--check",):
+        print("Usage: python rebuild_counters.py [--check]")
+        sys.exit(2)
+
+    sys.exit(main(check_only="--check" in sys.argv[1:]))
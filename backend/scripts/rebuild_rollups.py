@@ -0,0 +1,40 @@
+import sys
+import os
+
+# Add the project root to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import get_session
+from app.rollups import check_rollups, rebuild_rollups
+
+
+def main(check_only: bool) -> int:
+    with get_session() as session:
+        mismatches = check_rollups(session)
+        if not mismatches:
+            print("Sentiment rollups are consistent with the reviews table.")
+            return 0
+
+        print(f"{len(mismatches)} rollup bucket(s) differ from the reviews table:")
+        for mismatch in mismatches[:50]:
+            print(
+                f"  {mismatch['scope']} {mismatch['scope_id']} {mismatch['granularity']} "
+                f"{mismatch['bucket_start']:%Y-%m-%d %H:%M}: "
+                f"stored {mismatch['stored']} expected {mismatch['expected']}"
+            )
+        if len(mismatches) > 50:
+            print(f"  ... and {len(mismatches) - 50} more")
+        if check_only:
+            return 1
+
+        rebuilt = rebuild_rollups(session)
+        print(f"Rebuilt {rebuilt} rollup bucket(s).")
+        return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] not in ("--check",):
+        print("Usage: python rebuild_rollups.py [--check]")
+        sys.exit(2)
+
+    sys.exit(main(check_only="--check" in sys.argv[1:]))
@@ -1,10 +1,12 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, create_engine
 from sqlmodel.pool import StaticPool
 
 from app.main import app
-from app.database import get_session
+from app.dependencies import get_db, user_cache
+from app.migrations import run_migrations
+from app.response_cache import response_cache
 
 @pytest.fixture(name="session")
 def session_fixture():
@@ -14,16 +16,53 @@ def session_fixture():
         connect_args={"check_same_thread": False}, 
         poolclass=StaticPool
     )
-    SQLModel.metadata.create_all(engine)
+    run_migrations(engine)
     with Session(engine) as session:
         yield session
 
 @pytest.fixture(name="client")
 def client_fixture(session: Session):
-    def get_session_override():
+    def get_db_override():
         return session
     
-    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_db] = get_db_override
+    user_cache.clear()
+    response_cache.clear()
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="auth_headers")
+def auth_headers_fixture(client: TestClient):
+    client.post(
+        "/api/auth/register",
+        json={"email": "owner@example.com", "password": "password123"},
+    )
+    response = client.post(
+        "/api/auth/login",
+        data={"username": "owner@example.com", "password": "password123"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(name="fake_analysis")
+def fake_analysis_fixture(monkeypatch):
+    """Replaces the NLP models with a keyword-based stand-in."""
+    from app import services
+
+    def analyze_texts(texts, batch_size=32):
+        results = []
+        for text in texts:
+            lowered = text.lower()
+            if "bad" in lowered:
+                results.append(("negative", 0.9, ""))
+            elif "good" in lowered:
+                results.append(("positive", 0.9, "Acme"))
+            else:
+                results.append(("neutral", 0.5, ""))
+        return results
+
+    monkeypatch.setattr(services, "analyze_texts", analyze_texts)
+    monkeypatch.setattr(services.settings, "inference_batching_enabled", False)
+    return analyze_texts
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from app.batching import MicroBatcher
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    calls = []
+
+    def handler(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=8, max_wait_ms=50)
+    results = {}
+
+    def worker(value):
+        results[value] = batcher.run(value)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.shutdown()
+
+    assert results == {i: i * 2 for i in range(8)}
+    assert sum(len(call) for call in calls) == 8
+    assert len(calls) < 8
+    assert all(len(call) <= 8 for call in calls)
+
+
+def test_micro_batcher_propagates_errors():
+    def handler(items):
+        raise RuntimeError("model failure")
+
+    batcher = MicroBatcher(handler, max_batch_size=4, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="model failure"):
+        batcher.run("text")
+    batcher.shutdown()
+
+
+def test_micro_batcher_fails_every_caller_on_short_results():
+    batcher = MicroBatcher(lambda items: items[:1], max_batch_size=2, max_wait_ms=200)
+    futures = [batcher.submit("a"), batcher.submit("b")]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="1 results for 2 items"):
+            future.result(timeout=5)
+    batcher.shutdown()
+
+
+def test_micro_batcher_run_times_out():
+    release = threading.Event()
+
+    def handler(items):
+        release.wait(5)
+        return items
+
+    batcher = MicroBatcher(handler, max_batch_size=1, max_wait_ms=0, timeout=0.05)
+    with pytest.raises(TimeoutError):
+        batcher.run("slow")
+    release.set()
+    batcher.shutdown()
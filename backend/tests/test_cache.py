@@ -0,0 +1,44 @@
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from app.cache import AnalysisCache, LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_analysis_cache_key_ignores_whitespace_but_not_model():
+    key = AnalysisCache.make_key("sentiment", "model-a", "Great service!")
+    assert AnalysisCache.make_key("sentiment", "model-a", "  Great   service! ") == key
+    assert AnalysisCache.make_key("sentiment", "model-b", "Great service!") != key
+    assert AnalysisCache.make_key("entities", "model-a", "Great service!") != key
+
+
+def test_analysis_cache_persistent_tier_survives_restart():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    key = AnalysisCache.make_key("sentiment", "model-a", "ok")
+
+    first = AnalysisCache(maxsize=10, engine=engine)
+    first.set_many({key: ["neutral", 0.51]}, kind="sentiment", model="model-a")
+    # Writing the same key twice (e.g. from another worker) is not an error
+    first.set_many({key: ["neutral", 0.51]}, kind="sentiment", model="model-a")
+
+    second = AnalysisCache(maxsize=10, engine=engine)
+    assert second.get_many([key]) == {key: ["neutral", 0.51]}
+    assert second.stats()["persistent"]["hits"] == 1
+    assert second.get_many([key]) == {key: ["neutral", 0.51]}
+    assert second.stats()["memory"]["hits"] == 1
@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models import Review
+from app.counters import check_counters, rebuild_counters
+from app.entities import backfill_review_entities, parse_entities, top_entities
+from app.rollups import check_rollups, read_trends, rebuild_rollups
+from app.services import add_reviews, get_dashboard_summary, get_form_stats
+
+
+def add_labelled_reviews(session: Session, labels, owner_id=1, form_id=None):
+    start = datetime(2024, 1, 1)
+    reviews = [
+        Review(
+            content=f"review {i}",
+            sentiment=label,
+            owner_id=owner_id,
+            form_id=form_id,
+            created_at=start + timedelta(minutes=i),
+        )
+        for i, label in enumerate(labels)
+    ]
+    add_reviews(session, reviews)
+    session.commit()
+
+
+def test_dashboard_summary_counts_and_latest(session: Session):
+    add_labelled_reviews(session, ["positive", "Negative", None, "neutral", "mixed", "positive"])
+    add_labelled_reviews(session, ["negative"], owner_id=2)
+
+    counts, latest = get_dashboard_summary(session, owner_id=1, limit=2)
+
+    # Never-analyzed reviews are pending, unknown labels only count towards the total
+    assert counts == {"positive": 2, "neutral": 1, "negative": 1, "pending": 1, "total": 6}
+    assert [review.content for review in latest] == ["review 5", "review 4"]
+
+
+def test_form_stats_only_counts_form_reviews(session: Session):
+    add_labelled_reviews(session, ["positive", "negative"], form_id=7)
+    add_labelled_reviews(session, ["positive"])
+
+    counts, latest = get_form_stats(session, form_id=7)
+
+    assert counts == {"positive": 1, "neutral": 0, "negative": 1, "pending": 0, "total": 2}
+    assert len(latest) == 2
+
+
+def test_dashboard_endpoint(client: TestClient, auth_headers, fake_analysis):
+    client.post("/api/reviews/", headers=auth_headers, json={"content": "Good product"})
+    client.post("/api/reviews/", headers=auth_headers, json={"content": "Bad support"})
+
+    response = client.get("/api/dashboard/", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["total_reviews"], data["positive"], data["negative"]) == (2, 1, 1)
+    assert len(data["latest_reviews"]) == 2
+
+
+def test_counters_check_and_rebuild(session: Session):
+    add_labelled_reviews(session, ["positive", "negative"], form_id=3)
+    assert check_counters(session) == []
+
+    # A review written behind the counters' back is reported and fixed
+    session.add(Review(content="raw insert", sentiment="negative", owner_id=1))
+    session.commit()
+    mismatches = check_counters(session)
+    assert [(m["scope"], m["scope_id"]) for m in mismatches] == [("owner", 1)]
+
+    assert rebuild_counters(session) == 2
+    assert check_counters(session) == []
+    counts, _ = get_dashboard_summary(session, owner_id=1)
+    assert counts == {"positive": 1, "neutral": 0, "negative": 2, "pending": 0, "total": 3}
+
+
+def test_deleting_form_drops_form_counters(client: TestClient, session: Session, auth_headers, fake_analysis):
+    form = client.post("/api/forms", headers=auth_headers, json={"name": "Shop"}).json()
+    client.post(f"/api/public/{form['uuid']}", json={"content": "Good shop"})
+
+    stats = client.get(f"/api/forms/{form['id']}/stats", headers=auth_headers).json()
+    assert (stats["total_reviews"], stats["positive"]) == (1, 1)
+
+    assert client.delete(f"/api/forms/{form['id']}", headers=auth_headers).status_code == 204
+    assert check_counters(session) == []
+    dashboard = client.get("/api/dashboard/", headers=auth_headers).json()
+    assert dashboard["total_reviews"] == 1
+
+
+def test_trend_rollups_follow_writes_and_rebuild(session: Session):
+    # Reviews at 00:00, 00:40, 01:20 and 02:00 on 2024-01-01
+    reviews = [
+        Review(content=f"review {i}", sentiment=label, sentiment_score=0.5 + i / 10, owner_id=1, form_id=4,
+               created_at=datetime(2024, 1, 1) + timedelta(minutes=40 * i))
+        for i, label in enumerate(["positive", "negative", "positive", "neutral"])
+    ]
+    add_reviews(session, reviews)
+    session.commit()
+    assert check_rollups(session) == []
+
+    hours = read_trends(session, "form", 4, "hour", datetime(2024, 1, 1), datetime(2024, 1, 1, 4))
+    assert [bucket["total"] for bucket in hours] == [2, 1, 1, 0]
+    assert (hours[0]["positive"], hours[0]["negative"], hours[0]["average_score"]) == (1, 1, 0.55)
+    assert hours[3]["average_score"] is None
+    days = read_trends(session, "owner", 1, "day", datetime(2023, 12, 31, 12), datetime(2024, 1, 2))
+    assert [(bucket["bucket_start"], bucket["total"]) for bucket in days] == [
+        (datetime(2023, 12, 31), 0), (datetime(2024, 1, 1), 4),
+    ]
+
+    session.add(Review(content="raw insert", sentiment="negative", owner_id=1, created_at=datetime(2024, 1, 3)))
+    session.commit()
+    assert {(m["scope"], m["granularity"]) for m in check_rollups(session)} == {("owner", "hour"), ("owner", "day")}
+    rebuild_rollups(session)
+    assert check_rollups(session) == []
+
+
+def test_trends_endpoint(client: TestClient, auth_headers, fake_analysis):
+    form = client.post("/api/forms", headers=auth_headers, json={"name": "Shop"}).json()
+    client.post(f"/api/public/{form['uuid']}", json={"content": "Good shop"})
+    client.post("/api/reviews/", headers=auth_headers, json={"content": "Bad support"})
+
+    response = client.get("/api/dashboard/trends", headers=auth_headers, params={"granularity": "hour"})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["buckets"]) == 30 * 24
+    current = data["buckets"][-1]
+    assert (current["total"], current["positive"], current["negative"]) == (2, 1, 1)
+
+    data = client.get("/api/dashboard/trends", headers=auth_headers, params={"form_id": form["id"]}).json()
+    assert len(data["buckets"]) == 30
+    assert sum(bucket["total"] for bucket in data["buckets"]) == 1
+
+    too_long = {"granularity": "hour", "start": "2020-01-01T00:00:00", "end": "2024-01-01T00:00:00"}
+    assert client.get("/api/dashboard/trends", headers=auth_headers, params=too_long).status_code == 400
+    assert client.get("/api/dashboard/trends", headers=auth_headers, params={"form_id": 999}).status_code == 404
+
+
+def test_entity_index_backfill_and_top_entities(session: Session):
+    assert parse_entities("Acme, Paris,  Acme ,") == ["Acme", "Paris"]
+    # Written before the entity index existed
+    session.add_all([
+        Review(content="a", sentiment="negative", key_entities="Acme, Paris", owner_id=1),
+        Review(content="b", sentiment="Negative", key_entities="Acme", owner_id=1),
+        Review(content="c", sentiment="positive", key_entities="Paris, Bob", owner_id=1),
+        Review(content="d", sentiment="positive", key_entities="Globex", owner_id=2),
+    ])
+    session.commit()
+
+    batches = []
+    assert backfill_review_entities(session, batch_size=2, on_batch=lambda last_id, _: batches.append(last_id)) == 6
+    assert batches == [2, 4]
+    # Re-running does not duplicate rows
+    backfill_review_entities(session)
+
+    top = top_entities(session, owner_id=1)
+    assert [(row["entity"], row["total"]) for row in top] == [("Acme", 2), ("Paris", 2), ("Bob", 1)]
+    negative = top_entities(session, owner_id=1, sentiment="negative", limit=5)
+    assert negative == [
+        {"entity": "Acme", "total": 2, "positive": 0, "neutral": 0, "negative": 2},
+        {"entity": "Paris", "total": 2, "positive": 1, "neutral": 0, "negative": 1},
+    ]
+
+
+def test_entities_endpoint(client: TestClient, auth_headers, fake_analysis):
+    client.post("/api/reviews/", headers=auth_headers, json={"content": "Good product"})
+    client.post("/api/reviews/", headers=auth_headers, json={"content": "Good again"})
+    client.post("/api/reviews/", headers=auth_headers, json={"content": "Bad support"})
+
+    response = client.get("/api/dashboard/entities", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == [{"entity": "Acme", "total": 2, "positive": 2, "neutral": 0, "negative": 0}]
+    negative = client.get("/api/dashboard/entities", headers=auth_headers, params={"sentiment": "negative"})
+    assert negative.json() == []
@@ -0,0 +1,172 @@
+import sqlite3
+from contextlib import nullcontext
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine, select
+
+from app import analysis_worker as analysis_worker_module
+from app import services
+from app.analysis_worker import AnalysisWorker, analysis_worker, analyze_pending_batch
+from app.config import get_settings
+from app.counters import check_counters
+from app.migrations import run_migrations
+from app.models import Review, User
+from app.rollups import check_rollups
+from app.services import add_reviews
+
+
+def test_public_reviews_are_accepted_then_analyzed(
+    client: TestClient, session, auth_headers, fake_analysis, monkeypatch
+):
+    monkeypatch.setattr(get_settings(), "public_reviews_deferred_analysis", True)
+    notified = []
+    monkeypatch.setattr(analysis_worker, "notify", lambda: notified.append(True))
+
+    form = client.post("/api/forms", headers=auth_headers, json={"name": "Shop"}).json()
+    for content in ("Good shop", "Bad queue"):
+        response = client.post(f"/api/public/{form['uuid']}", json={"content": content})
+        assert response.status_code == 201
+        assert (response.json()["sentiment"], response.json()["analyzed_at"]) == (None, None)
+    assert len(notified) == 2
+
+    dashboard = client.get("/api/dashboard/", headers=auth_headers).json()
+    assert (dashboard["total_reviews"], dashboard["pending"], dashboard["positive"]) == (2, 2, 0)
+    queue = client.get("/health/stats").json()["analysis_queue"]
+    assert queue["depth"] == 2 and queue["lag_seconds"] >= 0
+    # Pending reviews are not in the trends until analyzed
+    trends = client.get("/api/dashboard/trends", headers=auth_headers).json()
+    assert sum(bucket["total"] for bucket in trends["buckets"]) == 0
+
+    assert analyze_pending_batch(session, batch_size=1) == 1
+    assert analyze_pending_batch(session, batch_size=5) == 1
+    assert analyze_pending_batch(session, batch_size=5) == 0
+
+    dashboard = client.get("/api/dashboard/", headers=auth_headers).json()
+    assert (dashboard["pending"], dashboard["positive"], dashboard["negative"]) == (0, 1, 1)
+    stats = client.get(f"/api/forms/{form['id']}/stats", headers=auth_headers).json()
+    assert (stats["total_reviews"], stats["pending"]) == (2, 0)
+    trends = client.get("/api/dashboard/trends", headers=auth_headers).json()
+    assert sum(bucket["total"] for bucket in trends["buckets"]) == 2
+    entities = client.get("/api/dashboard/entities", headers=auth_headers).json()
+    assert [entity["entity"] for entity in entities] == ["Acme"]
+    assert client.get("/health/stats").json()["analysis_queue"]["depth"] == 0
+    assert check_counters(session) == []
+    assert check_rollups(session) == []
+
+
+def _submit_pending(session, contents):
+    owner = session.exec(select(User)).first()
+    if owner is None:
+        owner = User(email="owner@example.com", hashed_password="x")
+        session.add(owner)
+        session.flush()
+    reviews = [Review(content=content, source="public_form", owner_id=owner.id) for content in contents]
+    add_reviews(session, reviews)
+    session.commit()
+    return [review.id for review in reviews]
+
+
+def test_models_run_without_holding_the_write_lock(tmp_path, monkeypatch):
+    path = tmp_path / "queue.db"
+    engine = create_engine(f"sqlite:///{path}")
+    run_migrations(engine)
+    concurrent_writes = []
+
+    def analyze_texts(texts, batch_size=32):
+        # A live request writing while the worker is running the models
+        with sqlite3.connect(path, timeout=0) as connection:
+            connection.execute("INSERT INTO schema_migrations VALUES ('probe', '2026-01-01')")
+        concurrent_writes.append(True)
+        return [("positive", 0.9, "") for _ in texts]
+
+    monkeypatch.setattr(services, "analyze_texts", analyze_texts)
+    with Session(engine) as session:
+        _submit_pending(session, ["Good shop"])
+        assert analyze_pending_batch(session, batch_size=5) == 1
+        assert check_counters(session) == []
+    assert concurrent_writes == [True]
+
+
+def test_failing_review_does_not_block_the_queue(session, monkeypatch):
+    def analyze_texts(texts, batch_size=32):
+        if any("boom" in text for text in texts):
+            raise RuntimeError("tokenizer crashed")
+        return [("positive", 0.9, "") for _ in texts]
+
+    monkeypatch.setattr(services, "analyze_texts", analyze_texts)
+    monkeypatch.setattr(analysis_worker_module, "get_session", lambda: nullcontext(session))
+    _, bad, _ = _submit_pending(session, ["Good", "boom", "Fine"])
+    worker = AnalysisWorker(batch_size=5, max_attempts=2)
+
+    # The rest of the batch goes through; the bad review alone then fails its batch
+    with pytest.raises(RuntimeError):
+        worker.drain()
+    assert worker.reviews == 2
+    assert worker.stats()["skipped_review_ids"] == []
+
+    # Second failure next to a good review: it is skipped from now on
+    _submit_pending(session, ["Later"])
+    assert worker.drain() == 1
+    assert worker.stats()["skipped_review_ids"] == [bad]
+    assert worker.drain() == 0
+    assert session.get(Review, bad).analyzed_at is None
+    assert check_counters(session) == []
+
+
+def test_review_failing_alone_is_skipped_and_the_queue_moves_on(session, monkeypatch):
+    def analyze_texts(texts, batch_size=32):
+        if any("boom" in text for text in texts):
+            raise RuntimeError("tokenizer crashed")
+        return [("positive", 0.9, "") for _ in texts]
+
+    monkeypatch.setattr(services, "analyze_texts", analyze_texts)
+    # The models work on other texts, so the failure is the review's own
+    monkeypatch.setattr(services, "check_models", lambda: None)
+    monkeypatch.setattr(analysis_worker_module, "get_session", lambda: nullcontext(session))
+    bad, *later = _submit_pending(session, ["boom", "Good", "Fine"])
+    worker = AnalysisWorker(batch_size=1, max_attempts=2)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            worker.drain()
+    assert worker.stats()["skipped_review_ids"] == [bad]
+    assert worker.drain() == 2
+    assert all(session.get(Review, review_id).analyzed_at is not None for review_id in later)
+    assert check_counters(session) == []
+
+
+def test_model_outage_is_not_counted_against_the_reviews(session, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("model not loaded")
+
+    monkeypatch.setattr(services, "analyze_texts", broken)
+    monkeypatch.setattr(services, "check_models", broken)
+    monkeypatch.setattr(analysis_worker_module, "get_session", lambda: nullcontext(session))
+    _submit_pending(session, ["Good", "Fine"])
+    worker = AnalysisWorker(batch_size=5, max_attempts=1)
+
+    with pytest.raises(RuntimeError):
+        worker.drain()
+    assert worker.stats()["skipped_review_ids"] == []
+
+
+def test_reviews_analyzed_by_another_process_are_counted_once(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}")
+    run_migrations(engine)
+    other_runs = []
+
+    def analyze_texts(texts, batch_size=32):
+        if not other_runs:
+            # Another web worker picks up the same pending rows meanwhile
+            other_runs.append(True)
+            with Session(engine) as other:
+                assert analyze_pending_batch(other, batch_size=5) == 2
+        return [("positive", 0.9, "") for _ in texts]
+
+    monkeypatch.setattr(services, "analyze_texts", analyze_texts)
+    with Session(engine) as session:
+        _submit_pending(session, ["Good shop", "Fine shop"])
+        assert analyze_pending_batch(session, batch_size=5) == 0
+        assert check_counters(session) == []
+        assert check_rollups(session) == []
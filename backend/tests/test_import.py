@@ -0,0 +1,236 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app import services
+from app.models import Review
+
+
+def test_import_csv_is_committed_in_batches(
+    client: TestClient, session: Session, auth_headers, fake_analysis, monkeypatch
+):
+    monkeypatch.setattr(services.settings, "import_batch_size", 2)
+    commits = []
+    original_commit = session.commit
+
+    def counting_commit():
+        commits.append(1)
+        original_commit()
+
+    monkeypatch.setattr(session, "commit", counting_commit)
+    csv = "content,author\nGood food,Ann\nBad service,Bob\nOk I guess,Cid\nGood value,Dee\nBad,Eve\n"
+
+    response = client.post(
+        "/api/reviews/import",
+        headers=auth_headers,
+        files={"file": ("reviews.csv", csv.encode("utf-8"), "text/csv")},
+    )
+
+    assert response.status_code == 201
+    assert response.json() == {"imported": 5}
+    assert len(commits) == 3
+    reviews = session.exec(select(Review)).all()
+    assert [review.sentiment for review in reviews] == [
+        "positive", "negative", "neutral", "positive", "negative"
+    ]
+
+
+def test_import_csv_requires_content_column(client: TestClient, auth_headers, fake_analysis):
+    response = client.post(
+        "/api/reviews/import",
+        headers=auth_headers,
+        files={"file": ("reviews.csv", b"text\nhello\n", "text/csv")},
+    )
+    assert response.status_code == 400
+
+
+def test_background_import_reports_progress(
+    client: TestClient, session: Session, auth_headers, fake_analysis, monkeypatch, tmp_path
+):
+    from app import import_jobs
+    from app.routers import reviews as reviews_router
+
+    monkeypatch.setattr(import_jobs.settings, "import_spool_dir", str(tmp_path))
+    monkeypatch.setattr(
+        reviews_router.import_job_runner, "submit", lambda job_id: import_jobs.run_import_job(session, job_id)
+    )
+    csv = "content\nGood\n\"\"\nBad\n"
+
+    response = client.post(
+        "/api/reviews/import?background=true",
+        headers=auth_headers,
+        files={"file": ("reviews.csv", csv.encode("utf-8"), "text/csv")},
+    )
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    response = client.get(f"/api/reviews/import/{job_id}", headers=auth_headers)
+    assert response.status_code == 200
+    job = response.json()
+    assert job["status"] == "completed"
+    assert job["rows_total"] == 3
+    assert job["rows_processed"] == 3
+    assert job["rows_imported"] == 2
+    assert job["rows_failed"] == 1
+    assert job["eta_seconds"] == 0.0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_import_job_resumes_after_last_committed_batch(
+    session: Session, fake_analysis, monkeypatch, tmp_path
+):
+    from app import import_jobs
+    from app.models import ImportJob
+
+    path = tmp_path / "job.csv"
+    path.write_text("content\nGood one\nGood two\nBad three\n", encoding="utf-8")
+    # A previous run committed the first batch and then the process died
+    job = ImportJob(
+        id="job-1", owner_id=1, filename="job.csv", file_path=str(path),
+        status="running", rows_total=3, rows_processed=2, rows_imported=2,
+    )
+    session.add(job)
+    session.commit()
+
+    job = import_jobs.run_import_job(session, "job-1")
+
+    assert job.status == "completed"
+    assert job.rows_processed == 3
+    assert job.rows_imported == 3
+    assert [review.content for review in session.exec(select(Review)).all()] == ["Bad three"]
+
+
+def test_insert_reviews_sets_generated_ids_in_order(session: Session):
+    from app.bulk_insert import _copy_field, insert_reviews
+
+    reviews = [Review(content=f"row {i}", owner_id=1) for i in range(5)]
+    insert_reviews(session, reviews, batch_size=2)
+    session.commit()
+
+    stored = {review.id: review.content for review in session.exec(select(Review)).all()}
+    assert {review.id: review.content for review in reviews} == stored
+    assert _copy_field(None) == ""
+    assert _copy_field('say "hi"') == '"say ""hi"""'
+
+
+def test_insert_reviews_copies_into_postgres(monkeypatch):
+    """Runs against the database in TEST_POSTGRES_URL, inside a transaction that is rolled back."""
+    import os
+    from datetime import datetime
+
+    import pytest
+    from sqlalchemy import create_engine
+    from sqlalchemy.exc import OperationalError
+    from sqlmodel import SQLModel
+
+    from app import bulk_insert
+    from app.models import User
+
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    pytest.importorskip("psycopg2")
+    engine = create_engine(url)
+    try:
+        connection = engine.connect()
+    except OperationalError as exc:
+        pytest.skip(f"PostgreSQL is not reachable: {exc}")
+
+    copies = []
+    original_copy = bulk_insert._copy_reviews
+
+    def counting_copy(session, rows):
+        copies.append(len(rows))
+        return original_copy(session, rows)
+
+    monkeypatch.setattr(bulk_insert.settings, "bulk_insert_use_copy", True)
+    monkeypatch.setattr(bulk_insert, "_copy_reviews", counting_copy)
+    transaction = connection.begin()
+    try:
+        SQLModel.metadata.create_all(connection)
+        with Session(bind=connection) as session:
+            owner = User(email="copy@example.com", hashed_password="x")
+            session.add(owner)
+            session.flush()
+            reviews = [
+                Review(content='say "hi", then\nleave', author=None, owner_id=owner.id),
+                Review(content="", author="Ann", sentiment="positive", sentiment_score=0.9, owner_id=owner.id),
+                Review(content="third", owner_id=owner.id, analyzed_at=datetime(2026, 1, 2, 3, 4, 5)),
+            ]
+            bulk_insert.insert_reviews(session, reviews, batch_size=2)
+            session.flush()
+
+            assert copies == [2, 1]
+            statement = select(Review).where(Review.owner_id == owner.id).order_by(Review.id)
+            stored = session.exec(statement).all()
+            assert [review.id for review in stored] == [review.id for review in reviews]
+            assert [(review.content, review.author, review.sentiment_score) for review in stored] == [
+                ('say "hi", then\nleave', None, None),
+                ("", "Ann", 0.9),
+                ("third", None, None),
+            ]
+            assert stored[2].analyzed_at == datetime(2026, 1, 2, 3, 4, 5)
+    finally:
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+def test_import_job_is_claimed_by_one_runner(session: Session, fake_analysis, tmp_path):
+    from datetime import datetime, timedelta
+
+    from app import import_jobs
+    from app.models import ImportJob
+
+    path = tmp_path / "job.csv"
+    path.write_text("content\nGood one\n", encoding="utf-8")
+    session.add(ImportJob(id="job-1", owner_id=1, filename="job.csv", file_path=str(path)))
+    session.commit()
+
+    assert import_jobs.claim_import_job(session, "job-1", "runner-a")
+    assert not import_jobs.claim_import_job(session, "job-1", "runner-b")
+    # Another process is importing it: nothing runs, nothing is written
+    assert import_jobs.run_import_job(session, "job-1", "runner-b") is None
+    assert session.exec(select(Review)).all() == []
+
+    # runner-a died; once its lease expires the job is taken over
+    job = session.get(ImportJob, "job-1")
+    job.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    session.add(job)
+    session.commit()
+    job = import_jobs.run_import_job(session, "job-1", "runner-b")
+    assert (job.status, job.rows_imported, job.lease_owner) == ("completed", 1, None)
+    assert import_jobs.run_import_job(session, "missing") is None
+
+
+def test_failed_import_job_keeps_its_file_and_can_be_retried(
+    client: TestClient, session: Session, auth_headers, fake_analysis, monkeypatch, tmp_path
+):
+    from app import import_jobs
+    from app.routers import reviews as reviews_router
+
+    monkeypatch.setattr(import_jobs.settings, "import_spool_dir", str(tmp_path))
+    monkeypatch.setattr(
+        reviews_router.import_job_runner, "submit", lambda job_id: import_jobs.run_import_job(session, job_id)
+    )
+    analyze_texts = services.analyze_texts
+
+    def model_down(texts, batch_size=32):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(services, "analyze_texts", model_down)
+    response = client.post(
+        "/api/reviews/import?background=true",
+        headers=auth_headers,
+        files={"file": ("reviews.csv", b"content\nGood\nBad\n", "text/csv")},
+    )
+    job_id = response.json()["job_id"]
+    job = client.get(f"/api/reviews/import/{job_id}", headers=auth_headers).json()
+    assert (job["status"], job["error"]) == ("failed", "model unavailable")
+    assert len(list(tmp_path.iterdir())) == 1
+
+    monkeypatch.setattr(services, "analyze_texts", analyze_texts)
+    assert client.post(f"/api/reviews/import/{job_id}/retry", headers=auth_headers).status_code == 202
+    job = client.get(f"/api/reviews/import/{job_id}", headers=auth_headers).json()
+    assert (job["status"], job["rows_imported"]) == ("completed", 2)
+    assert list(tmp_path.iterdir()) == []
+    assert client.post(f"/api/reviews/import/{job_id}/retry", headers=auth_headers).status_code == 400
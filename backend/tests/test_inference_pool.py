@@ -0,0 +1,40 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.batching import MicroBatcher
+from app.inference_pool import InferencePool
+
+
+def test_map_batches_spreads_small_batches_over_workers():
+    pool = InferencePool(workers=3)
+    # Threads stand in for the spawned model processes
+    pool._executor = ThreadPoolExecutor(max_workers=3)
+    chunks = []
+
+    def predict(texts, batch_size):
+        chunks.append(list(texts))
+        return [text.upper() for text in texts]
+
+    texts = [f"review {n}" for n in range(7)]
+    assert pool.map_batches(predict, texts, batch_size=32) == [text.upper() for text in texts]
+    assert sorted(len(chunk) for chunk in chunks) == [1, 3, 3]
+
+    chunks.clear()
+    pool.map_batches(predict, texts * 10, batch_size=8)
+    assert max(len(chunk) for chunk in chunks) == 8
+    pool.shutdown()
+
+
+def test_micro_batcher_consumers_run_batches_concurrently():
+    # Both batches must be in the handler at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def handler(items):
+        barrier.wait()
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=1, max_wait_ms=0, consumers=2)
+    futures = [batcher.submit(1), batcher.submit(2)]
+    assert [future.result(timeout=5) for future in futures] == [2, 4]
+    assert batcher.stats()["batches"] == 2
+    batcher.shutdown()
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+from pydantic import ValidationError
+
+from app import model_registry
+from app.config import Settings
+from app.language import detect_language
+from app.model_registry import ModelPool
+
+LANGUAGES = ["en", "fr"]
+
+
+def test_detect_language_routes_english_and_french():
+    assert detect_language("The delivery was late and the box was damaged.", LANGUAGES, "en") == "en"
+    assert detect_language("Livraison en retard, produit abîmé.", LANGUAGES, "en") == "fr"
+    assert detect_language("Le service était très bien, merci !", LANGUAGES, "en") == "fr"
+    # Nothing to go on: fall back to the default
+    assert detect_language("Acme 5/5", LANGUAGES, "en") == "en"
+    assert detect_language("Le produit est arrivé.", ["en"], "en") == "en"
+
+
+def test_model_pool_evicts_least_recently_used(monkeypatch):
+    # Every load "costs" 100 MB
+    rss = iter(range(0, 10000, 100))
+    monkeypatch.setattr(model_registry, "_rss_mb", lambda: next(rss))
+    loaded = []
+
+    def loader(name):
+        loaded.append(name)
+        return object()
+
+    pool = ModelPool(loader, memory_budget_mb=250, pinned=["en"])
+    en = pool.get("en")
+    pool.get("fr")
+    pool.get("de")  # over budget: fr is the least recently used unpinned model
+    assert pool.is_loaded("en") and pool.is_loaded("de")
+    assert not pool.is_loaded("fr")
+    assert pool.get("en") is en
+
+    pool.get("fr")  # de goes this time
+    assert loaded == ["en", "fr", "de", "fr"]
+    pool.record("fr", docs=4, seconds=0.02)
+
+    stats = pool.stats()
+    assert stats["loaded"] == ["en", "fr"]
+    assert stats["memory_used_mb"] == 200
+    assert stats["models"]["fr"]["loads"] == 2
+    assert stats["models"]["fr"]["evictions"] == 1
+    assert stats["models"]["de"]["evictions"] == 1
+    assert stats["models"]["en"]["evictions"] == 0
+    assert stats["models"]["fr"]["avg_latency_ms"] == 5.0
+
+
+def test_model_pool_serves_loaded_models_while_another_loads():
+    french_loading = threading.Event()
+    release_french = threading.Event()
+
+    def loader(name):
+        if name == "fr":
+            french_loading.set()
+            release_french.wait(5)
+        return name
+
+    pool = ModelPool(loader)
+    assert pool.get("en") == "en"
+    loading = threading.Thread(target=pool.get, args=("fr",))
+    loading.start()
+    assert french_loading.wait(5)
+    # The English pipeline is returned while the French one is still loading
+    assert pool.get("en") == "en"
+    assert not pool.is_loaded("fr")
+    release_french.set()
+    loading.join()
+    assert pool.get("fr") == "fr"
+    assert pool.stats()["models"]["fr"]["loads"] == 1
+
+
+def test_legacy_spacy_model_name_sets_the_english_pipeline():
+    assert Settings(spacy_model_name="en_core_web_md").spacy_models == {
+        "en": "en_core_web_md", "fr": "fr_core_news_sm",
+    }
+    with pytest.raises(ValidationError, match="SPACY_MODEL_NAME"):
+        Settings(spacy_model_name="en_core_web_md", spacy_models={"en": "en_core_web_sm"})
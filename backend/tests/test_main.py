@@ -45,3 +45,125 @@ def test_login_user(client: TestClient):
     assert response.status_code == 200
     data = response.json()
     assert "access_token" in data
+
+def test_readiness_reports_models(client: TestClient):
+    # Models are loaded lazily, so nothing has been loaded in the test app
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    data = response.json()
+    assert data["ready"] is False
+    assert set(data["models"]) == {"sentiment", "ner"}
+    assert data["models"]["sentiment"]["loaded"] is False
+
+
+def test_current_user_is_served_from_cache(client: TestClient, session, auth_headers):
+    from sqlalchemy import event
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        client.get("/api/auth/me", headers=auth_headers)
+        statements.clear()
+        response = client.get("/api/auth/me", headers=auth_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "owner@example.com"
+    assert not [statement for statement in statements if "FROM users" in statement]
+
+
+def test_deleted_user_is_evicted_from_cache(client: TestClient, session, auth_headers):
+    from app.models import User
+    from app.security import create_access_token, get_password_hash
+
+    session.add(User(email="admin@example.com", hashed_password=get_password_hash("pw"), role="admin"))
+    session.commit()
+    admin_headers = {"Authorization": f"Bearer {create_access_token('admin@example.com')}"}
+    owner_id = client.get("/api/auth/me", headers=auth_headers).json()["id"]
+
+    assert client.delete(f"/api/users/{owner_id}", headers=admin_headers).status_code == 204
+    assert client.get("/api/auth/me", headers=auth_headers).status_code == 401
+
+
+def test_login_returns_503_when_password_hasher_is_saturated(client: TestClient, monkeypatch):
+    import threading
+
+    from app import security
+
+    monkeypatch.setattr(security, "_hash_slots", threading.BoundedSemaphore(0))
+    response = client.post(
+        "/api/auth/register",
+        json={"email": "busy@example.com", "password": "password123"},
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_admin_role_changes_outside_the_api_expire_quickly(client: TestClient, session, monkeypatch):
+    from app.dependencies import settings
+    from app.models import User
+    from app.security import create_access_token
+
+    monkeypatch.setattr(settings, "user_cache_admin_ttl_seconds", 0)
+    admin = User(email="admin@example.com", hashed_password="x", role="admin")
+    session.add(admin)
+    session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token('admin@example.com')}"}
+    assert client.get("/api/users", headers=headers).status_code == 200
+
+    # Demoted outside the API (e.g. by a script): the cached admin entry has already expired
+    admin.role = "user"
+    session.add(admin)
+    session.commit()
+    assert client.get("/api/users", headers=headers).status_code == 403
+
+
+def test_password_hash_slot_is_released_after_failed_login(client: TestClient, auth_headers, monkeypatch):
+    import threading
+
+    from app import security
+
+    monkeypatch.setattr(security, "_hash_slots", threading.BoundedSemaphore(1))
+    form = {"username": "owner@example.com", "password": "wrong-password"}
+    assert client.post("/api/auth/login", data=form).status_code == 401
+    assert client.post("/api/auth/login", data=form).status_code == 401
+
+
+def test_password_hash_slot_is_held_until_a_cancelled_job_finishes(monkeypatch):
+    import asyncio
+    import threading
+
+    import pytest
+
+    from app import security
+
+    monkeypatch.setattr(security, "_hash_slots", threading.BoundedSemaphore(1))
+    release_bcrypt = threading.Event()
+    monkeypatch.setattr(security, "verify_password", lambda plain, hashed: release_bcrypt.wait(5))
+
+    async def login():
+        with security.password_hash_slot() as hash_slot:
+            await hash_slot.verify("pw", "hash")
+
+    async def scenario():
+        task = asyncio.create_task(login())
+        await asyncio.sleep(0.05)
+        # The client disconnects while bcrypt is running
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        with pytest.raises(security.PasswordHasherBusy):
+            with security.password_hash_slot():
+                pass
+        release_bcrypt.set()
+        await asyncio.sleep(0.05)
+        with security.password_hash_slot():
+            pass
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+from sqlalchemy import inspect, text
+from sqlmodel import Session, create_engine, select
+from sqlmodel.pool import StaticPool
+
+from app.migrations import MIGRATIONS, applied_migrations, run_migrations
+from app.models import Review
+
+
+def query_plan(session: Session, statement) -> str:
+    compiled = statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    rows = session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_migrations_are_recorded_and_idempotent():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    assert run_migrations(engine) == [version for version, _ in MIGRATIONS]
+    assert run_migrations(engine) == []
+    with engine.connect() as connection:
+        assert applied_migrations(connection) == [version for version, _ in MIGRATIONS]
+    index_names = {index["name"] for index in inspect(engine).get_indexes("reviews")}
+    assert {"ix_reviews_owner_id_created_at", "ix_reviews_form_id_created_at"} <= index_names
+
+
+def test_index_migration_upgrades_existing_table():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as connection:
+        # Schema as created by the old create_all, without the composite indexes
+        connection.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR)"))
+        connection.execute(text(
+            "CREATE TABLE reviews (id INTEGER PRIMARY KEY, source VARCHAR(50), author VARCHAR(120), "
+            "content VARCHAR NOT NULL, sentiment VARCHAR(16), sentiment_score FLOAT, key_entities VARCHAR, "
+            "created_at DATETIME NOT NULL, analyzed_at DATETIME, owner_id INTEGER, form_id INTEGER)"
+        ))
+
+    run_migrations(engine)
+
+    index_names = {index["name"] for index in inspect(engine).get_indexes("reviews")}
+    assert {"ix_reviews_owner_id_created_at", "ix_reviews_form_id_created_at"} <= index_names
+
+
+def test_hot_review_queries_use_composite_indexes(session: Session):
+    by_owner = select(Review).where(Review.owner_id == 1).order_by(Review.created_at.desc()).limit(5)
+    by_form = select(Review).where(Review.form_id == 1).order_by(Review.created_at.desc()).limit(50)
+
+    owner_plan = query_plan(session, by_owner)
+    form_plan = query_plan(session, by_form)
+
+    assert "ix_reviews_owner_id_created_at" in owner_plan
+    assert "ix_reviews_form_id_created_at" in form_plan
+    # The index provides the order, no separate sort step
+    assert "TEMP B-TREE" not in owner_plan
+    assert "TEMP B-TREE" not in form_plan
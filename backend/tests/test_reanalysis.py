@@ -0,0 +1,74 @@
+import json
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine
+
+from app import services
+from app.counters import check_counters
+from app.migrations import run_migrations
+from app.models import Review, User
+from app.reanalysis import model_version_counts, reanalyze_reviews
+from app.rollups import check_rollups
+from app.services import add_reviews
+
+
+def test_reanalysis_resumes_and_keeps_derived_data_consistent(
+    client: TestClient, session, auth_headers, fake_analysis, monkeypatch, tmp_path
+):
+    for content in ("Good product", "Bad support", "Late delivery"):
+        review = client.post("/api/reviews/", headers=auth_headers, json={"content": content}).json()
+        assert review["model_version"] == services.MODEL_VERSION
+
+    # Switch to a "new model" that likes everything
+    monkeypatch.setattr(services, "MODEL_VERSION", "new-model@torch")
+    monkeypatch.setattr(
+        services, "analyze_texts", lambda texts, batch_size=32: [("positive", 0.8, "Beta") for _ in texts]
+    )
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+
+    def interrupt(progress):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        reanalyze_reviews(session, batch_size=2, checkpoint_path=checkpoint_path, on_batch=interrupt)
+    with open(checkpoint_path) as handle:
+        saved = json.load(handle)
+    assert (saved["last_id"], saved["reviewed"], saved["changed"]) == (2, 2, 1)
+
+    result = reanalyze_reviews(session, batch_size=2, checkpoint_path=checkpoint_path)
+    assert (result["reviewed"], result["changed"]) == (3, 2)
+    assert result["transitions"] == {"positive->positive": 1, "negative->positive": 1, "neutral->positive": 1}
+    assert not (tmp_path / "checkpoint.json").exists()
+    assert model_version_counts(session) == {"new-model@torch": 3}
+    assert reanalyze_reviews(session, checkpoint_path=checkpoint_path)["reviewed"] == 0
+
+    dashboard = client.get("/api/dashboard/", headers=auth_headers).json()
+    assert (dashboard["positive"], dashboard["negative"], dashboard["neutral"]) == (3, 0, 0)
+    entities = client.get("/api/dashboard/entities", headers=auth_headers).json()
+    assert [(entity["entity"], entity["total"]) for entity in entities] == [("Beta", 3)]
+    assert check_counters(session) == []
+    assert check_rollups(session) == []
+
+
+def test_reanalysis_does_not_hold_the_write_lock_during_inference(tmp_path, monkeypatch):
+    path = tmp_path / "reviews.db"
+    engine = create_engine(f"sqlite:///{path}")
+    run_migrations(engine)
+    with Session(engine) as session:
+        owner = User(email="owner@example.com", hashed_password="x")
+        session.add(owner)
+        session.flush()
+        add_reviews(session, [Review(content="Old", sentiment="negative", sentiment_score=0.7, owner_id=owner.id)])
+        session.commit()
+
+        def analyze_texts(texts, batch_size=32):
+            # A live request writing while the models run
+            with sqlite3.connect(path, timeout=0) as connection:
+                connection.execute("INSERT INTO schema_migrations VALUES ('probe', '2026-01-01')")
+            return [("positive", 0.8, "") for _ in texts]
+
+        monkeypatch.setattr(services, "analyze_texts", analyze_texts)
+        assert reanalyze_reviews(session, batch_size=10)["changed"] == 1
+        assert check_counters(session) == []
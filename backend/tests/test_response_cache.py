@@ -0,0 +1,63 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.response_cache import dashboard_key, invalidate_on_commit, response_cache
+
+
+def count_queries(session):
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_dashboard_is_cached_revalidated_and_invalidated(client: TestClient, session, auth_headers, fake_analysis):
+    client.post("/api/reviews/", headers=auth_headers, json={"content": "Good product"})
+    first = client.get("/api/dashboard/", headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    statements = count_queries(session)
+    again = client.get("/api/dashboard/", headers=auth_headers)
+    assert again.json() == first.json()
+    not_modified = client.get("/api/dashboard/", headers={**auth_headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert statements == []
+
+    # A new review is visible on the next poll, with a new ETag
+    client.post("/api/reviews/", headers=auth_headers, json={"content": "Bad support"})
+    changed = client.get("/api/dashboard/", headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["total_reviews"] == 2
+    assert changed.headers["ETag"] != etag
+
+    stats = response_cache.stats()["kinds"]["dashboard"]
+    assert (stats["hits"], stats["misses"], stats["not_modified"]) == (2, 2, 1)
+
+
+def test_public_form_is_cached_until_deleted(client: TestClient, session, auth_headers):
+    form = client.post("/api/forms", headers=auth_headers, json={"name": "Shop"}).json()
+    url = f"/api/public/{form['uuid']}"
+    assert client.get(url).json()["name"] == "Shop"
+
+    statements = count_queries(session)
+    response = client.get(url)
+    assert response.json()["name"] == "Shop"
+    assert client.get(url, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+    assert statements == []
+
+    client.delete(f"/api/forms/{form['id']}", headers=auth_headers)
+    assert client.get(url).status_code == 404
+    # Unknown forms are not cached
+    assert client.get(url).status_code == 404
+    assert response_cache.stats()["kinds"]["public_form"]["hit_ratio"] == 0.4
+
+
+def test_rolled_back_writes_do_not_invalidate(session):
+    response_cache._cache.set(dashboard_key(1), "cached")
+    session.exec(text("SELECT 1"))
+    invalidate_on_commit(session, dashboard_key(1))
+    session.rollback()
+    session.commit()
+    assert response_cache._cache.get(dashboard_key(1)) == "cached"
+    response_cache.clear()
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models import Review
+from app.services import add_reviews
+
+
+def seed_reviews(session: Session, count: int, owner_id: int = 1):
+    start = datetime(2024, 1, 1)
+    reviews = [
+        Review(
+            content=f"review {i} " + "x" * 300,
+            source="csv" if i % 2 else "manual",
+            sentiment="positive" if i % 3 else "negative",
+            owner_id=owner_id,
+            # Pairs of reviews share a timestamp to exercise the id tie-breaker
+            created_at=start + timedelta(minutes=i // 2),
+        )
+        for i in range(count)
+    ]
+    add_reviews(session, reviews)
+    session.commit()
+
+
+def test_list_reviews_keyset_pagination(client: TestClient, session: Session, auth_headers):
+    seed_reviews(session, 7)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/reviews/", headers=auth_headers, params=params)
+        assert response.status_code == 200
+        seen.extend(review["id"] for review in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert seen == sorted(seen, reverse=True)
+    assert len(set(seen)) == 7
+
+
+def test_list_reviews_filters_and_summary(client: TestClient, session: Session, auth_headers):
+    seed_reviews(session, 6)
+
+    response = client.get(
+        "/api/reviews/",
+        headers=auth_headers,
+        params={"sentiment": "negative", "source": "manual", "fields": "summary"},
+    )
+
+    assert response.status_code == 200
+    reviews = response.json()
+    assert [review["content"].split()[1] for review in reviews] == ["0"]
+    assert len(reviews[0]["content"]) == 200
+    assert reviews[0]["key_entities"] is None
+
+
+def test_list_reviews_rejects_bad_cursor_and_large_pages(client: TestClient, auth_headers):
+    assert client.get("/api/reviews/", headers=auth_headers, params={"cursor": "nope"}).status_code == 400
+    assert client.get("/api/reviews/", headers=auth_headers, params={"limit": 10_000}).status_code == 422
+
+
+def test_search_reviews_ranks_pages_and_filters(client: TestClient, session: Session, auth_headers):
+    start = datetime(2024, 1, 1)
+    contents = [
+        "Delivery was late, very late, the latest delivery ever",
+        "The delivery was late",
+        "Great café, friendly staff",
+        "Late again and the parcel was damaged",
+        "Nothing to report",
+    ]
+    add_reviews(session, [
+        Review(content=content, sentiment="negative" if i != 2 else "positive", owner_id=1,
+               created_at=start + timedelta(days=i))
+        for i, content in enumerate(contents)
+    ])
+    add_reviews(session, [Review(content="late delivery for someone else", owner_id=2)])
+    session.commit()
+
+    def search(**params):
+        response = client.get("/api/reviews/search", headers=auth_headers, params=params)
+        assert response.status_code == 200
+        return [review["content"] for review in response.json()], response.headers.get("X-Next-Cursor")
+
+    # Every term must match; the review repeating the terms ranks first
+    found, _ = search(q="late delivery")
+    assert found == [contents[0], contents[1]]
+    # Diacritics are ignored, FTS syntax in the query is not interpreted
+    assert search(q="cafe")[0] == [contents[2]]
+    assert search(q='late" OR "nothing')[0] == []
+
+    first, cursor = search(q="late", limit=2)
+    second, last = search(q="late", limit=2, cursor=cursor)
+    assert len(first) == 2 and last is None
+    assert sorted(first + second) == sorted([contents[0], contents[1], contents[3]])
+
+    assert sorted(search(q="late", created_after="2024-01-02T00:00:00")[0]) == sorted([contents[1], contents[3]])
+    assert search(q="staff", sentiment="negative")[0] == []
+
+    response = client.get("/api/reviews/search", headers=auth_headers, params={"q": "late", "cursor": "nope"})
+    assert response.status_code == 400
+
+
+def test_search_index_covers_csv_imports(client: TestClient, auth_headers, fake_analysis):
+    csv_data = b"content\nThe parcel arrived crushed\nLovely packaging\n"
+    response = client.post(
+        "/api/reviews/import", headers=auth_headers, files={"file": ("reviews.csv", csv_data, "text/csv")}
+    )
+    assert response.status_code in (200, 201)
+
+    response = client.get("/api/reviews/search", headers=auth_headers, params={"q": "crushed"})
+    assert [review["content"] for review in response.json()] == ["The parcel arrived crushed"]
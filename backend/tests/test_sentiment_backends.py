@@ -0,0 +1,99 @@
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from app import sentiment_backends
+
+
+def install_module(monkeypatch, name, **attributes):
+    module = ModuleType(name)
+    for key, value in attributes.items():
+        setattr(module, key, value)
+    monkeypatch.setitem(sys.modules, name, module)
+    return module
+
+
+@pytest.fixture(name="fake_transformers")
+def fake_transformers_fixture(monkeypatch):
+    """Stand-in for transformers: pipeline() just reports what it was given."""
+    install_module(
+        monkeypatch,
+        "transformers",
+        AutoTokenizer=SimpleNamespace(from_pretrained=lambda name: f"tokenizer:{name}"),
+        pipeline=lambda task, model, tokenizer=None: {"task": task, "model": model, "tokenizer": tokenizer},
+    )
+
+
+@pytest.fixture(name="fake_optimum")
+def fake_optimum_fixture(monkeypatch, tmp_path):
+    monkeypatch.setattr(sentiment_backends.settings, "onnx_model_dir", str(tmp_path))
+    exports = []
+
+    class ExportedModel:
+        def __init__(self, name):
+            self.name = name
+
+        def save_pretrained(self, directory):
+            exports.append(self.name)
+            (tmp_path / directory / "model.onnx").write_text("onnx")
+            if self.name == "broken/model":
+                raise RuntimeError("export interrupted")
+
+    class ORTModelForSequenceClassification:
+        @staticmethod
+        def from_pretrained(name, export=False, file_name=None):
+            return ExportedModel(name) if export else f"onnx:{name}"
+
+    install_module(monkeypatch, "optimum")
+    install_module(
+        monkeypatch,
+        "optimum.onnxruntime",
+        ORTModelForSequenceClassification=ORTModelForSequenceClassification,
+        ORTQuantizer=None,
+    )
+    install_module(monkeypatch, "optimum.onnxruntime.configuration", AutoQuantizationConfig=None)
+    return exports
+
+
+def test_backend_is_selected_by_name(fake_transformers):
+    pipe = sentiment_backends.load_sentiment_pipeline("some/model", "torch")
+    assert pipe == {"task": "sentiment-analysis", "model": "some/model", "tokenizer": None}
+    with pytest.raises(ValueError, match="Unknown sentiment backend"):
+        sentiment_backends.load_sentiment_pipeline("some/model", "tensorrt")
+
+
+def test_onnx_backend_without_optimum_fails_with_install_hint(monkeypatch, fake_transformers):
+    # A None entry makes the import raise ImportError
+    monkeypatch.setitem(sys.modules, "optimum", None)
+    monkeypatch.setitem(sys.modules, "optimum.onnxruntime", None)
+    with pytest.raises(RuntimeError, match=r"optimum\[onnxruntime\]"):
+        sentiment_backends.load_sentiment_pipeline("some/model", "onnx")
+
+
+def test_onnx_export_is_cached_and_never_left_half_written(fake_transformers, fake_optimum, tmp_path):
+    pipe = sentiment_backends.load_sentiment_pipeline("some/model", "onnx")
+    export_dir = tmp_path / "some__model"
+    assert pipe == {"task": "sentiment-analysis", "model": f"onnx:{export_dir}", "tokenizer": "tokenizer:some/model"}
+    sentiment_backends.load_sentiment_pipeline("some/model", "onnx")
+    assert fake_optimum == ["some/model"]
+    assert [path.name for path in tmp_path.iterdir()] == ["some__model"]
+
+    # An interrupted export leaves no directory that would be taken for a cached one
+    with pytest.raises(RuntimeError, match="export interrupted"):
+        sentiment_backends.load_sentiment_pipeline("broken/model", "onnx")
+    assert [path.name for path in tmp_path.iterdir()] == ["some__model"]
+
+
+def test_concurrent_export_keeps_the_first_one_finished(tmp_path):
+    target = tmp_path / "some__model"
+
+    def export(staging_dir):
+        (tmp_path / staging_dir / "model.onnx").write_text("ours")
+        # Another worker renames its finished export into place meanwhile
+        target.mkdir()
+        (target / "model.onnx").write_text("theirs")
+
+    sentiment_backends._export_once(str(target), export)
+    assert (target / "model.onnx").read_text() == "theirs"
+    assert [path.name for path in tmp_path.iterdir()] == ["some__model"]
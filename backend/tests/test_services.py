@@ -0,0 +1,171 @@
+import sys
+from collections import OrderedDict
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from app import services
+from app.models import Review
+from app.services import analysis_cache, model_registry, ner_models
+
+
+class FakeTokenizer:
+    # Like many tokenizers, reports a placeholder instead of the model's limit
+    model_max_length = int(1e30)
+
+    def __call__(self, texts, truncation, max_length):
+        return {"input_ids": [list(range(min(len(text.split()), max_length))) for text in texts]}
+
+
+class FakeSentimentPipeline:
+    """Rates each text with as many stars as it has words (at most 5)."""
+
+    def __init__(self):
+        self.tokenizer = FakeTokenizer()
+        self.model = SimpleNamespace(config=SimpleNamespace(max_position_embeddings=8))
+        self.calls = []
+
+    def __call__(self, texts, batch_size, truncation, max_length):
+        self.calls.append((list(texts), max_length))
+        return [{"label": f"{min(5, len(text.split()))} stars", "score": 0.5} for text in texts]
+
+
+class FakeNLP:
+    """Tags every capitalised word after the first as an ORG."""
+
+    def __init__(self):
+        self.calls = []
+        self.options = []
+
+    def pipe(self, texts, batch_size, n_process):
+        self.calls.append(list(texts))
+        self.options.append((batch_size, n_process))
+        for text in texts:
+            words = text.split()[1:]
+            yield SimpleNamespace(ents=[SimpleNamespace(text=word, label_="ORG") for word in words if word.istitle()])
+
+
+@pytest.fixture(name="fake_sentiment_model")
+def fake_sentiment_model_fixture(monkeypatch):
+    pipeline = FakeSentimentPipeline()
+    monkeypatch.setitem(model_registry._loaders, "sentiment", lambda: pipeline)
+    model_registry.unload("sentiment")
+    yield pipeline
+    model_registry.unload("sentiment")
+
+
+def test_predict_sentiments_sorts_by_length_but_keeps_input_order(fake_sentiment_model):
+    texts = ["one two three four five", "one", "one two three", "w " * 12, "one two"]
+
+    predictions = services.predict_sentiments(texts, batch_size=2)
+
+    assert [label for label, _ in predictions] == ["positive", "negative", "neutral", "positive", "negative"]
+    (fed, max_length), = fake_sentiment_model.calls
+    assert [len(text.split()) for text in fed] == [1, 2, 3, 5, 12]
+    # Truncated to the model's position limit, not the tokenizer placeholder
+    assert max_length == 8
+
+
+@pytest.fixture(name="fake_spacy")
+def fake_spacy_fixture(monkeypatch):
+    nlp = FakeNLP()
+    monkeypatch.setattr(ner_models, "_loader", lambda language: nlp)
+    monkeypatch.setattr(ner_models, "_models", OrderedDict())
+    return nlp
+
+
+def test_analyze_reviews_matches_analyze_review(fake_sentiment_model, fake_spacy):
+    texts = ["Great stuff from Acme overall", "meh", "Slow Zeta support", "ok Acme and Beta"]
+
+    analysis_cache.clear()
+    batched = services.analyze_reviews([Review(content=text) for text in texts], batch_size=2)
+    analysis_cache.clear()
+    single = [services.analyze_review(Review(content=text)) for text in texts]
+    analysis_cache.clear()
+
+    fields = ("content", "sentiment", "sentiment_score", "key_entities", "model_version")
+    assert [[getattr(review, field) for field in fields] for review in batched] == [
+        [getattr(review, field) for field in fields] for review in single
+    ]
+    assert [review.key_entities for review in batched] == ["Acme", "", "Zeta", "Acme, Beta"]
+    assert [review.sentiment for review in batched] == ["positive", "negative", "neutral", "positive"]
+    assert all(review.analyzed_at is not None for review in batched + single)
+    # One pipeline call for the batch, one per review for the single path
+    assert len(fake_sentiment_model.calls) == 1 + len(texts)
+
+
+FULL_PIPELINE = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "ner"]
+
+
+class LoadedNLP:
+    def __init__(self, exclude, ner_listens):
+        self.pipe_names = [name for name in FULL_PIPELINE if name not in exclude]
+        self.ner_listens = ner_listens
+
+    def get_pipe(self, name):
+        listening = ["ner"] if self.ner_listens and "ner" in self.pipe_names else []
+        return SimpleNamespace(listening_components=listening)
+
+    def remove_pipe(self, name):
+        self.pipe_names.remove(name)
+
+
+def test_spacy_models_load_only_the_ner_component(monkeypatch):
+    loaded = {}
+
+    def load(name, exclude):
+        # The French pipeline's ner listens to the shared tok2vec, the English one does not
+        loaded[name] = list(exclude)
+        return LoadedNLP(exclude, ner_listens=name.startswith("fr"))
+
+    monkeypatch.setitem(sys.modules, "spacy", ModuleType("spacy"))
+    monkeypatch.setattr(sys.modules["spacy"], "load", load, raising=False)
+
+    assert services._load_spacy_model("en").pipe_names == ["ner"]
+    assert services._load_spacy_model("fr").pipe_names == ["tok2vec", "ner"]
+    assert loaded["en_core_web_sm"] == services.settings.spacy_excluded_components
+
+
+def test_entities_are_piped_with_configured_batching(fake_spacy, monkeypatch):
+    monkeypatch.setattr(services.settings, "spacy_batch_size", 7)
+    monkeypatch.setattr(services.settings, "spacy_n_process", 1)
+    assert services.predict_entities(["Visit Acme today", "nothing here"]) == ["Acme", ""]
+    assert fake_spacy.options == [(7, 1)]
+
+
+def test_models_see_the_original_text_of_cached_variants(fake_sentiment_model, fake_spacy):
+    analysis_cache.clear()
+    first = services.analyze_texts(["Thanks  Acme\n team", "Thanks Acme team"])
+    second = services.analyze_texts(["Thanks Acme team"])
+    analysis_cache.clear()
+
+    assert first == second * 2 == [("neutral", 0.5, "Acme")] * 2
+    # Whitespace only matters to the cache key, not to what the models get
+    assert fake_spacy.calls == [["Thanks  Acme\n team"]]
+    assert [texts for texts, _ in fake_sentiment_model.calls] == [["Thanks  Acme\n team"]]
+
+
+class SeparateProcessPool:
+    """Runs each chunk in-process, but whatever the worker records is lost, as in a child process."""
+
+    def map_batches(self, func, texts, batch_size):
+        results = []
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(ner_models, "record", lambda *args: None)
+            for start in range(0, len(texts), batch_size):
+                results.extend(func(texts[start:start + batch_size], batch_size))
+        return results
+
+
+def test_entity_latency_from_worker_processes_is_recorded(fake_spacy, monkeypatch):
+    monkeypatch.setattr(services, "inference_pool", SeparateProcessPool())
+    docs_before = ner_models.stats()["models"].get("en", {}).get("docs", 0)
+
+    analysis_cache.clear()
+    entities = services.extract_entities_batch(["Visit Acme today", "Call Beta", "nothing"], batch_size=2)
+    assert entities == ["Acme", "Beta", ""]
+    analysis_cache.clear()
+
+    stats = ner_models.stats()["models"]["en"]
+    assert stats["docs"] - docs_before == 3
+    assert stats["avg_latency_ms"] is not None
@@ -47,9 +47,21 @@ export const fetchDashboard = async () => {
   return data;
 };
 
+// GET /reviews is paged; follow X-Next-Cursor until the last page
+const REVIEWS_PAGE_SIZE = 200;
+
 export const fetchReviews = async () => {
-  const { data } = await api.get("/reviews");
-  return data;
+  const reviews: any[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await api.get<any[]>("/reviews", {
+      params: { limit: REVIEWS_PAGE_SIZE, cursor },
+    });
+    reviews.push(...response.data);
+    const next = response.headers["x-next-cursor"];
+    cursor = typeof next === "string" && next ? next : undefined;
+  } while (cursor);
+  return reviews;
 };
 
 export const fetchMe = async () => {